@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+"""Reports the time pants spends importing modules for some common goals.
+
+Startup time is dominated by imports, so third-party packages that add noticeably to it but are only
+needed for particular work are imported where they are used rather than at the top of a module:
+`requests` (remote caches, stats uploads, fetching binaries and logging in), `pex` (python target
+validation and plugin resolution), and `yaml` and `Levenshtein` (option parsing of `@file.yaml`
+values and of unknown flags). Keep it that way when touching those modules, and use this script to
+check that an import has not crept back into startup.
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+from collections import defaultdict
+from typing import Dict, List, NamedTuple, Sequence
+
+from common import banner, die
+
+DEFAULT_GOALS = ("help", "list ::", "filedeps src/python/pants/util:strutil")
+
+_IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+\d+ \| *(\S+)$")
+
+
+class ImportTime(NamedTuple):
+    module: str
+    self_us: int
+
+
+def main() -> None:
+    args = create_parser().parse_args()
+    for goal in args.goals:
+        banner(f"./pants {goal}")
+        runs = [measure(goal.split()) for _ in range(args.runs)]
+        report(runs, top=args.top)
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Measure how long pants spends importing modules when running common goals, using "
+            "`python -X importtime`. Runs without pantsd, so every run imports from scratch."
+        )
+    )
+    parser.add_argument(
+        "goals",
+        nargs="*",
+        default=DEFAULT_GOALS,
+        help="The goals and arguments to measure, each as one quoted string.",
+    )
+    parser.add_argument("--runs", type=int, default=3, help="The number of runs of each goal.")
+    parser.add_argument(
+        "--top", type=int, default=20, help="The number of slowest top-level packages to list."
+    )
+    return parser
+
+
+def measure(goal_args: Sequence[str]) -> List[ImportTime]:
+    env = {**os.environ, "PYTHONPROFILEIMPORTTIME": "1"}
+    process = subprocess.run(
+        ["./pants", "--no-pantsd", "--quiet", *goal_args],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        encoding="utf-8",
+    )
+    import_times = []
+    for line in process.stderr.splitlines():
+        match = _IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, module = match.groups()
+            import_times.append(ImportTime(module, int(self_us)))
+    if not import_times:
+        die(f"`./pants {' '.join(goal_args)}` exited {process.returncode} without import times.")
+    return import_times
+
+
+def report(runs: List[List[ImportTime]], *, top: int) -> None:
+    totals = [sum(t.self_us for t in import_times) / 1000 for import_times in runs]
+    print(f"Total import time: {statistics.median(totals):.0f}ms (median of {len(runs)} runs)")
+
+    # Attribute each module's own import time to its top-level package, or to its pants package
+    # two levels down, which is where the backends are told apart.
+    by_package: Dict[str, List[float]] = defaultdict(list)
+    for import_times in runs:
+        package_totals: Dict[str, float] = defaultdict(float)
+        for t in import_times:
+            parts = t.module.split(".")
+            package = ".".join(parts[:3] if parts[0] == "pants" else parts[:1])
+            package_totals[package] += t.self_us / 1000
+        for package, total in package_totals.items():
+            by_package[package].append(total)
+
+    slowest = sorted(by_package.items(), key=lambda item: -statistics.median(item[1]))[:top]
+    for package, package_totals in slowest:
+        print(f"  {statistics.median(package_totals):7.1f}ms  {package}")
+
+
+if __name__ == "__main__":
+    main()
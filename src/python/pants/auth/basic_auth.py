@@ -5,7 +5,6 @@ from collections import namedtuple
 from dataclasses import dataclass
 from typing import Dict, Optional
 
-import requests
 import www_authenticate
 
 from pants.auth.cookies import Cookies
@@ -95,6 +94,8 @@ class BasicAuth(Subsystem):
         if not self.get_options().allow_insecure_urls and not url.startswith("https://"):
             raise BasicAuthException(f"Auth url for provider {provider} is not secure: {url}.")
 
+        import requests
+
         auth = requests.auth.HTTPBasicAuth(creds.username, creds.password) if creds else None
         response = requests.get(url, auth=auth, headers={"User-Agent": f"pants/v{VERSION}"})
 
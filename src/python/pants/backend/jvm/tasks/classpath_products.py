@@ -3,6 +3,9 @@
 
 import os
 import re
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 
 from pants.backend.jvm.targets.exportable_jvm_library import ExportableJvmLibrary
 from pants.backend.jvm.targets.jvm_target import JvmTarget
@@ -22,10 +25,16 @@ ArtifactClasspathEntry = ArtifactClasspathEntry
 
 
 def _not_excluded_filter(excludes):
+    # Classpath entries are usually shared by many targets, so decide each entry only once.
+    excluded_by_entry = {}
+
     def not_excluded(product_to_target):
         path_tuple = product_to_target[0]
         conf, classpath_entry = path_tuple
-        return not classpath_entry.is_excluded_by(excludes)
+        excluded = excluded_by_entry.get(classpath_entry)
+        if excluded is None:
+            excluded = excluded_by_entry[classpath_entry] = classpath_entry.is_excluded_by(excludes)
+        return not excluded
 
     return not_excluded
 
@@ -39,11 +48,26 @@ class ClasspathProducts:
     :API: public
     """
 
+    # The maximum number of lookups whose results are kept. Each holds a classpath.
+    _MAX_CACHED_LOOKUPS = 1024
+
     def __init__(self, pants_workdir, classpaths=None, excludes=None):
         self._classpaths = classpaths or UnionProducts()
         self._excludes = excludes or UnionProducts()
         self._pants_workdir = pants_workdir
 
+        # Compile, test, bundle and export tasks look up the classpaths of the same sets of targets
+        # many times over, so the results of lookups are kept until the classpaths or excludes are
+        # changed, or until the build graph that excludes are collected from is changed.
+        self._lookup_cache = OrderedDict()
+        # Guards the lookup cache, whose clears are bumped into a generation so that a lookup
+        # computed across a clear is not cached.
+        self._lookup_cache_lock = threading.Lock()
+        self._lookup_cache_generation = 0
+        # We hold a handle directly to the callback, which build graphs only hold weakly.
+        self._clear_lookup_cache_handle = self._clear_lookup_cache
+        self._watched_build_graph_ids = set()
+
     @staticmethod
     def init_func(pants_workdir):
         """
@@ -238,7 +262,8 @@ class ClasspathProducts:
 
     def remove_for_target(self, target, classpath_elements):
         """Removes the given entries for the target."""
-        self._classpaths.remove_for_target(target, self._wrap_path_elements(classpath_elements))
+        with self._mutating():
+            self._classpaths.remove_for_target(target, self._wrap_path_elements(classpath_elements))
 
     def get_for_target(self, target):
         """Gets the classpath products for the given target.
@@ -276,17 +301,16 @@ class ClasspathProducts:
         :rtype: list of (string, :class:`ClasspathEntry`)
         """
 
-        # remove the duplicate, preserve the ordering.
-        return list(
-            OrderedSet(
-                [
-                    cp
-                    for cp, target in self.get_product_target_mappings_for_targets(
-                        targets, respect_excludes
-                    )
-                ]
+        targets = tuple(targets)
+
+        def compute():
+            # remove the duplicate, preserve the ordering.
+            return OrderedSet(
+                cp
+                for cp, target in self._compute_product_target_mappings(targets, respect_excludes)
             )
-        )
+
+        return self._cached_lookup(("entries", targets, respect_excludes), targets, compute)
 
     def get_product_target_mappings_for_targets(self, targets, respect_excludes=True):
         """Gets the classpath products-target associations for the given targets.
@@ -297,6 +321,14 @@ class ClasspathProducts:
         :param bool respect_excludes: `True` to respect excludes; `False` to ignore them.
         :returns: The ordered (classpath products, target) tuples.
         """
+        targets = tuple(targets)
+        return self._cached_lookup(
+            ("mappings", targets, respect_excludes),
+            targets,
+            lambda: self._compute_product_target_mappings(targets, respect_excludes),
+        )
+
+    def _compute_product_target_mappings(self, targets, respect_excludes):
         classpath_target_tuples = self._classpaths.get_product_target_mappings_for_targets(targets)
         if respect_excludes:
             return self._filter_by_excludes(classpath_target_tuples, targets)
@@ -349,29 +381,78 @@ class ClasspathProducts:
             raise ValueError(
                 f"Other ClasspathProducts from a different pants workdir {other._pants_workdir}"
             )
-        for target, products in other._classpaths._products_by_target.items():
-            self._classpaths.add_for_target(target, products)
-        for target, products in other._excludes._products_by_target.items():
-            self._excludes.add_for_target(target, products)
+        with self._mutating():
+            for target, products in other._classpaths._products_by_target.items():
+                self._classpaths.add_for_target(target, products)
+            for target, products in other._excludes._products_by_target.items():
+                self._excludes.add_for_target(target, products)
+
+    def _cached_lookup(self, key, targets, compute):
+        """Returns a copy of the cached result of a lookup, computing it if it is not cached."""
+        with self._lookup_cache_lock:
+            result = self._lookup_cache.get(key)
+            if result is not None:
+                self._lookup_cache.move_to_end(key)
+                return list(result)
+            self._watch_build_graphs(targets)
+            generation = self._lookup_cache_generation
+
+        result = tuple(compute())
+        with self._lookup_cache_lock:
+            if generation == self._lookup_cache_generation:
+                self._lookup_cache[key] = result
+                if len(self._lookup_cache) > self._MAX_CACHED_LOOKUPS:
+                    self._lookup_cache.popitem(last=False)
+        return list(result)
+
+    def _watch_build_graphs(self, targets):
+        for target in targets:
+            build_graph = getattr(target, "_build_graph", None)
+            if build_graph is not None and id(build_graph) not in self._watched_build_graph_ids:
+                self._watched_build_graph_ids.add(id(build_graph))
+                build_graph.add_invalidation_callback(self._clear_lookup_cache_handle)
+
+    @contextmanager
+    def _mutating(self):
+        """Clears the lookup cache once the classpaths or excludes have been mutated.
+
+        Lookups that read the classpaths while they are being mutated are never cached, because the
+        clear afterwards bumps the generation they were computed in.
+        """
+        try:
+            yield
+        finally:
+            self._clear_lookup_cache()
+
+    def _clear_lookup_cache(self):
+        """A callback for cases where the classpaths, excludes or build graph have been mutated.
+
+        See BuildGraph.add_invalidation_callback.
+        """
+        with self._lookup_cache_lock:
+            self._lookup_cache_generation += 1
+            self._lookup_cache.clear()
 
     def _filter_by_excludes(self, classpath_target_tuples, root_targets):
         # Excludes are always applied transitively, so regardless of whether a transitive
         # set of targets was included here, their closure must be included.
         closure = BuildGraph.closure(root_targets, bfs=True)
         excludes = self._excludes.get_for_targets(closure)
+        if not excludes:
+            return classpath_target_tuples
+        not_excluded = _not_excluded_filter(excludes)
         return [
-            target_tuple
-            for target_tuple in classpath_target_tuples
-            if _not_excluded_filter(excludes)(target_tuple)
+            target_tuple for target_tuple in classpath_target_tuples if not_excluded(target_tuple)
         ]
 
     def _add_excludes_for_target(self, target):
-        if isinstance(target, ExportableJvmLibrary) and target.provides:
-            self._excludes.add_for_target(
-                target, [Exclude(target.provides.org, target.provides.name)]
-            )
-        if isinstance(target, JvmTarget) and target.excludes:
-            self._excludes.add_for_target(target, target.excludes)
+        with self._mutating():
+            if isinstance(target, ExportableJvmLibrary) and target.provides:
+                self._excludes.add_for_target(
+                    target, [Exclude(target.provides.org, target.provides.name)]
+                )
+            if isinstance(target, JvmTarget) and target.excludes:
+                self._excludes.add_for_target(target, target.excludes)
 
     def _wrap_path_elements(self, classpath_elements):
         wrapped_path_elements = []
@@ -386,7 +467,8 @@ class ClasspathProducts:
 
     def _add_elements_for_target(self, target, elements):
         self._validate_classpath_tuples(elements, target)
-        self._classpaths.add_for_target(target, elements)
+        with self._mutating():
+            self._classpaths.add_for_target(target, elements)
 
     def _validate_classpath_tuples(self, classpath, target):
         """Validates that all files are located within the working directory, to simplify
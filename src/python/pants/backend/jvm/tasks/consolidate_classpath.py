@@ -1,14 +1,17 @@
 # Copyright 2016 Pants project contributors (see CONTRIBUTORS.md).
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
+import hashlib
 import os
+import zipfile
 from collections import defaultdict
 
 from pants.backend.jvm.tasks.classpath_util import ClasspathUtil
 from pants.backend.jvm.tasks.jvm_binary_task import JvmBinaryTask
-from pants.base.hash_utils import hash_all
+from pants.base.hash_utils import hash_all, hash_files
 from pants.build_graph.target_scopes import Scopes
-from pants.util.dirutil import fast_relpath
+from pants.util.contextutil import open_zip
+from pants.util.dirutil import fast_relpath, safe_delete
 
 
 class ConsolidateClasspath(JvmBinaryTask):
@@ -22,7 +25,7 @@ class ConsolidateClasspath(JvmBinaryTask):
 
     @classmethod
     def implementation_version(cls):
-        return super().implementation_version() + [("ConsolidateClasspath", 2)]
+        return super().implementation_version() + [("ConsolidateClasspath", 3)]
 
     @classmethod
     def prepare(cls, options, round_manager):
@@ -33,6 +36,18 @@ class ConsolidateClasspath(JvmBinaryTask):
     def cache_target_dirs(self):
         return True
 
+    @property
+    def incremental(self):
+        # The jars built for a target's previous results are cloned into its new results_dir, and
+        # reused for any class directory whose contents have not changed.
+        return True
+
+    @property
+    def cache_incremental(self):
+        # A jar is only reused for a class directory with identical contents, so incremental results
+        # are the same as clean ones.
+        return True
+
     @classmethod
     def product_types(cls):
         return ["consolidated_classpath"]
@@ -50,7 +65,11 @@ class ConsolidateClasspath(JvmBinaryTask):
         self._consolidate_classpath(targets_to_consolidate, consolidated_classpath)
 
     def _consolidate_classpath(self, targets, classpath_products):
-        """Convert loose directories in classpath_products into jars."""
+        """Convert loose directories in classpath_products into jars.
+
+        Invalid targets start from the jars of their previous build, and a class directory is only
+        jarred again if its contents differ from those of every previous jar.
+        """
         # TODO: find a way to not process classpath entries for valid VTs.
 
         # NB: It is very expensive to call to get entries for each target one at a time.
@@ -63,6 +82,8 @@ class ConsolidateClasspath(JvmBinaryTask):
 
         with self.invalidated(targets=targets, invalidate_dependents=True) as invalidation:
             for vt in invalidation.all_vts:
+                # Jars cloned into the results_dir from a previous build of the target.
+                previous_jars = {} if vt.valid else self._previous_jars(vt.results_dir)
                 entries = entries_map.get(vt.target, [])
                 for conf, entry in entries:
                     relpath = fast_relpath(entry.path, self.get_options().pants_workdir)
@@ -72,9 +93,68 @@ class ConsolidateClasspath(JvmBinaryTask):
 
                         # Regenerate artifact for invalid vts.
                         if not vt.valid:
-                            with self.open_jar(jarpath, overwrite=True, compressed=False) as jar:
-                                jar.write(entry.path)
+                            self._jar_directory(entry.path, jarpath, previous_jars)
 
                         # Replace directory classpath entry with its jarpath.
                         classpath_products.remove_for_target(vt.target, [(conf, entry)])
                         classpath_products.add_for_target(vt.target, [(conf, jarpath)])
+
+                # Jars for class directories that are gone or have changed.
+                for previous_jar in previous_jars:
+                    safe_delete(previous_jar)
+
+    def _jar_directory(self, directory, jarpath, previous_jars):
+        """Jars the given directory at jarpath, unless one of the previous jars has its contents.
+
+        :param previous_jars: A dict from the paths of jars left by a previous build of the target
+                              to the digests of the directories they were built from. The jars that
+                              are reused or overwritten are removed from it.
+        """
+        digest = self._directory_digest(directory)
+        if previous_jars.pop(jarpath, None) == digest:
+            return
+        reusable = next((path for path, d in previous_jars.items() if d == digest), None)
+        if reusable is not None:
+            del previous_jars[reusable]
+            os.replace(reusable, jarpath)
+            return
+        # An empty directory produces no jar, so the previous one must not be left in its place.
+        safe_delete(jarpath)
+        with self.open_jar(jarpath, overwrite=True, compressed=False) as jar:
+            jar.write(directory)
+        # Record the digest of the directory in the jar's zip comment, to be found by later builds.
+        if os.path.exists(jarpath):
+            with open_zip(jarpath, "a") as zf:
+                zf.comment = digest.encode()
+
+    @staticmethod
+    def _directory_digest(path):
+        """Returns a digest of the relative paths and contents of the files under a directory."""
+        relpaths = sorted(
+            os.path.relpath(os.path.join(root, f), path)
+            for root, _, files in os.walk(path)
+            for f in files
+        )
+        file_digests = hash_files(
+            [os.path.join(path, relpath) for relpath in relpaths], memoize=True
+        )
+        hasher = hashlib.sha1()
+        for relpath, file_digest in zip(relpaths, file_digests):
+            hasher.update(relpath.encode())
+            hasher.update(b"\0")
+            hasher.update(file_digest.encode())
+        return hasher.hexdigest()
+
+    @staticmethod
+    def _previous_jars(results_dir):
+        jars = {}
+        for name in os.listdir(results_dir):
+            if name.startswith("output-") and name.endswith(".jar"):
+                jarpath = os.path.join(results_dir, name)
+                try:
+                    with open_zip(jarpath) as zf:
+                        jars[jarpath] = zf.comment.decode()
+                except (zipfile.BadZipfile, UnicodeDecodeError):
+                    # Rebuilt, since no directory digest is empty.
+                    jars[jarpath] = ""
+        return jars
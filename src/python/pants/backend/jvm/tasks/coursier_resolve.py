@@ -5,6 +5,7 @@ import hashlib
 import itertools
 import json
 import os
+import pickle
 from collections import defaultdict
 from urllib import parse
 
@@ -22,6 +23,7 @@ from pants.backend.jvm.tasks.nailgun_task import NailgunTask
 from pants.backend.jvm.tasks.resolve_shared import JvmResolverBase
 from pants.base.exceptions import TaskError
 from pants.base.fingerprint_strategy import FingerprintStrategy
+from pants.base.hash_utils import stable_json_sha1
 from pants.base.workunit import WorkUnitLabel
 from pants.invalidation.cache_manager import VersionedTargetSet
 from pants.java import util
@@ -29,7 +31,12 @@ from pants.java.distribution.distribution import DistributionLocator
 from pants.java.executor import Executor, SubprocessExecutor
 from pants.java.jar.jar_dependency_utils import M2Coordinate, ResolvedJar
 from pants.util.contextutil import temporary_file
-from pants.util.dirutil import safe_mkdir
+from pants.util.dirutil import (
+    safe_concurrent_creation,
+    safe_mkdir,
+    safe_mkdir_for,
+    safe_rm_oldest_items_in_dir,
+)
 from pants.util.fileutil import safe_hardlink_or_copy
 
 
@@ -46,6 +53,12 @@ class CoursierMixin(JvmResolverBase):
 
     RESULT_FILENAME = "result"
 
+    # Bump when the results kept in the resolve cache change shape.
+    _RESOLVE_CACHE_VERSION = 1
+
+    # The number of most recently used resolve results kept in the resolve cache.
+    _MAX_CACHED_RESOLVES = 64
+
     @classmethod
     def implementation_version(cls):
         return super().implementation_version() + [("CoursierMixin", 2)]
@@ -328,6 +341,23 @@ class CoursierMixin(JvmResolverBase):
             + advanced_options
         )
 
+        # Resolves of the same jars with the same arguments share results, whichever targets the
+        # jars came from.
+        cache_key = self._resolve_cache_key(
+            common_args + [coursier_jar],
+            jars_to_resolve,
+            global_excludes if self.get_options().allow_global_excludes else [],
+            pinned_coords,
+            sources,
+            javadoc,
+        )
+        # A report needs coursier to run, and the resolve cache is bypassed along with the artifact
+        # cache, such as when invalidation is forced by `--cache-ignore`.
+        if not self.get_options().report and self.artifact_cache_reads_enabled():
+            cached_results = self._read_cached_resolve(cache_key)
+            if cached_results is not None:
+                return cached_results
+
         coursier_work_temp_dir = os.path.join(self.versioned_workdir, "tmp")
         safe_mkdir(coursier_work_temp_dir)
 
@@ -354,8 +384,93 @@ class CoursierMixin(JvmResolverBase):
             )
             results_by_conf.update(non_default_conf_results)
 
+        if self.artifact_cache_writes_enabled():
+            self._write_cached_resolve(cache_key, results_by_conf)
         return results_by_conf
 
+    @classmethod
+    def _resolve_cache_key(
+        cls, common_args, jars_to_resolve, global_excludes, pinned_coords, sources, javadoc
+    ):
+        """Returns a key for the result of a resolve that does not depend on the order of its
+        inputs.
+
+        :param common_args: The coursier arguments shared by every resolve, including the location of
+                            the coursier cache, which the results refer to.
+        """
+
+        def exclude_key(exclude):
+            return f"{exclude.org}:{exclude.name or '*'}"
+
+        jars = sorted(
+            [
+                jar.coordinate.simple_coord,
+                jar.coordinate.classifier or "",
+                jar.get_url() or "",
+                bool(jar.intransitive),
+                bool(jar.force),
+                sorted(exclude_key(ex) for ex in jar.excludes),
+            ]
+            for jar in jars_to_resolve
+        )
+        return stable_json_sha1(
+            {
+                "version": cls._RESOLVE_CACHE_VERSION,
+                "args": list(common_args),
+                "jars": jars,
+                "pinned": sorted(coord.simple_coord for coord in pinned_coords),
+                "excludes": sorted(exclude_key(ex) for ex in global_excludes),
+                "sources": bool(sources),
+                "javadoc": bool(javadoc),
+            }
+        )
+
+    def _resolve_cache_dir(self):
+        return os.path.join(self.get_options().pants_workdir, "coursier_resolve_cache")
+
+    def _resolve_cache_path(self, cache_key):
+        return os.path.join(self._resolve_cache_dir(), cache_key)
+
+    def _read_cached_resolve(self, cache_key):
+        """Returns the cached results of the resolve with the given key, if they are still usable."""
+        path = self._resolve_cache_path(cache_key)
+        try:
+            with open(path, "rb") as f:
+                results = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.context.log.debug(f"Ignoring unreadable cached resolve {path}: {e!r}")
+            return None
+
+        # The results refer to files in the coursier cache, which may have been cleaned since.
+        for result_list in results.values():
+            for result in result_list:
+                for dep in result["dependencies"]:
+                    jar_path = dep.get("file")
+                    if jar_path and not os.path.exists(jar_path):
+                        return None
+        # Mark the results as recently used, so that pruning keeps them.
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return results
+
+    def _write_cached_resolve(self, cache_key, results):
+        path = self._resolve_cache_path(cache_key)
+        safe_mkdir_for(path)
+        with safe_concurrent_creation(path) as tmp_path:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(dict(results), f, protocol=pickle.HIGHEST_PROTOCOL)
+        try:
+            safe_rm_oldest_items_in_dir(
+                self._resolve_cache_dir(), self._MAX_CACHED_RESOLVES, excludes=[path]
+            )
+        except OSError as e:
+            # Another process pruning the same cache may have removed an item first.
+            self.context.log.debug(f"Failed to prune the resolve cache: {e!r}")
+
     def _get_default_conf_results(
         self,
         common_args,
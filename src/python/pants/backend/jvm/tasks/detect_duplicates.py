@@ -6,6 +6,7 @@ import re
 from collections import defaultdict
 
 from pants.backend.jvm.tasks.classpath_util import ClasspathUtil
+from pants.backend.jvm.tasks.jar_entry_index import JarEntryIndex
 from pants.backend.jvm.tasks.jvm_binary_task import JvmBinaryTask
 from pants.base.exceptions import TaskError
 from pants.java.jar.manifest import Manifest
@@ -82,6 +83,15 @@ class DuplicateDetector(JvmBinaryTask):
     def exclude_patterns(self):
         return [re.compile(x) for x in set(self.get_options().exclude_patterns or [])]
 
+    @memoized_property
+    def _jar_entry_index(self):
+        return JarEntryIndex.for_pants_workdir(self.get_options().pants_workdir)
+
+    @memoized_property
+    def _directory_contents(self):
+        # The contents of the classpath directories listed so far, shared by all binaries.
+        return {}
+
     def execute(self):
         if self.get_options().skip:
             self.context.log.debug("Duplicate checking is disabled.")
@@ -129,7 +139,7 @@ class DuplicateDetector(JvmBinaryTask):
         # no external JarLibrary products.
         def record_file_ownership(target):
             entries = ClasspathUtil.internal_classpath([target], classpath_products)
-            for f in ClasspathUtil.classpath_entries_contents(entries):
+            for f in self._classpath_entries_contents(entries):
                 artifacts_by_file_name[f].add(target.address.reference())
 
         binary_target.walk(record_file_ownership)
@@ -137,12 +147,40 @@ class DuplicateDetector(JvmBinaryTask):
 
     def _get_external_dependencies(self, binary_target):
         artifacts_by_file_name = defaultdict(set)
-        for external_dep, coordinate in self.list_external_jar_dependencies(binary_target):
+        external_deps = self.list_external_jar_dependencies(binary_target)
+        contents = self._classpath_contents_by_entry(dep for dep, _ in external_deps)
+        for external_dep, coordinate in external_deps:
             self.context.log.debug(f"  scanning {coordinate} from {external_dep}")
-            for qualified_file_name in ClasspathUtil.classpath_entries_contents([external_dep]):
+            for qualified_file_name in contents[external_dep]:
                 artifacts_by_file_name[qualified_file_name].add(coordinate.artifact_filename)
         return artifacts_by_file_name
 
+    def _classpath_entries_contents(self, classpath_entries):
+        """Like `ClasspathUtil.classpath_entries_contents`, but reusing previous listings."""
+        classpath_entries = list(classpath_entries)
+        contents = self._classpath_contents_by_entry(classpath_entries)
+        for entry in classpath_entries:
+            yield from contents[entry]
+
+    def _classpath_contents_by_entry(self, classpath_entries):
+        """Returns the contents of each of the given classpath entries.
+
+        The contents of jars come from the persistent `JarEntryIndex`, which lists the jars it has
+        not seen before in parallel, and the contents of directories are listed once per run.
+        """
+        classpath_entries = list(classpath_entries)
+        contents = self._jar_entry_index.entries(
+            {entry for entry in classpath_entries if ClasspathUtil.is_jar(entry)}
+        )
+        for entry in classpath_entries:
+            if entry not in contents:
+                if entry not in self._directory_contents:
+                    self._directory_contents[entry] = tuple(
+                        ClasspathUtil.classpath_entries_contents([entry])
+                    )
+                contents[entry] = self._directory_contents[entry]
+        return contents
+
     def _is_excluded(self, path):
         if self._isdir(path) or Manifest.PATH == path:
             return True
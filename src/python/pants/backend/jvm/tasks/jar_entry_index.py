@@ -0,0 +1,114 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pants.util.contextutil import open_zip
+from pants.util.memo import memoized_classmethod
+from pants.util.record_log import Record, RecordLog
+from pants.util.strutil import ensure_text
+
+
+class JarEntryIndex:
+    """A persistent index of the names of the entries in jars.
+
+    A jar is identified by its path, size and modification time, which are much cheaper to check
+    than a digest of its contents, and are stable for the jars of a resolve cache, which are never
+    rewritten in place. The index is kept in a single append-only `RecordLog`, which is read once,
+    on first use, and the names of the jars missing from it are read on a pool of threads.
+    """
+
+    LOG_FILE_NAME = "jar_entries.log"
+
+    # Beyond this many records, the log is discarded rather than compacted, since it holds no record
+    # of which jars are still in use.
+    _MAX_RECORDS = 100000
+
+    _COMPACTION_MIN_RECORDS = 256
+    _COMPACTION_RATIO = 2
+
+    @classmethod
+    def for_pants_workdir(cls, pants_workdir: str) -> "JarEntryIndex":
+        """Returns the index shared by all tasks in this process using the given workdir."""
+        return cls.for_root(os.path.join(pants_workdir, "jar_entry_index"))
+
+    @memoized_classmethod
+    def for_root(cls, root: str) -> "JarEntryIndex":
+        """Returns the index shared by all tasks in this process under the given root."""
+        return cls(root)
+
+    def __init__(self, root: str) -> None:
+        """
+        :param root: The directory to keep the index in.
+        """
+        self._log = RecordLog(os.path.join(root, self.LOG_FILE_NAME))
+        self._lock = threading.Lock()
+        # A map from the path of a jar to its size, modification time and entry names.
+        self._entries: Optional[Dict[str, Tuple[str, str, Tuple[str, ...]]]] = None
+
+    def entries(
+        self, jars: Iterable[str], max_workers: Optional[int] = None
+    ) -> Dict[str, Tuple[str, ...]]:
+        """Returns the names of the entries in each of the given jars, as `ZipFile.namelist` would.
+
+        :param jars: The paths of the jars to list.
+        :param max_workers: The maximum number of threads to read unindexed jars on. Defaults to a few
+                            per core.
+        """
+        stats = {}
+        for jar in jars:
+            stat = os.stat(jar)
+            stats[jar] = (str(stat.st_size), str(stat.st_mtime_ns))
+
+        with self._lock:
+            index = self._load()
+            result = {}
+            missing = []
+            for jar, (size, mtime) in stats.items():
+                indexed = index.get(jar)
+                if indexed is not None and indexed[:2] == (size, mtime):
+                    result[jar] = indexed[2]
+                else:
+                    missing.append(jar)
+
+        if not missing:
+            return result
+
+        max_workers = max_workers or min(32, 4 * (os.cpu_count() or 1))
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(missing))) as executor:
+            names = list(executor.map(self._read_names, missing))
+
+        records: List[Record] = []
+        with self._lock:
+            for jar, jar_names in zip(missing, names):
+                size, mtime = stats[jar]
+                index[jar] = (size, mtime, jar_names)
+                result[jar] = jar_names
+                # Names that would break a record are rare enough to leave such jars unindexed.
+                if not any("\t" in name or "\n" in name for name in jar_names):
+                    records.append((jar, size, mtime, *jar_names))
+            self._log.append(records)
+        return result
+
+    @staticmethod
+    def _read_names(jar: str) -> Tuple[str, ...]:
+        with open_zip(jar, mode="r") as zf:
+            return tuple(ensure_text(name) for name in zf.namelist())
+
+    def _load(self) -> Dict[str, Tuple[str, str, Tuple[str, ...]]]:
+        if self._entries is not None:
+            return self._entries
+
+        records = self._log.load_compacted(
+            key_fn=lambda record: record[0] if len(record) >= 3 else None,
+            max_records=self._MAX_RECORDS,
+            min_compaction_records=self._COMPACTION_MIN_RECORDS,
+            compaction_ratio=self._COMPACTION_RATIO,
+        )
+        self._entries = {
+            record[0]: (record[1], record[2], record[3:]) for record in records.values()
+        }
+        return self._entries
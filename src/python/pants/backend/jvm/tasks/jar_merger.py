@@ -0,0 +1,233 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import os
+import shutil
+import struct
+import zipfile
+from collections import OrderedDict
+from typing import BinaryIO, Dict, List, NamedTuple, Optional, Set, Union
+
+from pants.backend.jvm.targets.jvm_binary import Duplicate, JarRules, Skip
+from pants.java.jar.manifest import Manifest
+
+# The indexes of the file name and extra field lengths in a zip local file header.
+_FH_FILENAME_LENGTH = 10
+_FH_EXTRA_FIELD_LENGTH = 11
+
+# Generated entries get the earliest zip timestamp, so that their jars are reproducible.
+_GENERATED_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+class _JarMember(NamedTuple):
+    """An entry of one of the jars being merged."""
+
+    jar: str
+    info: zipfile.ZipInfo
+
+
+# A source for an entry of the merged jar: the path of a file, in-memory contents or a jar member.
+_Source = Union[str, bytes, _JarMember]
+
+
+class JarMerger:
+    """Writes a jar from files, in-memory contents and the entries of other jars, without a JVM.
+
+    Entries of other jars are copied as they are stored: a member that is already compressed the way
+    the merged jar asks for is copied byte for byte, rather than inflated and deflated again.
+
+    Entries are written in the order they were first added, each preceded by entries for its parent
+    directories. The `JarRules` decide which entries are skipped and how duplicates are resolved,
+    with a rule's pattern applying to the paths it matches anywhere in, as it does for jar-tool.
+
+    :API: public
+    """
+
+    # The maximum number of jars kept open while copying their entries.
+    _MAX_OPEN_JARS = 64
+
+    def __init__(self, path: str, compressed: bool, jar_rules: JarRules) -> None:
+        """
+        :param path: The path of the jar to write, overwriting any existing file.
+        :param compressed: Whether the entries of the jar are compressed.
+        :param jar_rules: The rules for skipping entries and handling duplicates.
+        """
+        self._path = path
+        self._compress_type = zipfile.ZIP_DEFLATED if compressed else zipfile.ZIP_STORED
+        self._jar_rules = jar_rules
+        self._sources: Dict[str, List[_Source]] = OrderedDict()
+        self._directories: Dict[str, None] = OrderedDict()
+        self._open_jars: "OrderedDict[str, BinaryIO]" = OrderedDict()
+
+    def add_file(self, src: str, dest: str) -> None:
+        """Adds the file at `src` as the entry at `dest`."""
+        self._add(dest, src)
+
+    def add_directory(self, src: str, dest: Optional[str] = None) -> None:
+        """Adds the files under the directory at `src`, prefixing their relative paths with `dest`."""
+        for root, dirs, files in os.walk(src):
+            dirs.sort()
+            relroot = os.path.relpath(root, src)
+            prefix = os.path.normpath(os.path.join(dest or "", relroot)).replace(os.sep, "/")
+            prefix = "" if prefix == "." else prefix + "/"
+            if prefix:
+                self._add_directory(prefix)
+            for f in sorted(files):
+                self.add_file(os.path.join(root, f), prefix + f)
+
+    def add_bytes(self, dest: str, contents: bytes) -> None:
+        """Adds the given contents as the entry at `dest`."""
+        self._add(dest, contents)
+
+    def add_jar(self, path: str) -> None:
+        """Adds the entries of the jar at `path`, save for its manifest."""
+        with zipfile.ZipFile(path) as jar:
+            infos = jar.infolist()
+        for info in infos:
+            if info.filename == Manifest.PATH:
+                continue
+            if info.is_dir():
+                self._add_directory(info.filename)
+            else:
+                self._add(info.filename, _JarMember(path, info))
+
+    def write(self, manifest: Manifest) -> None:
+        """Writes the jar with the given manifest, resolving duplicate entries per the jar rules.
+
+        :raises: :class:`Duplicate.Error` if a duplicate entry is found for a path whose action is
+                 `Duplicate.FAIL`.
+        """
+        entries = [(dest, self._resolve(dest, sources)) for dest, sources in self._sources.items()]
+        try:
+            with zipfile.ZipFile(self._path, "w", allowZip64=True) as out:
+                written_dirs: Set[str] = set()
+
+                def write_parent_dirs(path: str) -> None:
+                    index = path.find("/")
+                    while index != -1:
+                        directory = path[: index + 1]
+                        if directory not in written_dirs:
+                            written_dirs.add(directory)
+                            info = zipfile.ZipInfo(directory, _GENERATED_DATE_TIME)
+                            info.external_attr = (0o40755 << 16) | 0x10
+                            out.writestr(info, b"")
+                        index = path.find("/", index + 1)
+
+                write_parent_dirs(Manifest.PATH)
+                self._write_bytes(out, Manifest.PATH, manifest.contents())
+                for directory in self._directories:
+                    write_parent_dirs(directory)
+                for dest, source in entries:
+                    write_parent_dirs(dest)
+                    if isinstance(source, _JarMember):
+                        self._copy_member(out, dest, source)
+                    elif isinstance(source, bytes):
+                        self._write_bytes(out, dest, source)
+                    else:
+                        out.write(source, dest, compress_type=self._compress_type)
+        finally:
+            for fp in self._open_jars.values():
+                fp.close()
+            self._open_jars.clear()
+
+    def _add(self, dest: str, source: _Source) -> None:
+        if dest == Manifest.PATH or self._skipped(dest):
+            return
+        self._sources.setdefault(dest, []).append(source)
+
+    def _add_directory(self, directory: str) -> None:
+        if not self._skipped(directory):
+            self._directories[directory] = None
+
+    def _skipped(self, path: str) -> bool:
+        return any(
+            isinstance(rule, Skip) and rule.apply_pattern.search(path)
+            for rule in self._jar_rules.rules
+        )
+
+    def _action(self, path: str) -> str:
+        for rule in self._jar_rules.rules:
+            if isinstance(rule, Duplicate) and rule.apply_pattern.search(path):
+                return rule.action
+        return self._jar_rules.default_dup_action
+
+    def _resolve(self, dest: str, sources: List[_Source]) -> _Source:
+        if len(sources) == 1:
+            return sources[0]
+        action = self._action(dest)
+        if action == Duplicate.SKIP:
+            return sources[0]
+        if action == Duplicate.REPLACE:
+            return sources[-1]
+        if action == Duplicate.FAIL:
+            raise Duplicate.Error(dest)
+        contents = b""
+        for source in sources:
+            if action == Duplicate.CONCAT_TEXT and contents and not contents.endswith(b"\n"):
+                contents += b"\n"
+            contents += self._read(source)
+        return contents
+
+    def _read(self, source: _Source) -> bytes:
+        if isinstance(source, _JarMember):
+            with zipfile.ZipFile(source.jar) as jar:
+                return jar.read(source.info)
+        if isinstance(source, bytes):
+            return source
+        with open(source, "rb") as fp:
+            return fp.read()
+
+    def _write_bytes(self, out: zipfile.ZipFile, dest: str, contents: bytes) -> None:
+        info = zipfile.ZipInfo(dest, _GENERATED_DATE_TIME)
+        info.external_attr = 0o644 << 16
+        out.writestr(info, contents, compress_type=self._compress_type)
+
+    def _copy_member(self, out: zipfile.ZipFile, dest: str, member: _JarMember) -> None:
+        source_info = member.info
+        info = zipfile.ZipInfo(dest, source_info.date_time)
+        info.external_attr = source_info.external_attr
+        info.file_size = source_info.file_size
+        zip64 = info.file_size > zipfile.ZIP64_LIMIT
+        encrypted = source_info.flag_bits & 0x1
+        if encrypted or source_info.compress_type != self._compress_type:
+            info.compress_type = self._compress_type
+            with zipfile.ZipFile(member.jar) as jar:
+                with jar.open(source_info) as src, out.open(info, "w", force_zip64=zip64) as dst:
+                    shutil.copyfileobj(src, dst)
+            return
+
+        # Copy the compressed data as is, writing the local header that `ZipFile` would have. This
+        # leans on `ZipFile` internals that have been stable across python 3 releases.
+        info.compress_type = source_info.compress_type
+        info.CRC = source_info.CRC
+        info.compress_size = source_info.compress_size
+        zip64 = zip64 or info.compress_size > zipfile.ZIP64_LIMIT
+        src = self._open_jar(member.jar)
+        src.seek(source_info.header_offset)
+        header = struct.unpack(zipfile.structFileHeader, src.read(zipfile.sizeFileHeader))
+        src.seek(header[_FH_FILENAME_LENGTH] + header[_FH_EXTRA_FIELD_LENGTH], os.SEEK_CUR)
+
+        dst = out.fp
+        assert dst is not None
+        info.header_offset = dst.tell()
+        dst.write(info.FileHeader(zip64))
+        remaining = info.compress_size
+        while remaining > 0:
+            chunk = src.read(min(remaining, 1024 * 1024))
+            if not chunk:
+                raise zipfile.BadZipFile(f"Truncated entry {source_info.filename} in {member.jar}")
+            dst.write(chunk)
+            remaining -= len(chunk)
+        out.start_dir = dst.tell()
+        out.filelist.append(info)
+        out.NameToInfo[info.filename] = info
+
+    def _open_jar(self, path: str) -> BinaryIO:
+        fp = self._open_jars.pop(path, None)
+        if fp is None:
+            if len(self._open_jars) >= self._MAX_OPEN_JARS:
+                _, oldest = self._open_jars.popitem(last=False)
+                oldest.close()
+            fp = open(path, "rb")
+        self._open_jars[path] = fp
+        return fp
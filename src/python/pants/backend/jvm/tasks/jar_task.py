@@ -12,6 +12,7 @@ from pants.backend.jvm.subsystems.jar_tool import JarTool
 from pants.backend.jvm.targets.java_agent import JavaAgent
 from pants.backend.jvm.targets.jvm_binary import Duplicate, JarRules, JvmBinary, Skip
 from pants.backend.jvm.tasks.classpath_util import ClasspathUtil
+from pants.backend.jvm.tasks.jar_merger import JarMerger
 from pants.backend.jvm.tasks.nailgun_task import NailgunTask
 from pants.base.exceptions import TaskError
 from pants.java.jar.manifest import Manifest
@@ -209,6 +210,42 @@ class Jar:
 
         self._jars.append(jar)
 
+    def _is_empty(self):
+        return not (
+            self._entries or self._jars or self._manifest_entry or self._main or self.classpath
+        )
+
+    def _merge(self, compressed, jar_rules):
+        """Writes this jar in-process with a `JarMerger`.
+
+        Only jars without a custom manifest can be merged, since jar-tool rewrites custom manifests.
+
+        :param bool compressed: entries added to the jar should be compressed
+        :param jar_rules: the rules for handling jar exclusions and duplicates
+        """
+        assert self._manifest_entry is None
+        merger = JarMerger(self._path, compressed=compressed, jar_rules=jar_rules)
+        with temporary_dir() as scratch_dir:
+            for entry in self._entries:
+                src = entry.materialize(scratch_dir)
+                if os.path.isdir(src):
+                    merger.add_directory(src, entry.dest)
+                else:
+                    merger.add_file(src, entry.dest)
+            for jar in self._jars:
+                merger.add_jar(jar)
+
+            manifest = Manifest()
+            manifest.addentry(Manifest.MANIFEST_VERSION, "1.0")
+            if self._main:
+                manifest.addentry(Manifest.MAIN_CLASS, self._main)
+            if self.classpath:
+                classpath = relativize_classpath(
+                    self.classpath, os.path.dirname(self._path), followlinks=False
+                )
+                manifest.addentry(Manifest.CLASS_PATH, " ".join(classpath))
+            merger.write(manifest)
+
     @contextmanager
     def _render_jar_tool_args(self, options):
         """Format the arguments to jar-tool.
@@ -276,6 +313,19 @@ class JarTask(NailgunTask):
     :API: public
     """
 
+    @classmethod
+    def register_options(cls, register):
+        super().register_options(register)
+        register(
+            "--merge-in-process",
+            type=bool,
+            default=True,
+            advanced=True,
+            help="Write new jars without a custom manifest in-process, copying the entries of "
+            "merged jars without recompressing them, rather than with the jar-tool. Updates to "
+            "existing jars and jars with a custom manifest always use the jar-tool.",
+        )
+
     @classmethod
     def subsystem_dependencies(cls):
         return super().subsystem_dependencies() + (JarTool,)
@@ -328,12 +378,22 @@ class JarTask(NailgunTask):
         except jar.Error as e:
             raise TaskError(f"Failed to write to jar at {path}: {e!r}")
 
+        jar_rules = jar_rules or JarRules.default()
+        can_merge = (overwrite or not os.path.exists(path)) and jar._manifest_entry is None
+        if self.get_options().merge_in_process and can_merge:
+            if jar._is_empty():  # Don't build an empty jar
+                return
+            try:
+                jar._merge(compressed=compressed, jar_rules=jar_rules)
+            except Duplicate.Error as e:
+                raise TaskError(f"Failed to write to jar at {path}: {e}")
+            return
+
         with jar._render_jar_tool_args(self.get_options()) as args:
             if args:  # Don't build an empty jar
                 args.append(f"-update={self._flag(not overwrite)}")
                 args.append(f"-compress={self._flag(compressed)}")
 
-                jar_rules = jar_rules or JarRules.default()
                 args.append(f"-default_action={self._action_name(jar_rules.default_dup_action)}")
 
                 skip_patterns = []
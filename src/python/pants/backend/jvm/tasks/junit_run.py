@@ -5,6 +5,7 @@ import fnmatch
 import itertools
 import os
 import sys
+from collections import defaultdict
 from contextlib import contextmanager
 
 from pants.backend.jvm import argfile
@@ -20,6 +21,7 @@ from pants.base.exceptions import TargetDefinitionException, TaskError
 from pants.base.workunit import WorkUnitLabel
 from pants.build_graph.target import Target
 from pants.build_graph.target_scopes import Scopes
+from pants.goal.timing_history import balance_by_duration
 from pants.java.executor import SubprocessExecutor
 from pants.java.junit.junit_xml_parser import RegistryOfTests, Test, parse_failed_targets
 from pants.process.lock import OwnerPrintingInterProcessFileLock
@@ -428,12 +430,22 @@ class JUnitRun(PartitionedTestRunnerTaskMixin, JvmToolTaskMixin, JvmTask):
                 tests_info = self.parse_test_info(
                     batch_output_dir, parse_error_handler, ["classname"]
                 )
+                batch_test_durations = defaultdict(float)
                 for test_name, test_info in tests_info.items():
                     test_item = Test(test_info["classname"], test_name)
                     test_target = test_registry.get_owning_target(test_item)
                     self.report_all_info_for_single_test(
                         self.options_scope, test_target, test_name, test_info
                     )
+                    if test_info["time"] is not None:
+                        # Sum the time under the test that was asked for: a whole test class, unless
+                        # single methods were.
+                        batch_test = test_item.enclosing()
+                        if test_registry.get_owning_target(batch_test) is None:
+                            batch_test = test_item
+                        batch_test_durations[batch_test] += test_info["time"]
+                for batch_test, duration in batch_test_durations.items():
+                    self.report_test_case_duration(batch_test.render_test_spec(), duration)
 
                 if result != 0 and fail_fast:
                     break
@@ -504,11 +516,40 @@ class JUnitRun(PartitionedTestRunnerTaskMixin, JvmToolTaskMixin, JvmTask):
                 threads or 0,
             )
 
+        estimate = self._test_duration_estimator(test_registry)
         for properties, tests in sorted(tests_by_properties.items(), key=_sort_properties):
             sorted_tests = sorted(tests)
             stride = min(self._batch_size, len(sorted_tests))
-            for i in range(0, len(sorted_tests), stride):
-                yield properties, sorted_tests[i : i + stride]
+            if estimate is None:
+                for i in range(0, len(sorted_tests), stride):
+                    yield properties, sorted_tests[i : i + stride]
+            else:
+                # Run as many batches as striding would, but with even expected durations.
+                num_batches = (len(sorted_tests) + stride - 1) // stride
+                for batch in balance_by_duration(sorted_tests, estimate, num_batches, stride):
+                    yield properties, batch
+
+    def _test_duration_estimator(self, test_registry):
+        """Returns a function estimating the duration of a test from its recorded durations, or None
+        if there are none for any of the tests or their targets.
+
+        Tests without a recorded duration of their own get an even share of their target's, and the
+        rest are estimated at the mean of the tests that have an estimate.
+        """
+        per_test_estimates = {}
+        for (target,), tests in test_registry.index(lambda tgt: tgt).items():
+            target_duration = self.estimated_test_duration(target) if target else None
+            for test in tests:
+                duration = self.estimated_test_case_duration(test.render_test_spec())
+                if duration is None and target_duration is not None:
+                    duration = target_duration / len(tests)
+                if duration is not None:
+                    per_test_estimates[test] = duration
+        if not per_test_estimates:
+            return None
+
+        default = sum(per_test_estimates.values()) / len(per_test_estimates)
+        return lambda test: per_test_estimates.get(test, default)
 
     def _parse(self, test_spec_str):
         """Parses a test specification string into an object that can yield corresponding tests.
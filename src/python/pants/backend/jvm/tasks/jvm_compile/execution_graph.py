@@ -4,9 +4,10 @@
 import queue
 import sys
 import threading
+import time
 import traceback
 from collections import defaultdict, deque
-from heapq import heappop, heappush
+from heapq import heapify, heappop, heappush
 
 from pants.base.worker_pool import Work
 from pants.util.contextutil import Timer
@@ -35,7 +36,9 @@ class Job:
         """
 
         :param key: Key used to reference and look up jobs
-        :param fn callable: The work to perform
+        :param fn callable: The work to perform. It may return False to report that it did no real
+                            work, such as when it found its results in a cache, in which case its
+                            duration is not measured.
         :param dependencies: List of keys for dependent jobs
         :param size: Estimated job size used for prioritization
         :param on_success: Zero parameter callback to run if job completes successfully. Run on main
@@ -56,7 +59,7 @@ class Job:
         self.target = target
 
     def __call__(self):
-        self.fn()
+        return self.fn()
 
     def run_success_callback(self):
         if self.on_success:
@@ -165,17 +168,71 @@ class ThreadSafeCounter:
             self._counter -= 1
 
 
+class WorkerStats:
+    """Tracks how busy each worker thread was while an ExecutionGraph executed."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._busy_secs = defaultdict(float)
+        self._job_counts = defaultdict(int)
+        self._start_time = None
+        self._end_time = None
+
+    def start(self):
+        self._start_time = time.time()
+        self._end_time = None
+
+    def stop(self):
+        self._end_time = time.time()
+
+    def record(self, secs):
+        worker = threading.current_thread().name
+        with self._lock:
+            self._busy_secs[worker] += secs
+            self._job_counts[worker] += 1
+
+    def get_all(self):
+        """Returns a dict from worker thread name to its busy time, job count and utilisation.
+
+        Utilisation is the fraction of the execution's wall time that the worker spent running jobs.
+        """
+        if self._start_time is None:
+            return {}
+        elapsed = (self._end_time or time.time()) - self._start_time
+        with self._lock:
+            return {
+                worker: {
+                    "busy_secs": busy_secs,
+                    "jobs": self._job_counts[worker],
+                    "utilisation": busy_secs / elapsed if elapsed else 0.0,
+                }
+                for worker, busy_secs in self._busy_secs.items()
+            }
+
+
 class ExecutionGraph:
     """A directed acyclic graph of work to execute.
 
+    Ready jobs are submitted to the worker pool critical path first: a job's priority is its own
+    estimated duration plus the longest estimated chain of work that depends on it. Durations
+    measured for jobs in previous runs can be passed in as estimates. Jobs without a measurement are
+    estimated from their `size`, scaled by the time per unit of size observed for measured jobs,
+    which is refined as jobs finish, and the ready jobs are reprioritised when it shifts.
+
     This is currently only used within jvm compile, but the intent is to unify it with the future
     global execution graph.
     """
 
-    def __init__(self, job_list, print_stack_trace):
+    # The relative change in the observed time per unit of size at which job priorities are
+    # recomputed.
+    _REPRIORITIZATION_THRESHOLD = 0.25
+
+    def __init__(self, job_list, print_stack_trace, duration_estimates=None):
         """
 
         :param job_list Job: list of Jobs to schedule and run.
+        :param duration_estimates: An optional dict from job key to an estimate of the job's duration
+                                   in seconds, such as the duration measured in a previous run.
         """
         self._print_stack_trace = print_stack_trace
         self._dependencies = defaultdict(list)
@@ -183,6 +240,10 @@ class ExecutionGraph:
         self._jobs = {}
         self._job_keys_as_scheduled = []
         self._job_keys_with_no_dependencies = []
+        self._duration_estimates = dict(duration_estimates or {})
+        self._successful_durations = {}
+        self._worker_stats = WorkerStats()
+        self._secs_per_size_for_priorities = None
 
         for job in job_list:
             self._schedule(job)
@@ -194,8 +255,38 @@ class ExecutionGraph:
         if len(self._job_keys_with_no_dependencies) == 0:
             raise NoRootJobError()
 
+        # The total measured duration and size of jobs with both, from which the duration of jobs
+        # without an estimate is extrapolated.
+        self._measured_secs = 0.0
+        self._measured_size = 0
+        for key, duration in self._duration_estimates.items():
+            if key in self._jobs:
+                self._add_measurement(self._jobs[key].size, duration)
+
         self._job_priority = self._compute_job_priorities(job_list)
 
+    @property
+    def successful_job_durations(self):
+        """A dict from the key of each job that succeeded, having done real work, to its duration
+        in seconds."""
+        return self._successful_durations
+
+    @property
+    def worker_stats(self):
+        """The utilisation of each worker thread during `execute`.
+
+        :rtype: :class:`WorkerStats`
+        """
+        return self._worker_stats
+
+    def _add_measurement(self, size, duration):
+        if size > 0:
+            self._measured_secs += duration
+            self._measured_size += size
+
+    def _secs_per_size(self):
+        return self._measured_secs / self._measured_size if self._measured_size else None
+
     def format_dependee_graph(self):
         def entry(key):
             dependees = self._dependees[key]
@@ -221,11 +312,26 @@ class ExecutionGraph:
         for dependency_key in dependency_keys:
             self._dependees[dependency_key].append(key)
 
+    def _estimate_job_weights(self, job_list):
+        """Returns a dict from job key to the job's estimated duration.
+
+        Without any duration estimates, job sizes are used as is.
+        """
+        if not self._duration_estimates:
+            return {job.key: job.size for job in job_list}
+        secs_per_size = self._secs_per_size() or 0
+        self._secs_per_size_for_priorities = secs_per_size
+        return {
+            job.key: self._duration_estimates.get(job.key, job.size * secs_per_size)
+            for job in job_list
+        }
+
     def _compute_job_priorities(self, job_list):
         """Walks the dependency graph breadth-first, starting from the most dependent tasks, and
-        computes the job priority as the sum of the jobs sizes along the critical path."""
+        computes the job priority as the sum of the jobs estimated durations along the critical
+        path."""
 
-        job_size = {job.key: job.size for job in job_list}
+        job_size = self._estimate_job_weights(job_list)
         job_priority = defaultdict(int)
 
         bfs_queue = deque()
@@ -288,6 +394,7 @@ class ExecutionGraph:
 
         heap = []
         jobs_in_flight = ThreadSafeCounter()
+        self._worker_stats.start()
 
         def put_jobs_into_heap(job_keys):
             for job_key in job_keys:
@@ -300,8 +407,8 @@ class ExecutionGraph:
                 status_table.mark_as(RUNNING, worker_key)
                 try:
                     with Timer() as timer:
-                        work()
-                    result = (worker_key, SUCCESSFUL, None, timer.elapsed)
+                        did_work = work()
+                    result = (worker_key, SUCCESSFUL, did_work, timer.elapsed)
                 except BaseException:
                     _, exc_value, exc_traceback = sys.exc_info()
                     result = (
@@ -310,6 +417,7 @@ class ExecutionGraph:
                         (exc_value, traceback.format_tb(exc_traceback)),
                         timer.elapsed,
                     )
+                self._worker_stats.record(timer.elapsed)
                 finished_queue.put(result)
                 jobs_in_flight.decrement()
 
@@ -322,6 +430,23 @@ class ExecutionGraph:
             put_jobs_into_heap(job_keys)
             try_to_submit_jobs_from_heap()
 
+        def reprioritize(finished_job, duration):
+            """Folds the finished job's duration into the estimates for jobs without one, and
+            reorders the queued jobs if those estimates have shifted enough."""
+            if finished_job.key in self._duration_estimates or not self._duration_estimates:
+                return
+            self._add_measurement(finished_job.size, duration)
+            secs_per_size = self._secs_per_size()
+            previous = self._secs_per_size_for_priorities
+            if secs_per_size is None or (
+                previous
+                and abs(secs_per_size - previous) <= previous * self._REPRIORITIZATION_THRESHOLD
+            ):
+                return
+            self._job_priority = self._compute_job_priorities(self._jobs.values())
+            heap[:] = [(-self._job_priority[job_key], job_key) for _, job_key in heap]
+            heapify(heap)
+
         try:
             submit_jobs(self._job_keys_with_no_dependencies)
 
@@ -340,6 +465,10 @@ class ExecutionGraph:
 
                 # Queue downstream tasks.
                 if result_status is SUCCESSFUL:
+                    # The durations of jobs that did no real work say nothing about later runs.
+                    if value is not False:
+                        self._successful_durations[finished_key] = duration
+                        reprioritize(finished_job, duration)
                     try:
                         finished_job.run_success_callback()
                     except Exception as e:
@@ -386,6 +515,8 @@ class ExecutionGraph:
                 self._jobs[key].run_failure_callback()
             log.debug(traceback.format_exc())
             raise ExecutionFailure("Error running job", e)
+        finally:
+            self._worker_stats.stop()
 
         if status_table.has_failures():
             raise ExecutionFailure(f"Failed jobs: {', '.join(status_table.failed_keys())}")
@@ -37,6 +37,7 @@ from pants.base.worker_pool import WorkerPool
 from pants.base.workunit import WorkUnitLabel
 from pants.build_graph.target import Target
 from pants.engine.fs import EMPTY_DIRECTORY_DIGEST, PathGlobs, PathGlobsAndRoot
+from pants.goal.timing_history import TimingHistory
 from pants.java.distribution.distribution import DistributionLocator
 from pants.option.compiler_option_sets_mixin import CompilerOptionSetsMixin
 from pants.option.ranked_value import RankedValue
@@ -181,6 +182,16 @@ class JvmCompile(CompilerOptionSetsMixin, NailgunTaskBase):
             "may be useful for distributed builds.",
         )
 
+        register(
+            "--schedule-by-measured-durations",
+            advanced=True,
+            type=bool,
+            default=True,
+            help="Remember how long each compile job took, and prioritise jobs on the critical "
+            "path by those durations in later runs. Jobs that have not run before are estimated "
+            "by --size-estimator.",
+        )
+
         register(
             "--capture-classpath",
             advanced=True,
@@ -647,11 +658,38 @@ class JvmCompile(CompilerOptionSetsMixin, NailgunTaskBase):
             compile_contexts, invalid_targets, invalidation_check.invalid_vts, classpath_product
         )
 
-        exec_graph = ExecutionGraph(jobs, self.get_options().print_exception_stacktrace)
+        timing_history = self._timing_history
+        duration_estimates = {}
+        if timing_history:
+            for job in jobs:
+                duration = timing_history.get(self.options_scope, job.key)
+                if duration is not None:
+                    duration_estimates[job.key] = duration
+
+        exec_graph = ExecutionGraph(
+            jobs, self.get_options().print_exception_stacktrace, duration_estimates
+        )
         try:
             exec_graph.execute(worker_pool, self.context.log)
         except ExecutionFailure as e:
             raise TaskError(f"Compilation failure: {e!r}")
+        finally:
+            if timing_history:
+                for key, duration in exec_graph.successful_job_durations.items():
+                    timing_history.record(self.options_scope, key, duration)
+                timing_history.flush()
+            for worker, stats in sorted(exec_graph.worker_stats.get_all().items()):
+                self.context.log.debug(
+                    "{} ran {} jobs in {:.3f}s ({:.0%} utilisation).".format(
+                        worker, stats["jobs"], stats["busy_secs"], stats["utilisation"]
+                    )
+                )
+
+    @memoized_property
+    def _timing_history(self):
+        if not self.get_options().schedule_by_measured_durations:
+            return None
+        return TimingHistory.for_pants_workdir(self.get_options().pants_workdir)
 
     def _record_compile_classpath(self, classpath, target, outdir):
         relative_classpaths = [
@@ -1180,7 +1218,8 @@ class JvmCompile(CompilerOptionSetsMixin, NailgunTaskBase):
         progress_message = ctx.target.address.spec
 
         # See whether the cache-doublecheck job hit the cache: if so, noop: otherwise, compile.
-        if vts.valid:
+        compiled = not vts.valid
+        if not compiled:
             counter()
         else:
             # Compute the compile classpath for this target.
@@ -1235,3 +1274,5 @@ class JvmCompile(CompilerOptionSetsMixin, NailgunTaskBase):
             ctx.target, [(conf, self._classpath_for_context(ctx)) for conf in self._confs],
         )
         self.register_extra_products_from_contexts([ctx.target], all_compile_contexts)
+        # Report a cache hit, so that its duration is not taken for that of a compile.
+        return compiled
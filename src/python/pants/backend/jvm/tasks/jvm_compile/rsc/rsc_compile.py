@@ -461,7 +461,8 @@ class RscCompile(ZincCompile, MirroredTargetOptionMixin):
                 )
 
             # If we didn't hit the cache in the cache job, run rsc.
-            if not vts.valid:
+            outlined = not vts.valid
+            if outlined:
                 counter_val = str(counter()).rjust(counter.format_length(), " ")
                 counter_str = f"[{counter_val}/{counter.size}] "
                 action_str = "Outlining " if use_youtline else "Rsc-ing "
@@ -584,6 +585,7 @@ class RscCompile(ZincCompile, MirroredTargetOptionMixin):
 
             # Update the products with the latest classes.
             self.register_extra_products_from_contexts([ctx.target], compile_contexts)
+            return outlined
 
         ### Create Jobs for ExecutionGraph
         cache_doublecheck_jobs = []
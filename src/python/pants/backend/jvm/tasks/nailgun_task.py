@@ -55,6 +55,17 @@ class NailgunTaskBase(JvmToolTaskMixin, TaskBase):
             type=int,
             help="Max attempts for nailgun connects.",
         )
+        register(
+            "--nailgun-pool-size",
+            advanced=True,
+            default=1,
+            type=int,
+            help="The maximum number of nailgun servers to keep running for this task, each for a "
+            "different JVM configuration (classpath, JVM options and distribution). When a run "
+            "needs a configuration that none of them has, the least recently used server is "
+            "replaced. Larger pools avoid restarting a warmed up JVM when alternating between "
+            "configurations, at the cost of the memory of the idle JVMs.",
+        )
         cls.register_jvm_tool(
             register,
             "nailgun-server",
@@ -100,6 +111,7 @@ class NailgunTaskBase(JvmToolTaskMixin, TaskBase):
                 startup_timeout=self.get_options().nailgun_subprocess_startup_timeout,
                 connect_timeout=self.get_options().nailgun_timeout_seconds,
                 connect_attempts=self.get_options().nailgun_connect_attempts,
+                pool_size=self.get_options().nailgun_pool_size,
             )
         else:
             return SubprocessExecutor(dist)
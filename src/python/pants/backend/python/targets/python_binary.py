@@ -3,8 +3,6 @@
 
 import os
 
-from pex.pex_info import PexInfo
-
 from pants.backend.python.targets.python_target import PythonTarget
 from pants.base.exceptions import TargetDefinitionException
 from pants.base.payload import Payload
@@ -176,6 +174,8 @@ class PythonBinary(PythonTarget):
 
     @property
     def pexinfo(self):
+        from pex.pex_info import PexInfo
+
         info = PexInfo.default()
         for repo in self.repositories:
             info.add_repository(repo)
@@ -1,9 +1,6 @@
 # Copyright 2014 Pants project contributors (see CONTRIBUTORS.md).
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
-
-from pex.interpreter import PythonIdentity
-
 from pants.backend.python.python_artifact import PythonArtifact
 from pants.base.exceptions import TargetDefinitionException
 from pants.base.payload import Payload
@@ -65,6 +62,8 @@ class PythonTarget(Target):
         self._provides = provides
 
         # Check that the compatibility requirements are well-formed.
+        from pex.interpreter import PythonIdentity
+
         for req in self.payload.compatibility:
             try:
                 PythonIdentity.parse_requirement(req)
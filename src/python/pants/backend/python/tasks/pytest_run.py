@@ -609,7 +609,11 @@ class PytestRun(PartitionedTestRunnerTaskMixin, Task):
         if per_target:
 
             def iter_partitions():
-                for test_target in test_targets:
+                # Run the targets expected to be quickest first, so that failures surface as soon as
+                # possible. Targets without a recorded duration are likely new, so run those first.
+                for test_target in sorted(
+                    test_targets, key=lambda t: self.estimated_test_duration(t) or 0
+                ):
                     yield (test_target,)
 
         else:
@@ -2,14 +2,19 @@
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
 import hashlib
+import io
 import json
 import logging
+import os
+import threading
+import time
 import typing
 from collections import OrderedDict
 from collections.abc import Iterable, Mapping, Set
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from pathlib import Path
-from typing import Any, Optional, Type, Union
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type, Union
 
 from typing_extensions import Protocol
 
@@ -41,6 +46,23 @@ def hash_all(strs: typing.Iterable[Union[bytes, str]], digest: Optional[Digest]
     return digest.hexdigest()
 
 
+# Files are read into a buffer of this size that each thread reuses. Unlike a memory map, which
+# raises SIGBUS if the file is truncated while it is read, a read just comes up short.
+_READ_BUFFER_SIZE = 1024 * 1024
+_read_buffers = threading.local()
+
+
+def _update_with_file(fd: io.BufferedIOBase, digest: Digest) -> None:
+    buffer = getattr(_read_buffers, "buffer", None)
+    if buffer is None:
+        buffer = _read_buffers.buffer = bytearray(_READ_BUFFER_SIZE)
+    view = memoryview(buffer)
+    n = fd.readinto(buffer)
+    while n:
+        digest.update(view[:n])
+        n = fd.readinto(buffer)
+
+
 def hash_file(path: Union[str, Path], digest: Optional[Digest] = None) -> str:
     """Hashes the contents of the file at the given path and returns the hash digest in hex form.
 
@@ -48,13 +70,62 @@ def hash_file(path: Union[str, Path], digest: Optional[Digest] = None) -> str:
     """
     digest = digest or hashlib.sha1()
     with open(path, "rb") as fd:
-        s = fd.read(8192)
-        while s:
-            digest.update(s)
-            s = fd.read(8192)
+        _update_with_file(fd, digest)
     return digest.hexdigest()
 
 
+# A map from the (device, inode, size, mtime) of a file to the sha1 of its contents, kept for the
+# life of the process so that a pantsd process need not rehash files that have not changed.
+_file_digests: Dict[Tuple[int, int, int, int], str] = {}
+_file_digests_lock = threading.Lock()
+_MAX_MEMOIZED_FILE_DIGESTS = 100000
+
+# Digests of files modified this recently are not memoized, since the file could be modified again
+# without its mtime changing, at the granularity of some filesystems' timestamps.
+_RACY_MTIME_NS = 2 * 1000000000
+
+
+def _hash_file_memoized(path: Union[str, Path], memoize: bool) -> str:
+    with open(path, "rb") as fd:
+        stat = os.fstat(fd.fileno())
+        key = (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+        if memoize:
+            with _file_digests_lock:
+                memoized = _file_digests.get(key)
+            if memoized is not None:
+                return memoized
+        digest = hashlib.sha1()
+        _update_with_file(fd, digest)
+    hexdigest = digest.hexdigest()
+    if memoize and time.time() * 1000000000 - stat.st_mtime_ns >= _RACY_MTIME_NS:
+        with _file_digests_lock:
+            if len(_file_digests) >= _MAX_MEMOIZED_FILE_DIGESTS:
+                _file_digests.clear()
+            _file_digests[key] = hexdigest
+    return hexdigest
+
+
+def hash_files(
+    paths: Sequence[Union[str, Path]], *, memoize: bool = False, max_workers: Optional[int] = None
+) -> List[str]:
+    """Returns the sha1 hex digests of the contents of the files at the given paths, in order.
+
+    The files are hashed on a pool of threads, so that reading one file overlaps with reading and
+    hashing others (hashlib releases the GIL while hashing). Large files are memory-mapped.
+
+    :param paths: The paths of the files to hash.
+    :param memoize: Whether to remember the digest of each file by its inode, size and mtime for the
+                    life of the process, and reuse a remembered digest if these are unchanged. Files
+                    modified in the last couple of seconds are always hashed afresh.
+    :param max_workers: The maximum number of threads to hash on. Defaults to a few per core.
+    """
+    if len(paths) <= 1:
+        return [_hash_file_memoized(path, memoize) for path in paths]
+    max_workers = max_workers or min(32, 4 * (os.cpu_count() or 1))
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(paths))) as executor:
+        return list(executor.map(lambda path: _hash_file_memoized(path, memoize), paths))
+
+
 def hash_dir(path: Path, *, digest: Optional[Digest] = None) -> str:
     """Hashes the recursive contents under the given directory path.
 
@@ -68,10 +139,12 @@ def hash_dir(path: Path, *, digest: Optional[Digest] = None) -> str:
 
     digest = digest or hashlib.sha1()
     root = path.resolve()
-    for pth in sorted(p for p in root.rglob("*")):
+    paths = sorted(p for p in root.rglob("*"))
+    file_digests = iter(hash_files([pth for pth in paths if not pth.is_dir()]))
+    for pth in paths:
         digest.update(bytes(pth.relative_to(root)))
         if not pth.is_dir():
-            hash_file(pth, digest=digest)
+            digest.update(next(file_digests).encode())
     return digest.hexdigest()
 
 
@@ -1,6 +1,7 @@
 # Copyright 2014 Pants project contributors (see CONTRIBUTORS.md).
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
+import logging
 import multiprocessing
 import threading
 from multiprocessing.pool import ThreadPool
@@ -13,7 +14,7 @@ from pants.reporting.report import Report
 class Work:
     """Represents multiple concurrent calls to the same callable."""
 
-    def __init__(self, func, args_tuples, workunit_name=None):
+    def __init__(self, func, args_tuples, workunit_name=None, cpu_bound=False):
         # A callable.
         self.func = func
 
@@ -24,12 +25,18 @@ class Work:
         # If specified, each invocation will be executed in a workunit of this name.
         self.workunit_name = workunit_name
 
+        # Whether each invocation is CPU-bound, and so should run in a subprocess when the pool has
+        # them (see ProcessWorkerPool). If so, func and the args must be picklable: func must be a
+        # module-level function, and its return value must be picklable as well.
+        self.cpu_bound = cpu_bound
+
 
 class WorkerPool:
     """A pool of workers.
 
     Workers are threads, and so are subject to GIL constraints. Submitting CPU-bound work may not be
-    effective. Use this class primarily for IO-bound work.
+    effective. Use this class primarily for IO-bound work, and a ProcessWorkerPool for work that
+    includes CPU-bound `Work`.
     """
 
     def __init__(self, parent_workunit, run_tracker, num_workers, thread_name_prefix):
@@ -86,7 +93,8 @@ class WorkerPool:
                     *args,
                     workunit_name=work.workunit_name,
                     workunit_parent=workunit_parent,
-                    on_failure=on_failure
+                    on_failure=on_failure,
+                    cpu_bound=work.cpu_bound
                 )
 
             return self._pool.map_async(do_work, work.args_tuples, chunksize=1, callback=on_success)
@@ -154,7 +162,8 @@ class WorkerPool:
                     work.func,
                     *args,
                     workunit_name=work.workunit_name,
-                    workunit_parent=workunit_parent
+                    workunit_parent=workunit_parent,
+                    cpu_bound=work.cpu_bound
                 )
 
             # We need to specify a timeout explicitly, because otherwise python ignores SIGINT when waiting
@@ -163,15 +172,17 @@ class WorkerPool:
                 timeout=1000000000
             )
 
-    def _do_work(self, func, args_tuple, workunit_name, workunit_parent, on_failure=None):
+    def _do_work(
+        self, func, args_tuple, workunit_name, workunit_parent, on_failure=None, cpu_bound=False
+    ):
         try:
             if workunit_name:
                 with self._run_tracker.new_workunit_under_parent(
                     name=workunit_name, parent=workunit_parent
                 ):
-                    return func(*args_tuple)
+                    return self._call(func, args_tuple, cpu_bound)
             else:
-                return func(*args_tuple)
+                return self._call(func, args_tuple, cpu_bound)
         except KeyboardInterrupt:
             # If a worker thread intercepts a KeyboardInterrupt, we want to propagate it to the main
             # thread.
@@ -184,6 +195,10 @@ class WorkerPool:
                 on_failure(e)
             raise
 
+    def _call(self, func, args_tuple, cpu_bound):
+        """Invokes func on args_tuple in the calling worker thread."""
+        return func(*args_tuple)
+
     def shutdown(self):
         with self._pending_workchains_cond:
             while self._pending_workchains > 0:
@@ -197,6 +212,101 @@ class WorkerPool:
         self._pool.terminate()
 
 
+class _LogRecordBuffer(logging.Handler):
+    """Buffers the log records emitted in a ProcessWorkerPool subprocess during one invocation."""
+
+    def __init__(self):
+        super().__init__(level=logging.DEBUG)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append((record.levelname, self.format(record)))
+
+
+_subprocess_log_buffer = None
+
+
+def _initialize_subprocess():
+    global _subprocess_log_buffer
+    _subprocess_log_buffer = _LogRecordBuffer()
+    root = logging.getLogger()
+    root.handlers = [_subprocess_log_buffer]
+    root.setLevel(logging.DEBUG)
+
+
+def _call_in_subprocess(func, args_tuple):
+    """Invokes func on args_tuple in a ProcessWorkerPool subprocess.
+
+    :returns: A tuple of the return value or None, the raised exception or None, and the log records
+              emitted by the invocation as (level name, message) pairs.
+    """
+    _subprocess_log_buffer.records = []
+    try:
+        return func(*args_tuple), None, _subprocess_log_buffer.records
+    except Exception as e:
+        return None, e, _subprocess_log_buffer.records
+
+
+class ProcessWorkerPool(WorkerPool):
+    """A pool of workers that runs CPU-bound work in subprocesses.
+
+    Work marked `cpu_bound` is sent from the worker threads to a pool of subprocesses, so that it
+    can use as many cores as there are subprocesses instead of serializing on the GIL. All other
+    work runs in the worker threads, just as for a WorkerPool.
+
+    Workunits are still opened and closed by the worker threads, so their timings are accounted
+    for as usual, and messages logged by the work in a subprocess are relayed to the RunTracker
+    under the work's workunit once the invocation completes.
+
+    Subprocesses are started from a fork server rather than forked from this (threaded) process, so
+    they cannot inherit locks held by other threads (see SubprocPool).
+    """
+
+    # Maps logging level names to the levels of RunTracker.log.
+    _REPORT_LEVELS = {
+        "CRITICAL": Report.FATAL,
+        "ERROR": Report.ERROR,
+        "WARNING": Report.WARN,
+        "INFO": Report.INFO,
+        "DEBUG": Report.DEBUG,
+    }
+
+    def __init__(
+        self, parent_workunit, run_tracker, num_workers, thread_name_prefix, num_processes=None
+    ):
+        """
+        :param num_processes: The number of subprocesses to run CPU-bound work in. Defaults to
+                              `num_workers`, as there is no point in more.
+        """
+        super().__init__(parent_workunit, run_tracker, num_workers, thread_name_prefix)
+        context = multiprocessing.get_context("forkserver")
+        self._process_pool = context.Pool(
+            processes=num_processes or num_workers, initializer=_initialize_subprocess
+        )
+
+    def _call(self, func, args_tuple, cpu_bound):
+        if not cpu_bound:
+            return super()._call(func, args_tuple, cpu_bound)
+        # As in submit_work_and_wait, an explicit timeout keeps the wait interruptible.
+        result, error, records = self._process_pool.apply_async(
+            _call_in_subprocess, (func, args_tuple)
+        ).get(timeout=1000000000)
+        for level_name, message in records:
+            self._run_tracker.log(self._REPORT_LEVELS.get(level_name, Report.INFO), message)
+        if error is not None:
+            raise error
+        return result
+
+    def shutdown(self):
+        super().shutdown()
+        self._process_pool.close()
+        self._process_pool.join()
+
+    def abort(self):
+        super().abort()
+        self._process_pool.terminate()
+
+
 class SubprocPool:
     """Singleton for managing multiprocessing.Pool instances.
 
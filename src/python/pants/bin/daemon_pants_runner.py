@@ -11,6 +11,7 @@ from typing import Callable, Iterator, Optional
 from pants.base.exception_sink import ExceptionSink
 from pants.base.exiter import PANTS_FAILED_EXIT_CODE, PANTS_SUCCEEDED_EXIT_CODE, ExitCode, Exiter
 from pants.bin.local_pants_runner import LocalPantsRunner
+from pants.goal.run_tracker import RunTracker
 from pants.init.logging import encapsulated_global_logger
 from pants.init.util import clean_global_runtime_state
 from pants.java.nailgun_io import (
@@ -274,6 +275,9 @@ class DaemonPantsRunner(ExceptionSink.AccessGlobalExiterMixin):
                         self._args, self._env, specs, graph_helper, options_bootstrapper,
                     )
                     runner.set_start_time(self._maybe_get_client_start_time_from_env(self._env))
+                    RunTracker.global_instance().pantsd_stats.set_invalidation_metrics(
+                        self._scheduler_service.invalidation_metrics()
+                    )
 
                     runner.run()
             except KeyboardInterrupt:
@@ -418,15 +418,19 @@ class BuildGraph(ABC):
         """
         walk = self._walk_factory(dep_predicate)
 
-        def _walk_rec(addr, level=0):
-            # If we've followed an edge to this address, stop recursing.
+        # The walk is iterative rather than recursive, so that deep graphs neither exhaust the stack
+        # nor pay for a Python call per edge. Each stack entry holds a target being expanded and an
+        # iterator over its remaining dependencies.
+        def enter(addr, level):
+            """Visits the address and returns its stack entry, or None if it is not expanded."""
+            # If we've followed an edge to this address, stop.
             if not walk.expand_once(addr, level):
-                return
+                return None
 
             target = self._target_by_address[addr]
 
             if predicate and not predicate(target):
-                return
+                return None
 
             if not postorder and walk.do_work_once(addr):
                 work(target)
@@ -434,20 +438,31 @@ class BuildGraph(ABC):
             if prelude:
                 prelude(target)
 
-            for dep_address in self._target_dependencies_by_address[addr]:
-                if walk.expanded_or_worked(dep_address):
-                    continue
-                if walk.dep_predicate(target, self._target_by_address[dep_address], level):
-                    _walk_rec(dep_address, level + 1)
+            return addr, target, level, iter(self._target_dependencies_by_address[addr])
 
-            if epilogue:
-                epilogue(target)
+        for address in addresses:
+            entry = enter(address, 0)
+            if entry is None:
+                continue
+            stack = [entry]
+            while stack:
+                addr, target, level, dep_addresses = stack[-1]
+                for dep_address in dep_addresses:
+                    if walk.expanded_or_worked(dep_address):
+                        continue
+                    if walk.dep_predicate(target, self._target_by_address[dep_address], level):
+                        entry = enter(dep_address, level + 1)
+                        if entry is not None:
+                            stack.append(entry)
+                            break
+                else:
+                    stack.pop()
 
-            if postorder and walk.do_work_once(addr):
-                work(target)
+                    if epilogue:
+                        epilogue(target)
 
-        for address in addresses:
-            _walk_rec(address)
+                    if postorder and walk.do_work_once(addr):
+                        work(target)
 
     def walk_transitive_dependee_graph(
         self, addresses, work, predicate=None, postorder=False, prelude=None, epilogue=None
@@ -462,25 +477,39 @@ class BuildGraph(ABC):
         """
         walked = set()
 
-        def _walk_rec(addr):
-            if addr not in walked:
-                walked.add(addr)
-                target = self._target_by_address[addr]
-                if not predicate or predicate(target):
-                    if not postorder:
-                        work(target)
-                    if prelude:
-                        prelude(target)
-                    for dep_address in self._target_dependees_by_address[addr]:
-                        _walk_rec(dep_address)
+        def enter(addr):
+            """Visits the address and returns its stack entry, or None if it is not expanded."""
+            if addr in walked:
+                return None
+            walked.add(addr)
+            target = self._target_by_address[addr]
+            if predicate and not predicate(target):
+                return None
+            if not postorder:
+                work(target)
+            if prelude:
+                prelude(target)
+            return target, iter(self._target_dependees_by_address[addr])
+
+        for address in addresses:
+            entry = enter(address)
+            if entry is None:
+                continue
+            stack = [entry]
+            while stack:
+                target, dependee_addresses = stack[-1]
+                for dependee_address in dependee_addresses:
+                    entry = enter(dependee_address)
+                    if entry is not None:
+                        stack.append(entry)
+                        break
+                else:
+                    stack.pop()
                     if epilogue:
                         epilogue(target)
                     if postorder:
                         work(target)
 
-        for address in addresses:
-            _walk_rec(address)
-
     def transitive_dependees_of_addresses(self, addresses, predicate=None, postorder=False):
         """Returns all transitive dependees of `addresses`.
 
@@ -662,26 +691,40 @@ def invert_dependencies(targets):
     visited = set()
     path = OrderedSet()
 
-    def invert(tgt):
+    def enter(tgt):
+        """Visits the target and returns its stack entry, or None if it has no unvisited edges."""
         if tgt in path:
             path_list = list(path)
             cycle_head = path_list.index(tgt)
             cycle = path_list[cycle_head:] + [tgt]
             raise CycleException(cycle)
+        if tgt in visited:
+            return None
+        visited.add(tgt)
+        if not tgt.dependencies:
+            roots.add(tgt)
+            return None
         path.add(tgt)
-        if tgt not in visited:
-            visited.add(tgt)
-            if tgt.dependencies:
-                for dependency in tgt.dependencies:
-                    inverted_deps[dependency].add(tgt)
-                    invert(dependency)
-            else:
-                roots.add(tgt)
-
-        path.remove(tgt)
+        return tgt, iter(tgt.dependencies)
 
+    # The walk uses an explicit stack rather than recursion, so that deep graphs do not exhaust the
+    # Python stack.
     for target in targets:
-        invert(target)
+        entry = enter(target)
+        if entry is None:
+            continue
+        stack = [entry]
+        while stack:
+            tgt, dependencies = stack[-1]
+            for dependency in dependencies:
+                inverted_deps[dependency].add(tgt)
+                entry = enter(dependency)
+                if entry is not None:
+                    stack.append(entry)
+                    break
+            else:
+                stack.pop()
+                path.remove(tgt)
 
     return roots, inverted_deps
 
@@ -697,15 +740,20 @@ def sort_targets(targets):
     ordered = []
     visited = set()
 
-    def topological_sort(target):
-        if target not in visited:
-            visited.add(target)
-            if target in inverted_deps:
-                for dep in inverted_deps[target]:
-                    topological_sort(dep)
-            ordered.append(target)
-
     for root in roots:
-        topological_sort(root)
+        if root in visited:
+            continue
+        visited.add(root)
+        stack = [(root, iter(inverted_deps.get(root, ())))]
+        while stack:
+            target, dependents = stack[-1]
+            for dependent in dependents:
+                if dependent not in visited:
+                    visited.add(dependent)
+                    stack.append((dependent, iter(inverted_deps.get(dependent, ()))))
+                    break
+            else:
+                stack.pop()
+                ordered.append(target)
 
     return ordered
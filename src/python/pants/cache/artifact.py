@@ -1,11 +1,17 @@
 # Copyright 2014 Pants project contributors (see CONTRIBUTORS.md).
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
+import io
 import os
 import shutil
+import stat
+from contextlib import closing
+from urllib.parse import quote, unquote
 
 from pants.util.contextutil import open_tar
-from pants.util.dirutil import safe_mkdir, safe_mkdir_for, safe_walk
+from pants.util.dirutil import safe_delete, safe_mkdir, safe_mkdir_for, safe_walk
+from pants.util.parallel_gzip import ParallelGzipWriter
+from pants.util.record_log import RecordLog
 
 
 class ArtifactError(Exception):
@@ -74,6 +80,37 @@ class DirectoryArtifact(Artifact):
                 self._relpaths.add(relpath)
 
 
+class _ChunkReader(io.RawIOBase):
+    """A readable stream over an iterator of byte chunks, optionally copying them to a file."""
+
+    def __init__(self, chunks, tee=None):
+        super().__init__()
+        self._chunks = iter(chunks)
+        self._tee = tee
+        self._buffer = b""
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        while not self._buffer:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            if self._tee is not None:
+                self._tee.write(chunk)
+            self._buffer = chunk
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
+
+    def drain(self):
+        """Consume any chunks not yet read, so that they are all copied to the tee."""
+        while self.readinto(bytearray(io.DEFAULT_BUFFER_SIZE)):
+            pass
+
+
 class TarballArtifact(Artifact):
     """An artifact stored in a tarball."""
 
@@ -82,13 +119,20 @@ class TarballArtifact(Artifact):
     # TODO: Expose `dereference` for tasks.
     # https://github.com/pantsbuild/pants/issues/3961
     def __init__(
-        self, artifact_root, artifact_extraction_root, tarfile_, compression=9, dereference=True
+        self,
+        artifact_root,
+        artifact_extraction_root,
+        tarfile_,
+        compression=9,
+        dereference=True,
+        compression_threads=1,
     ):
         super().__init__(artifact_root)
         self.artifact_extraction_root = artifact_extraction_root
         self._tarfile = tarfile_
         self._compression = compression
         self._dereference = dereference
+        self._compression_threads = compression_threads
 
     def exists(self):
         return os.path.isfile(self._tarfile)
@@ -96,20 +140,18 @@ class TarballArtifact(Artifact):
     def collect(self, paths):
         # In our tests, gzip is slightly less compressive than bzip2 on .class files,
         # but decompression times are much faster.
-        mode = "w:gz"
-
-        tar_kwargs = {
-            "dereference": self._dereference,
-            "errorlevel": 2,
-            "compresslevel": self._compression,
-        }
-
-        with open_tar(self._tarfile, mode, **tar_kwargs) as tarout:
-            for path in paths or ():
-                # Adds dirs recursively.
-                relpath = os.path.relpath(path, self._artifact_root)
-                tarout.add(path, relpath)
-                self._relpaths.add(relpath)
+        # NB: The tarball is compressed on several threads, but is still a single gzip stream, so
+        # it can be read by any gzip reader, including older versions of pants.
+        with open(self._tarfile, "wb") as outfile:
+            with closing(
+                ParallelGzipWriter(outfile, self._compression, threads=self._compression_threads)
+            ) as gzout:
+                with open_tar(gzout, "w|", dereference=self._dereference, errorlevel=2) as tarout:
+                    for path in paths or ():
+                        # Adds dirs recursively.
+                        relpath = os.path.relpath(path, self._artifact_root)
+                        tarout.add(path, relpath)
+                        self._relpaths.add(relpath)
 
     def extract(self):
         # Note(yic): unlike the python implementation before, now we do not update self._relpath
@@ -120,3 +162,163 @@ class TarballArtifact(Artifact):
             )
         except Exception as e:
             raise ArtifactError("Extracting artifact failed:\n{}".format(e))
+
+    def extract_from(self, chunks, tee=None):
+        """Extract the files in this artifact from its tarball's bytes as they arrive.
+
+        The tarball is never read from `self._tarfile`, so extraction can overlap with, for
+        example, downloading the tarball.
+
+        :param chunks: An iterator over the bytes of the tarball.
+        :param tee: An optional binary file to copy all of the tarball's bytes to.
+        """
+        reader = _ChunkReader(chunks, tee=tee)
+        try:
+            with open_tar(reader, "r|gz", errorlevel=2) as tarin:
+                tarin.extractall(
+                    self.artifact_extraction_root, members=self._checked_members(tarin)
+                )
+                self._relpaths.update(member.name for member in tarin.getmembers())
+            reader.drain()
+        except Exception as e:
+            raise ArtifactError("Extracting artifact failed:\n{}".format(e))
+
+    @staticmethod
+    def _checked_members(tarin):
+        """Yields the members of the tarball as they are read, refusing any that would be extracted
+        outside of the extraction root, or that link outside of it."""
+        for member in tarin:
+            if not _is_contained(member.name):
+                raise ArtifactError("Refusing to extract {}.".format(member.name))
+            if member.issym():
+                target = os.path.join(os.path.dirname(member.name), member.linkname)
+            elif member.islnk():
+                target = member.linkname
+            else:
+                target = None
+            if target is not None and not _is_contained(target):
+                raise ArtifactError(
+                    "Refusing to extract {} linking to {}.".format(member.name, member.linkname)
+                )
+            yield member
+
+
+def _is_contained(relpath):
+    """Returns whether the given path stays under the directory it is relative to."""
+    if os.path.isabs(relpath):
+        return False
+    normpath = os.path.normpath(relpath)
+    return normpath != os.pardir and not normpath.startswith(os.pardir + os.sep)
+
+
+class ContentAddressedArtifact(Artifact):
+    """An artifact stored as a manifest of its files' digests, with the contents of the files kept
+    in a `BlobStore` shared with other artifacts.
+
+    A file that is unchanged between artifacts is stored once, and extracting it is a copy (or a
+    hardlink) of the stored blob rather than a decompression.
+    """
+
+    _FILE = "f"
+    _DIR = "d"
+    _SYMLINK = "l"
+    # The final record of a manifest, carrying the number of records before it.
+    _END = "end"
+
+    def __init__(
+        self,
+        artifact_root,
+        artifact_extraction_root,
+        manifest,
+        blob_store,
+        dereference=True,
+        hardlink=False,
+    ):
+        """
+        :param str artifact_root: The path under which the artifact's files are collected from.
+        :param str artifact_extraction_root: The path under which the artifact's files are extracted.
+        :param str manifest: The path of the artifact's manifest.
+        :param blob_store: The `BlobStore` holding the contents of the artifact's files.
+        :param bool dereference: Whether to store the targets of symlinks rather than the symlinks.
+        :param bool hardlink: Whether to hardlink extracted files to their blobs where possible.
+        """
+        super().__init__(artifact_root)
+        self.artifact_extraction_root = artifact_extraction_root
+        # Manifests are written whole, once, so there are no concurrent appends to synchronize.
+        self._manifest = RecordLog(manifest, shared=False)
+        self._blob_store = blob_store
+        self._dereference = dereference
+        self._hardlink = hardlink
+        self._size = 0
+
+    @property
+    def size(self):
+        """The total size in bytes of the files collected into or extracted from this artifact."""
+        return self._size
+
+    def exists(self):
+        return os.path.isfile(self._manifest.path)
+
+    def collect(self, paths):
+        records = []
+        self._size = 0
+        for path in paths or ():
+            if os.path.isdir(path) and (self._dereference or not os.path.islink(path)):
+                for dirpath, dirnames, filenames in os.walk(path, followlinks=self._dereference):
+                    records.append(self._collect_one(dirpath))
+                    names = sorted(filenames)
+                    if not self._dereference:
+                        # Like tarfile, store symlinks to directories as symlinks, which os.walk
+                        # lists as directories without descending into them.
+                        names.extend(
+                            d for d in sorted(dirnames) if os.path.islink(os.path.join(dirpath, d))
+                        )
+                    for name in names:
+                        records.append(self._collect_one(os.path.join(dirpath, name)))
+            else:
+                records.append(self._collect_one(path))
+        records.append((self._END, str(len(records))))
+        self._manifest.rewrite(records)
+
+    def extract(self):
+        records = self._manifest.read()
+        if not records or records[-1] != (self._END, str(len(records) - 1)):
+            raise ArtifactError("Manifest {} is incomplete.".format(self._manifest.path))
+
+        self._size = 0
+        try:
+            for record in records[:-1]:
+                kind, quoted_relpath = record[:2]
+                relpath = unquote(quoted_relpath)
+                dst = os.path.join(self.artifact_extraction_root, relpath)
+                if kind == self._DIR:
+                    safe_mkdir(dst)
+                elif kind == self._SYMLINK:
+                    safe_mkdir_for(dst)
+                    safe_delete(dst)
+                    os.symlink(unquote(record[2]), dst)
+                else:
+                    _, _, digest, mode, size = record
+                    self._blob_store.materialize(digest, dst, int(mode, 8), hardlink=self._hardlink)
+                    self._size += int(size)
+                self._relpaths.add(relpath)
+        except Exception as e:
+            raise ArtifactError("Extracting artifact failed:\n{}".format(e))
+
+    def digests(self):
+        """Returns the digests of the blobs this artifact's manifest references."""
+        return {record[2] for record in self._manifest.read() if record[0] == self._FILE}
+
+    def _collect_one(self, path):
+        relpath = os.path.relpath(path, self._artifact_root)
+        self._relpaths.add(relpath)
+        # NB: The manifest's fields are tab separated, so quote paths, which may contain tabs.
+        quoted_relpath = quote(relpath)
+        if os.path.islink(path) and not self._dereference:
+            return (self._SYMLINK, quoted_relpath, quote(os.readlink(path)))
+        if os.path.isdir(path):
+            return (self._DIR, quoted_relpath)
+        digest, size = self._blob_store.add(path)
+        self._size += size
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+        return (self._FILE, quoted_relpath, digest, "{:o}".format(mode), str(size))
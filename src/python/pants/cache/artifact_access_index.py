@@ -0,0 +1,253 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import heapq
+import logging
+import os
+import threading
+import time
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pants.util.dirutil import fast_relpath, safe_delete
+from pants.util.memo import memoized_classmethod
+from pants.util.record_log import RecordLog
+
+logger = logging.getLogger(__name__)
+
+
+class ArtifactAccessIndex:
+    """Tracks when each artifact under a local artifact cache root was last used, and its size.
+
+    The index is an append-only `RecordLog` at the cache root shared by every task's cache (and by
+    concurrent pants runs), so recording an access costs a single small append. It is only read back
+    in full by processes that go on to evict artifacts, which they then do incrementally: each call
+    to `evict` indexes a bounded number of artifacts that predate the index and removes a bounded
+    number of the least recently used ones.
+    """
+
+    INDEX_FILE_NAME = ".access_index"
+
+    # The suffixes of the files under the root that are artifacts: tarballs and manifests.
+    ARTIFACT_SUFFIXES = (".tgz", ".manifest")
+
+    # The relative path under which a record is written once every artifact that predates the
+    # index has been indexed.
+    _SEEDED_MARKER = ""
+
+    _REMOVED = "-1"
+
+    _COMPACTION_MIN_RECORDS = 1024
+    _COMPACTION_RATIO = 2
+
+    @memoized_classmethod
+    def for_root(cls, root: str) -> "ArtifactAccessIndex":
+        """Returns the index shared by all caches in this process under the given root."""
+        return cls(root)
+
+    def __init__(self, root: str) -> None:
+        """
+        :param root: The directory containing the artifacts to index.
+        """
+        self._root = root
+        self._log = RecordLog(os.path.join(root, self.INDEX_FILE_NAME))
+        self._lock = threading.Lock()
+
+        # Populated on the first call to `evict`.
+        self._entries: Optional[Dict[str, Tuple[int, int]]] = None
+        self._heap: List[Tuple[int, str]] = []
+        self._total_size = 0
+        self._seeded = False
+        self._seed_iter: Optional[Iterator[str]] = None
+
+    @property
+    def total_size(self) -> int:
+        """The total size in bytes of the indexed artifacts, as of the last call to `evict`."""
+        return self._total_size
+
+    def record_access(self, path: str, size: Optional[int] = None) -> None:
+        """Records that the artifact at the given path was just written or read.
+
+        :param path: The path of the artifact, under the index root.
+        :param size: The size of the artifact in bytes, if already known.
+        """
+        if size is None:
+            size = os.path.getsize(path)
+        atime = int(time.time())
+        # Bump the mtime as well, so that a process evicting from a stale view of the index can
+        # tell that the artifact has been used since.
+        os.utime(path, (atime, atime))
+        relpath = fast_relpath(path, self._root)
+        with self._lock:
+            self._log.append([(relpath, str(atime), str(size))])
+            if self._entries is not None:
+                self._set(relpath, atime, size)
+
+    def record_removal(self, path: str) -> None:
+        """Records that the artifact at the given path was removed from the cache."""
+        relpath = fast_relpath(path, self._root)
+        with self._lock:
+            self._log.append([(relpath, self._REMOVED, self._REMOVED)])
+            if self._entries is not None:
+                self._remove(relpath)
+
+    def evict(
+        self,
+        max_size_bytes: Optional[int],
+        max_age_secs: Optional[int],
+        max_evictions: int,
+        max_seed_entries: int,
+        keep: Iterable[str] = (),
+    ) -> List[str]:
+        """Removes least recently used artifacts that exceed the given size or age budget.
+
+        :param max_size_bytes: The total size in bytes of the artifacts to keep, or `None` for no
+                               limit.
+        :param max_age_secs: The age in seconds since last use after which an artifact is removed,
+                             or `None` for no limit.
+        :param max_evictions: The maximum number of artifacts to remove in this call.
+        :param max_seed_entries: The maximum number of artifacts that predate the index to index in
+                                 this call.
+        :param keep: Paths of artifacts that must not be removed, such as one just stored.
+        :returns: The paths of the removed artifacts.
+        """
+        keep_relpaths = {fast_relpath(path, self._root) for path in keep}
+        with self._lock:
+            self._load()
+            self._seed(max_seed_entries)
+
+            now = int(time.time())
+            evicted: List[str] = []
+            kept: List[Tuple[int, str]] = []
+            # Entries refreshed from the filesystem are pushed back onto the heap, so bound the
+            # number of heap pops as well as the number of removals.
+            for _ in range(max_evictions * 4):
+                if len(evicted) >= max_evictions or not self._heap:
+                    break
+                atime, relpath = self._heap[0]
+                over_size = max_size_bytes is not None and self._total_size > max_size_bytes
+                too_old = max_age_secs is not None and atime < now - max_age_secs
+                if not over_size and not too_old:
+                    break
+
+                heapq.heappop(self._heap)
+                entry = self._entries.get(relpath)  # type: ignore[union-attr]
+                if entry is None or entry[0] != atime:
+                    # A stale heap entry superseded by a later access or removal.
+                    continue
+                if relpath in keep_relpaths:
+                    kept.append((atime, relpath))
+                    continue
+
+                path = os.path.join(self._root, relpath)
+                try:
+                    mtime = int(os.path.getmtime(path))
+                except OSError:
+                    # Already removed out from under us.
+                    self._forget(relpath)
+                    continue
+                if mtime > atime:
+                    # Used by another process since our view of the index was loaded.
+                    self._set(relpath, mtime, entry[1])
+                    continue
+
+                safe_delete(path)
+                self._forget(relpath)
+                evicted.append(path)
+
+            for item in kept:
+                heapq.heappush(self._heap, item)
+            return evicted
+
+    def indexed_paths(self) -> Optional[List[str]]:
+        """Returns the paths of all the artifacts under the root, as of the latest record of each.
+
+        The index is re-read first, to pick up artifacts recorded by other processes since it was
+        loaded.
+
+        :returns: The paths, or None if some artifacts that predate the index are not indexed yet.
+        """
+        with self._lock:
+            self._entries = None
+            self._seeded = False
+            self._seed_iter = None
+            self._load()
+            if not self._seeded:
+                return None
+            assert self._entries is not None
+            return [os.path.join(self._root, relpath) for relpath in self._entries]
+
+    def _set(self, relpath: str, atime: int, size: int) -> None:
+        assert self._entries is not None
+        previous = self._entries.get(relpath)
+        if previous is not None:
+            self._total_size -= previous[1]
+        self._entries[relpath] = (atime, size)
+        self._total_size += size
+        heapq.heappush(self._heap, (atime, relpath))
+
+    def _remove(self, relpath: str) -> None:
+        assert self._entries is not None
+        previous = self._entries.pop(relpath, None)
+        if previous is not None:
+            self._total_size -= previous[1]
+
+    def _forget(self, relpath: str) -> None:
+        self._remove(relpath)
+        self._log.append([(relpath, self._REMOVED, self._REMOVED)])
+
+    def _load(self) -> None:
+        if self._entries is not None:
+            return
+
+        records = self._log.load_compacted(
+            key_fn=lambda record: record[0] if len(record) == 3 else None,
+            live_fn=lambda record: record[1] != self._REMOVED,
+            min_compaction_records=self._COMPACTION_MIN_RECORDS,
+            compaction_ratio=self._COMPACTION_RATIO,
+        )
+        entries: Dict[str, Tuple[int, int]] = {}
+        for relpath, atime, size in records.values():
+            if relpath == self._SEEDED_MARKER:
+                self._seeded = True
+            else:
+                entries[relpath] = (int(atime), int(size))
+        self._entries = entries
+        self._total_size = sum(size for _, size in entries.values())
+        self._heap = [(atime, relpath) for relpath, (atime, _) in entries.items()]
+        heapq.heapify(self._heap)
+
+    def _seed(self, max_entries: int) -> None:
+        """Indexes up to `max_entries` artifacts that were written before the index existed."""
+        if self._seeded:
+            return
+        if self._seed_iter is None:
+            self._seed_iter = self._iter_artifacts()
+
+        assert self._entries is not None
+        records = []
+        batch = list(islice(self._seed_iter, max_entries))
+        for path in batch:
+            relpath = fast_relpath(path, self._root)
+            if relpath in self._entries:
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            self._set(relpath, int(stat.st_mtime), stat.st_size)
+            records.append((relpath, str(int(stat.st_mtime)), str(stat.st_size)))
+
+        if len(batch) < max_entries:
+            self._seeded = True
+            records.append((self._SEEDED_MARKER, "0", "0"))
+            logger.debug("Indexed all pre-existing artifacts under {}.".format(self._root))
+        self._log.append(records)
+
+    def _iter_artifacts(self) -> Iterator[str]:
+        for dirpath, dirnames, filenames in os.walk(self._root):
+            # Hidden directories, such as a blob store, hold no artifacts.
+            dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+            for filename in filenames:
+                if filename.endswith(self.ARTIFACT_SUFFIXES):
+                    yield os.path.join(dirpath, filename)
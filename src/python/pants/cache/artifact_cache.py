@@ -4,6 +4,8 @@
 import logging
 import os
 import sys
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
 
 # Note throughout the distinction between the artifact_root (which is where the artifacts are
 # originally built and where the cache restores them to) and the cache root path/URL (which is
@@ -50,6 +52,12 @@ class ArtifactCache:
     Subclasses implement the methods below to provide this functionality.
     """
 
+    # The maximum number of reads that `use_cached_files_many` issues at once, on threads. Caches
+    # whose reads are bound by waiting on the network raise this. Reads from local files are bound
+    # by extracting artifacts, which mostly holds the GIL, so such caches leave it at 1 and are
+    # read through `Context.subproc_map`, as they always have been.
+    max_concurrent_lookups = 1
+
     def __init__(self, artifact_root, artifact_extraction_root=None):
         """Create an ArtifactCache.
 
@@ -126,6 +134,23 @@ class ArtifactCache:
         """
         pass
 
+    def use_cached_files_many(self, requests):
+        """Use the files cached for each of the given keys.
+
+        Up to `max_concurrent_lookups` reads are in flight at once.
+
+        :param requests: An iterable of (cache_key, results_dir) pairs, as passed to
+                         `use_cached_files`.
+        :returns: An iterator of (cache_key, result) pairs, yielded as each read completes, where each
+                  result is as described for `use_cached_files`.
+        """
+
+        def use(request):
+            cache_key, results_dir = request
+            return cache_key, call_use_cached_files((self, cache_key, results_dir))
+
+        return _map_as_completed(use, requests, self.max_concurrent_lookups)
+
     def delete(self, cache_key):
         """Delete the artifacts for the specified key.
 
@@ -135,6 +160,25 @@ class ArtifactCache:
         pass
 
 
+def _map_as_completed(func, items, max_in_flight):
+    """Yields `func(item)` for each item, in completion order, with at most `max_in_flight`
+    calls running at once."""
+    if max_in_flight <= 1:
+        for item in items:
+            yield func(item)
+        return
+
+    items = iter(items)
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        in_flight = {executor.submit(func, item) for item in islice(items, max_in_flight)}
+        while in_flight:
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for item in islice(items, len(done)):
+                in_flight.add(executor.submit(func, item))
+            for future in done:
+                yield future.result()
+
+
 def call_use_cached_files(tup):
     """Importable helper for multi-proc calling of ArtifactCache.use_cached_files on a cache
     instance.
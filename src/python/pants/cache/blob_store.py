@@ -0,0 +1,121 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import errno
+import logging
+import os
+import shutil
+import stat
+import time
+from typing import Container, Tuple
+
+from pants.base.hash_utils import hash_file
+from pants.util.dirutil import safe_concurrent_creation, safe_delete, safe_mkdir_for
+from pants.util.memo import memoized_classmethod
+
+logger = logging.getLogger(__name__)
+
+
+class BlobStore:
+    """A store of file contents keyed by the sha1 digest of the contents.
+
+    The store lives in a hidden directory under a local artifact cache root, and is shared by the
+    caches of every task (and by concurrent pants runs) under that root, so a file produced
+    unchanged by many targets, or by many versions of one target, is stored only once.
+
+    Blobs are read-only, so that a blob hardlinked into a workdir cannot be modified in place.
+    """
+
+    DIR_NAME = ".blobs"
+
+    _BLOB_MODE = 0o444
+
+    @memoized_classmethod
+    def for_root(cls, root: str) -> "BlobStore":
+        """Returns the store shared by all caches in this process under the given root."""
+        return cls(root)
+
+    def __init__(self, root: str) -> None:
+        """
+        :param root: The local artifact cache root to keep blobs under.
+        """
+        self._root = os.path.join(root, self.DIR_NAME)
+
+    @property
+    def root(self) -> str:
+        return self._root
+
+    def path_for(self, digest: str) -> str:
+        return os.path.join(self._root, digest[:2], digest[2:])
+
+    def add(self, path: str) -> Tuple[str, int]:
+        """Stores the contents of the file at the given path, if not already stored.
+
+        :returns: The digest and size of the contents.
+        """
+        digest = hash_file(path)
+        blob = self.path_for(digest)
+        try:
+            # Mark the existing blob as in use, so that a concurrent garbage collection keeps it.
+            os.utime(blob)
+            return digest, os.path.getsize(blob)
+        except OSError as e:
+            if e.errno != errno.ENOENT:
+                raise
+
+        with safe_concurrent_creation(blob) as tmp_blob:
+            shutil.copyfile(path, tmp_blob)
+            os.chmod(tmp_blob, self._BLOB_MODE)
+        return digest, os.path.getsize(blob)
+
+    def materialize(self, digest: str, dest: str, mode: int, hardlink: bool = False) -> None:
+        """Writes the blob with the given digest to the given path, replacing any file there.
+
+        :param digest: The digest of the blob to write.
+        :param dest: The path to write the blob to.
+        :param mode: The permission bits to give the file at `dest`.
+        :param hardlink: Whether to hardlink the blob rather than copying it where possible. A
+                         hardlinked file is read-only, and is only used for a `mode` without
+                         execute bits, since the blob is shared by all files with its contents.
+        """
+        blob = self.path_for(digest)
+        safe_mkdir_for(dest)
+        safe_delete(dest)
+        if hardlink and not mode & (stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH):
+            try:
+                os.link(blob, dest)
+                return
+            except OSError as e:
+                # Fall back to copying across devices, or on filesystems without hardlinks.
+                if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK):
+                    raise
+        shutil.copyfile(blob, dest)
+        os.chmod(dest, mode)
+
+    def collect_garbage(self, live_digests: Container[str], grace_secs: int) -> int:
+        """Removes blobs that are not in `live_digests` and were not used in the last `grace_secs`.
+
+        The grace period protects blobs added by a concurrent store whose manifest is not yet written.
+
+        :returns: The number of blobs removed.
+        """
+        cutoff = time.time() - grace_secs
+        removed = 0
+        for dirpath, _, filenames in os.walk(self._root):
+            if dirpath == self._root:
+                continue
+            prefix = os.path.basename(dirpath)
+            for filename in filenames:
+                digest = prefix + filename
+                if digest in live_digests:
+                    continue
+                blob = os.path.join(dirpath, filename)
+                try:
+                    if os.path.getmtime(blob) >= cutoff:
+                        continue
+                except OSError:
+                    continue
+                safe_delete(blob)
+                removed += 1
+        logger.debug("Removed {} unused blobs from {}.".format(removed, self._root))
+        return removed
@@ -1,6 +1,7 @@
 # Copyright 2014 Pants project contributors (see CONTRIBUTORS.md).
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
+import multiprocessing
 import os
 import threading
 from collections import namedtuple
@@ -9,7 +10,11 @@ from urllib.parse import urlparse
 from pants.base.build_environment import get_buildroot
 from pants.cache.artifact import TarballArtifact
 from pants.cache.artifact_cache import ArtifactCacheError
-from pants.cache.local_artifact_cache import LocalArtifactCache, TempLocalArtifactCache
+from pants.cache.local_artifact_cache import (
+    ContentAddressedLocalArtifactCache,
+    LocalArtifactCache,
+    TempLocalArtifactCache,
+)
 from pants.cache.pinger import BestUrlSelector, Pinger
 from pants.cache.resolver import NoopResolver, Resolver, RESTfulResolver
 from pants.cache.restful_artifact_cache import RESTfulArtifactCache
@@ -120,6 +125,14 @@ class CacheSetup(Subsystem):
             default=5,
             help="The gzip compression level (0-9) for created artifacts.",
         )
+        register(
+            "--compression-threads",
+            advanced=True,
+            type=int,
+            default=min(4, multiprocessing.cpu_count()),
+            help="The number of threads to compress each created artifact with. The result is an "
+            "ordinary gzipped tarball regardless of the number of threads.",
+        )
         register(
             "--dereference-symlinks",
             type=bool,
@@ -134,6 +147,43 @@ class CacheSetup(Subsystem):
             default=8,
             help="Maximum number of old cache files to keep per task target pair",
         )
+        register(
+            "--max-local-cache-size-bytes",
+            advanced=True,
+            type=int,
+            default=None,
+            help="If set, the total size of the files to keep in a local artifact cache, shared "
+            "by all tasks writing to it. The least recently used files beyond this size are "
+            "evicted incrementally as new files are written.",
+        )
+        register(
+            "--max-local-cache-entry-age",
+            advanced=True,
+            type=int,
+            default=None,
+            help="If set, the number of seconds since its last use after which a file is evicted "
+            "from a local artifact cache. Eviction happens incrementally as new files are written.",
+        )
+        register(
+            "--local-artifact-layout",
+            advanced=True,
+            choices=["tarball", "content-addressed"],
+            default="tarball",
+            help="How a local artifact cache stores artifacts. 'tarball' stores each artifact as a "
+            "gzipped tarball. 'content-addressed' stores each artifact as a manifest of the "
+            "digests of its files, and the contents of each distinct file once, shared by all "
+            "tasks writing to the cache, which saves space and extraction time when many "
+            "artifacts share files.",
+        )
+        register(
+            "--hardlink-cached-files",
+            advanced=True,
+            type=bool,
+            default=False,
+            help="With the content-addressed local artifact layout, hardlink cached files into "
+            "the workdir instead of copying them. Hardlinked files are read-only, so only enable "
+            "this for tasks that never modify their outputs in place.",
+        )
         register(
             "--pinger-timeout",
             advanced=True,
@@ -365,7 +415,13 @@ class CacheFactory:
             self._log.debug(
                 "{0} {1} local artifact cache at {2}".format(self._task.stable_name(), action, path)
             )
-            return LocalArtifactCache(
+            kwargs = {}
+            if self._options.local_artifact_layout == "content-addressed":
+                local_cache_type = ContentAddressedLocalArtifactCache
+                kwargs["hardlink"] = self._options.hardlink_cached_files
+            else:
+                local_cache_type = LocalArtifactCache
+            return local_cache_type(
                 artifact_root,
                 artifact_extraction_root,
                 path,
@@ -373,6 +429,11 @@ class CacheFactory:
                 self._options.max_entries_per_target,
                 permissions=self._options.write_permissions,
                 dereference=self._options.dereference_symlinks,
+                max_cache_size_bytes=self._options.max_local_cache_size_bytes,
+                max_cache_entry_age_secs=self._options.max_local_cache_entry_age,
+                eviction_root=parent_path,
+                compression_threads=self._options.compression_threads,
+                **kwargs,
             )
 
         def create_remote_cache(remote_spec, local_cache):
@@ -383,7 +444,10 @@ class CacheFactory:
                     ["{}/{}".format(url.rstrip("/"), self._cache_dirname) for url in urls]
                 )
                 local_cache = local_cache or TempLocalArtifactCache(
-                    artifact_root, artifact_extraction_root, compression
+                    artifact_root,
+                    artifact_extraction_root,
+                    compression,
+                    compression_threads=self._options.compression_threads,
                 )
                 return RESTfulArtifactCache(
                     artifact_root,
@@ -3,10 +3,13 @@
 
 import logging
 import os
+import time
 from contextlib import contextmanager
 
-from pants.cache.artifact import TarballArtifact
+from pants.cache.artifact import ContentAddressedArtifact, TarballArtifact
+from pants.cache.artifact_access_index import ArtifactAccessIndex
 from pants.cache.artifact_cache import ArtifactCache, UnreadableArtifact
+from pants.cache.blob_store import BlobStore
 from pants.util.contextutil import temporary_file
 from pants.util.dirutil import (
     safe_delete,
@@ -27,6 +30,7 @@ class BaseLocalArtifactCache(ArtifactCache):
         compression,
         permissions=None,
         dereference=True,
+        compression_threads=1,
     ):
         """
         :param str artifact_root: The path under which cacheable products will be read/written.
@@ -35,12 +39,14 @@ class BaseLocalArtifactCache(ArtifactCache):
                                 Valid values are 0-9.
         :param str permissions: File permissions to use when creating artifact files.
         :param bool dereference: Dereference symlinks when creating the cache tarball.
+        :param int compression_threads: The number of threads to compress created artifacts with.
         """
         super().__init__(artifact_root, artifact_extraction_root)
         self._compression = compression
         self._cache_root = None
         self._permissions = permissions
         self._dereference = dereference
+        self._compression_threads = compression_threads
 
     def _artifact(self, path):
         return TarballArtifact(
@@ -49,6 +55,7 @@ class BaseLocalArtifactCache(ArtifactCache):
             path,
             self._compression,
             dereference=self._dereference,
+            compression_threads=self._compression_threads,
         )
 
     @contextmanager
@@ -70,37 +77,39 @@ class BaseLocalArtifactCache(ArtifactCache):
         """Store and then extract the artifact from the given `src` iterator for the given
         cache_key.
 
+        The artifact is extracted as it is read from `src`, and is only stored once it has been
+        extracted successfully.
+
         :param cache_key: Cache key for the artifact.
         :param src: Iterator over binary data to store for the artifact.
         :param str results_dir: The path to the expected destination of the artifact extraction: will
           be cleared both before extraction, and after a failure to extract.
         """
         with self._tmpfile(cache_key, "read") as tmp:
-            for chunk in src:
-                tmp.write(chunk)
+            self._extract_from(tmp.name, src, results_dir, tee=tmp)
             tmp.close()
-            tarball = self._store_tarball(cache_key, tmp.name)
-            artifact = self._artifact(tarball)
+            self._store_tarball(cache_key, tmp.name)
+            return True
+
+    def _extract_from(self, tarball, src, results_dir, tee=None):
+        # NOTE(mateo): The two clean=True args passed in this method are likely safe, since the cache will by
+        # definition be dealing with unique results_dir, as opposed to the stable vt.results_dir (aka 'current').
+        # But if by chance it's passed the stable results_dir, safe_makedir(clean=True) will silently convert it
+        # from a symlink to a real dir and cause mysterious 'Operation not permitted' errors until the workdir is cleaned.
+        if results_dir is not None:
+            safe_mkdir(results_dir, clean=True)
 
-            # NOTE(mateo): The two clean=True args passed in this method are likely safe, since the cache will by
-            # definition be dealing with unique results_dir, as opposed to the stable vt.results_dir (aka 'current').
-            # But if by chance it's passed the stable results_dir, safe_makedir(clean=True) will silently convert it
-            # from a symlink to a real dir and cause mysterious 'Operation not permitted' errors until the workdir is cleaned.
+        artifact = self._artifact(tarball)
+        try:
+            artifact.extract_from(src, tee=tee)
+        except Exception:
+            # Do our best to clean up after a failed artifact extraction. If a results_dir has been
+            # specified, it is "expected" to represent the output destination of the extracted
+            # artifact, and so removing it should clear any partially extracted state.
             if results_dir is not None:
                 safe_mkdir(results_dir, clean=True)
-
-            try:
-                artifact.extract()
-            except Exception:
-                # Do our best to clean up after a failed artifact extraction. If a results_dir has been
-                # specified, it is "expected" to represent the output destination of the extracted
-                # artifact, and so removing it should clear any partially extracted state.
-                if results_dir is not None:
-                    safe_mkdir(results_dir, clean=True)
-                safe_delete(tarball)
-                raise
-
-            return True
+            raise
+        return artifact
 
     def _store_tarball(self, cache_key, src):
         """Given a src path to an artifact tarball, store it and return stored artifact's path."""
@@ -110,6 +119,11 @@ class BaseLocalArtifactCache(ArtifactCache):
 class LocalArtifactCache(BaseLocalArtifactCache):
     """An artifact cache that stores the artifacts in local files."""
 
+    # Bounds on the eviction work done by each store, so that no single store pays for a scan of the
+    # whole cache.
+    _MAX_EVICTIONS_PER_STORE = 16
+    _MAX_INDEXED_PER_STORE = 1000
+
     def __init__(
         self,
         artifact_root,
@@ -119,6 +133,10 @@ class LocalArtifactCache(BaseLocalArtifactCache):
         max_entries_per_target=None,
         permissions=None,
         dereference=True,
+        max_cache_size_bytes=None,
+        max_cache_entry_age_secs=None,
+        eviction_root=None,
+        compression_threads=1,
     ):
         """
         :param str artifact_root: The path under which cacheable products will be read/written.
@@ -128,6 +146,13 @@ class LocalArtifactCache(BaseLocalArtifactCache):
         :param int max_entries_per_target: The maximum number of old cache files to leave behind on a cache miss.
         :param str permissions: File permissions to use when creating artifact files.
         :param bool dereference: Dereference symlinks when creating the cache tarball.
+        :param int max_cache_size_bytes: The total size of the cache files under `eviction_root` to
+          keep, evicting the least recently used beyond it.
+        :param int max_cache_entry_age_secs: The time since last use after which cache files under
+          `eviction_root` are evicted.
+        :param str eviction_root: The directory, shared by the local caches of all tasks, whose cache
+          files are evicted together. Defaults to `cache_root`.
+        :param int compression_threads: The number of threads to compress created artifacts with.
         """
         super().__init__(
             artifact_root,
@@ -135,23 +160,70 @@ class LocalArtifactCache(BaseLocalArtifactCache):
             compression,
             permissions=int(permissions.strip(), base=8) if permissions else None,
             dereference=dereference,
+            compression_threads=compression_threads,
         )
         self._cache_root = os.path.realpath(os.path.expanduser(cache_root))
         self._max_entries_per_target = max_entries_per_target
+        self._max_cache_size_bytes = max_cache_size_bytes
+        self._max_cache_entry_age_secs = max_cache_entry_age_secs
+        self._eviction_root = (
+            os.path.realpath(os.path.expanduser(eviction_root))
+            if eviction_root
+            else self._cache_root
+        )
         safe_mkdir(self._cache_root)
 
+    @property
+    def _access_index(self):
+        """The index of cache file accesses to evict by, or None if eviction is disabled.
+
+        NB: This is looked up rather than stored, as caches are pickled to be used in subprocesses.
+        """
+        if self._max_cache_size_bytes is None and self._max_cache_entry_age_secs is None:
+            return None
+        return ArtifactAccessIndex.for_root(self._eviction_root)
+
     def prune(self, root):
         """Prune stale cache files.
 
         If the option --cache-target-max-entry is greater than zero, then prune will remove all but n
-        old cache files for each target/task.
+        old cache files for each target/task. Removed cache files are dropped from the access index.
 
         :param str root: The path under which cacheable artifacts will be cleaned
         """
 
         max_entries_per_target = self._max_entries_per_target
         if os.path.isdir(root) and max_entries_per_target:
-            safe_rm_oldest_items_in_dir(root, max_entries_per_target)
+            removed = safe_rm_oldest_items_in_dir(root, max_entries_per_target)
+            access_index = self._access_index
+            if access_index is not None:
+                for path in removed:
+                    access_index.record_removal(path)
+
+    def evict(self, keep=()):
+        """Incrementally evict cache files beyond the configured total size or age.
+
+        Each call removes at most a bounded number of the least recently used cache files under the
+        eviction root, so the work of getting back under budget is spread across stores.
+
+        :param keep: Paths of cache files which must not be evicted.
+        """
+        access_index = self._access_index
+        if access_index is None:
+            return
+        evicted = access_index.evict(
+            self._max_cache_size_bytes,
+            self._max_cache_entry_age_secs,
+            max_evictions=self._MAX_EVICTIONS_PER_STORE,
+            max_seed_entries=self._MAX_INDEXED_PER_STORE,
+            keep=keep,
+        )
+        if evicted:
+            logger.debug(
+                "Evicted {} files from local artifact cache {}.".format(
+                    len(evicted), self._eviction_root
+                )
+            )
 
     def has(self, cache_key):
         return self._artifact_for(cache_key).exists()
@@ -167,13 +239,14 @@ class LocalArtifactCache(BaseLocalArtifactCache):
                 if results_dir is not None:
                     safe_rmtree(results_dir)
                 artifact.extract()
+                self._record_access(tarfile)
                 return True
         except Exception as e:
             # TODO(davidt): Consider being more granular in what is caught.
             logger.warning(
                 "Error while reading {0} from local artifact cache: {1}".format(tarfile, e)
             )
-            safe_delete(tarfile)
+            self._delete_cache_file(tarfile)
             return UnreadableArtifact(cache_key, e)
 
         return False
@@ -183,7 +256,18 @@ class LocalArtifactCache(BaseLocalArtifactCache):
             pass
 
     def delete(self, cache_key):
-        safe_delete(self._cache_file_for_key(cache_key))
+        self._delete_cache_file(self._cache_file_for_key(cache_key))
+
+    def _delete_cache_file(self, path):
+        safe_delete(path)
+        access_index = self._access_index
+        if access_index is not None:
+            access_index.record_removal(path)
+
+    def _record_access(self, path, size=None):
+        access_index = self._access_index
+        if access_index is not None:
+            access_index.record_access(path, size=size)
 
     def _store_tarball(self, cache_key, src):
         dest = self._cache_file_for_key(cache_key)
@@ -192,6 +276,8 @@ class LocalArtifactCache(BaseLocalArtifactCache):
         if self._permissions:
             os.chmod(dest, self._permissions)
         self.prune(os.path.dirname(dest))  # Remove old cache files.
+        self._record_access(dest)
+        self.evict(keep=[dest])
         return dest
 
     def _cache_file_for_key(self, cache_key):
@@ -200,6 +286,158 @@ class LocalArtifactCache(BaseLocalArtifactCache):
         return os.path.join(self._cache_root, cache_key.id, cache_key.hash) + ".tgz"
 
 
+class ContentAddressedLocalArtifactCache(LocalArtifactCache):
+    """A local artifact cache that stores each artifact as a manifest of its files' digests.
+
+    The contents of the files are kept in a `BlobStore` shared by the caches of all tasks under the
+    eviction root, so files that are unchanged across targets, or across versions of a target, are
+    stored once. Blobs no longer referenced by any manifest are garbage collected periodically.
+
+    Remote caches still exchange tarballs: artifacts fetched from a remote cache are stored here as
+    manifests once extracted, and tarballs are built only when an artifact is uploaded.
+
+    NB: The size of each artifact counted against `max_cache_size_bytes` is the total size of the
+    files it references, so blobs shared between artifacts are counted once per artifact.
+    """
+
+    _MANIFEST_SUFFIX = ".manifest"
+
+    # How often, and how long after its last use, unreferenced blobs are removed.
+    _GC_INTERVAL_SECS = 24 * 60 * 60
+    _GC_GRACE_SECS = 60 * 60
+    _GC_STAMP_FILE_NAME = ".last_gc"
+
+    def __init__(self, *args, hardlink=False, **kwargs):
+        """
+        :param bool hardlink: Whether to hardlink cached files into the workdir rather than copying
+          them where possible. Hardlinked files are read-only, so this must only be used by tasks
+          that never modify their outputs in place.
+
+        See `LocalArtifactCache` for the other parameters.
+        """
+        super().__init__(*args, **kwargs)
+        self._hardlink = hardlink
+
+    @property
+    def _blob_store(self):
+        # NB: This is looked up rather than stored, as caches are pickled to be used in subprocesses.
+        return BlobStore.for_root(self._eviction_root)
+
+    def _artifact_for(self, cache_key):
+        return self._manifest_artifact(self._cache_file_for_key(cache_key))
+
+    def _manifest_artifact(self, path, artifact_root=None):
+        return ContentAddressedArtifact(
+            artifact_root or self.artifact_root,
+            self.artifact_extraction_root,
+            path,
+            self._blob_store,
+            dereference=self._dereference,
+            hardlink=self._hardlink,
+        )
+
+    def use_cached_files(self, cache_key, results_dir=None):
+        manifest = self._cache_file_for_key(cache_key)
+        try:
+            artifact = self._manifest_artifact(manifest)
+            if artifact.exists():
+                if results_dir is not None:
+                    safe_rmtree(results_dir)
+                artifact.extract()
+                self._record_access(manifest, size=artifact.size)
+                return True
+        except Exception as e:
+            logger.warning(
+                "Error while reading {0} from local artifact cache: {1}".format(manifest, e)
+            )
+            self._delete_cache_file(manifest)
+            return UnreadableArtifact(cache_key, e)
+
+        return False
+
+    def try_insert(self, cache_key, paths):
+        self._store_manifest(cache_key, paths)
+
+    @contextmanager
+    def insert_paths(self, cache_key, paths):
+        self._store_manifest(cache_key, paths)
+        # Only remote caches insert through here, and they store tarballs.
+        with self._tmpfile(cache_key, "write") as tmp:
+            self._artifact(tmp.name).collect(paths)
+            yield tmp.name
+
+    def store_and_use_artifact(self, cache_key, src, results_dir=None):
+        artifact = self._extract_from(None, src, results_dir)
+        # Store the files where they were extracted, naming only the outermost of the tarball's
+        # members so that none is collected twice.
+        paths = {
+            os.path.join(self.artifact_extraction_root, os.path.relpath(path, self.artifact_root))
+            for path in artifact.get_paths()
+        }
+        self._store_manifest(
+            cache_key,
+            [path for path in paths if os.path.dirname(path) not in paths],
+            artifact_root=self.artifact_extraction_root,
+        )
+        return True
+
+    def _store_manifest(self, cache_key, paths, artifact_root=None):
+        dest = self._cache_file_for_key(cache_key)
+        artifact = self._manifest_artifact(dest, artifact_root=artifact_root)
+        artifact.collect(paths)
+        if self._permissions:
+            os.chmod(dest, self._permissions)
+        self.prune(os.path.dirname(dest))  # Remove old manifests.
+        self._record_access(dest, size=artifact.size)
+        self.evict(keep=[dest])
+        self._maybe_collect_garbage()
+        return dest
+
+    def _maybe_collect_garbage(self):
+        """Removes unreferenced blobs, if no process has done so in the last `_GC_INTERVAL_SECS`."""
+        blob_store = self._blob_store
+        stamp = os.path.join(blob_store.root, self._GC_STAMP_FILE_NAME)
+        now = time.time()
+        try:
+            if os.path.getmtime(stamp) > now - self._GC_INTERVAL_SECS:
+                return
+        except OSError:
+            pass
+        # Claim this collection before scanning, so that concurrent stores do not all scan too.
+        safe_mkdir_for(stamp)
+        with open(stamp, "w"):
+            pass
+
+        live_digests = set()
+        for manifest in self._iter_manifests():
+            live_digests.update(self._manifest_artifact(manifest).digests())
+        blob_store.collect_garbage(live_digests, self._GC_GRACE_SECS)
+
+    def _iter_manifests(self):
+        """Yields the paths of all the manifests under the eviction root.
+
+        The access index lists them without a scan of the cache, once it has indexed every
+        manifest that predates it.
+        """
+        access_index = self._access_index
+        indexed = access_index.indexed_paths() if access_index is not None else None
+        if indexed is not None:
+            for path in indexed:
+                if path.endswith(self._MANIFEST_SUFFIX):
+                    yield path
+            return
+
+        for dirpath, dirnames, filenames in os.walk(self._eviction_root):
+            # Skip the blob store and the access index.
+            dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+            for filename in filenames:
+                if filename.endswith(self._MANIFEST_SUFFIX):
+                    yield os.path.join(dirpath, filename)
+
+    def _cache_file_for_key(self, cache_key):
+        return os.path.join(self._cache_root, cache_key.id, cache_key.hash) + self._MANIFEST_SUFFIX
+
+
 class TempLocalArtifactCache(BaseLocalArtifactCache):
     """A local cache that does not actually store any files between calls.
 
@@ -207,7 +445,14 @@ class TempLocalArtifactCache(BaseLocalArtifactCache):
     calls, but is useful for handling file IO for a remote cache.
     """
 
-    def __init__(self, artifact_root, artifact_extraction_root, compression, permissions=None):
+    def __init__(
+        self,
+        artifact_root,
+        artifact_extraction_root,
+        compression,
+        permissions=None,
+        compression_threads=1,
+    ):
         """
         :param str artifact_root: The path under which cacheable products will be read/written.
         """
@@ -216,8 +461,14 @@ class TempLocalArtifactCache(BaseLocalArtifactCache):
             artifact_extraction_root,
             compression=compression,
             permissions=permissions,
+            compression_threads=compression_threads,
         )
 
+    def store_and_use_artifact(self, cache_key, src, results_dir=None):
+        # Nothing is stored, so extract straight from `src` without spooling it to a file first.
+        self._extract_from(None, src, results_dir)
+        return True
+
     def _store_tarball(self, cache_key, src):
         return src
 
@@ -6,8 +6,6 @@ from contextlib import contextmanager
 from multiprocessing.pool import ThreadPool
 from urllib.parse import urlparse
 
-import requests
-
 from pants.cache.artifact_cache import ArtifactCacheError
 from pants.util.contextutil import Timer
 from pants.util.memo import memoized_method
@@ -25,6 +23,8 @@ class Pinger:
 
     @classmethod
     def _try_ping(cls, url, timeout):
+        import requests
+
         try:
             with Timer() as timer:
                 # We just want to see if we can get the headers.
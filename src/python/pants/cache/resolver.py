@@ -5,8 +5,6 @@ import json
 import logging
 from abc import ABC, abstractmethod
 
-import requests
-
 from pants.base.validation import assert_list
 
 logger = logging.getLogger(__name__)
@@ -105,6 +103,8 @@ class RESTfulResolver(Resolver):
         self._response_parser = response_parser or ResponseParser()
 
     def _safe_get_content(self, session, resolve_from):
+        import requests
+
         try:
             resp = session.get(resolve_from, timeout=self._timeout)
             if resp.status_code == requests.codes.ok:
@@ -117,6 +117,8 @@ class RESTfulResolver(Resolver):
         """
         :API: public
         """
+        import requests
+
         session = requests.Session()
         session.mount(resolve_from, requests.adapters.HTTPAdapter(max_retries=self._tries))
         content = self._safe_get_content(session, resolve_from)
@@ -8,17 +8,15 @@ import threading
 from contextlib import contextmanager
 from dataclasses import dataclass
 from enum import Enum
-from typing import Generator, Optional
-
-import requests
-from requests import RequestException
-from urllib3.exceptions import MaxRetryError
-from urllib3.util.retry import Retry
+from typing import TYPE_CHECKING, Generator, Optional
 
 from pants.cache.artifact_cache import ArtifactCache, NonfatalArtifactCacheError, UnreadableArtifact
 from pants.subsystem.subsystem import Subsystem
 from pants.util.memo import memoized_classmethod
 
+if TYPE_CHECKING:
+    import requests  # noqa: F401
+
 logger = logging.getLogger(__name__)
 
 
@@ -63,8 +61,9 @@ class RequestsSession:
         options_scope = "http-artifact-cache"
 
         # Maintain a connection pool of max size equaling the larger of the number of available cores,
-        # or the default from the requests package (which is usually 10).
-        _default_pool_size = max(multiprocessing.cpu_count(), requests.adapters.DEFAULT_POOLSIZE)
+        # or the default from the requests package (`requests.adapters.DEFAULT_POOLSIZE`). The
+        # requests package is not imported to read that default, as it is slow to import.
+        _default_pool_size = max(multiprocessing.cpu_count(), 10)
         # By default, don't perform any retries.
         _default_retries = 0
 
@@ -175,7 +174,10 @@ class RequestsSession:
         return bool(self.max_retries)
 
     @memoized_classmethod
-    def session(cls) -> requests.Session:
+    def session(cls) -> "requests.Session":
+        import requests
+        from urllib3.util.retry import Retry
+
         instance = cls._instance()
 
         session = requests.Session()
@@ -233,6 +235,11 @@ class RESTfulArtifactCache(ArtifactCache):
                 if not self._request("PUT", cache_key, body=infile):
                     raise NonfatalArtifactCacheError("Failed to PUT {0}.".format(cache_key))
 
+    @property
+    def max_concurrent_lookups(self):
+        # Keep as many requests in flight as the pooled session has connections for each host.
+        return RequestsSession._instance().max_connections_within_pool
+
     def has(self, cache_key):
         if self._localcache.has(cache_key):
             return True
@@ -242,6 +249,8 @@ class RESTfulArtifactCache(ArtifactCache):
         if self._localcache.has(cache_key):
             return self._localcache.use_cached_files(cache_key, results_dir)
 
+        from urllib3.exceptions import MaxRetryError
+
         # The queue is used as a semaphore here, containing only a single None element. A background
         # thread is kicked off which waits with the specified timeout for the single queue element, and
         # prints a warning message if the timeout is breached.
@@ -283,7 +292,10 @@ class RESTfulArtifactCache(ArtifactCache):
         self._request("DELETE", cache_key)
 
     @contextmanager
-    def _request_session(self, method, url) -> Generator[requests.Session, None, None]:
+    def _request_session(self, method, url) -> Generator["requests.Session", None, None]:
+        from requests import RequestException
+        from urllib3.exceptions import MaxRetryError
+
         try:
             logger.debug(f"Sending {method} request to {url}")
             # TODO: fix memo.py so @memoized_classmethod is correctly recognized by mypy!
@@ -298,7 +310,7 @@ class RESTfulArtifactCache(ArtifactCache):
             raise NonfatalArtifactCacheError(f"Failed to {method} {url}. Error: {e}") from e
 
     # Returns a response if we get a 200, None if we get a 404 and raises an exception otherwise.
-    def _request(self, method, cache_key, body=None) -> Optional[requests.Response]:
+    def _request(self, method, cache_key, body=None) -> Optional["requests.Response"]:
         # If our connection pool has experienced too many retries, we no-op on every successive
         # artifact download for the rest of the pants process lifetime.
         if RequestsSession.has_exceeded_retries():
@@ -0,0 +1,120 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import base64
+import hashlib
+import logging
+import os
+import pickle
+import threading
+import zlib
+from typing import TYPE_CHECKING, Dict, Optional
+
+from pants.util.memo import memoized_classmethod
+from pants.util.record_log import RecordLog
+
+if TYPE_CHECKING:
+    from pants.engine.mapper import AddressMap  # noqa: F401
+
+logger = logging.getLogger(__name__)
+
+
+class AddressMapCache:
+    """A persistent cache of parsed BUILD files, keyed by their paths and contents.
+
+    Parsing BUILD files dominates graph construction in runs without pantsd, which start with an
+    empty in-memory graph. This cache lets those runs reuse the `AddressMap`s parsed by earlier runs
+    for the BUILD files whose contents have not changed, and only parse the rest.
+
+    The parsed maps are pickled into a single append-only `RecordLog`, which is read once, on first
+    use. A BUILD file that parses to objects that cannot be pickled is simply parsed every time.
+
+    A cached parse is only valid while everything else that went into it is unchanged, so entries are
+    also keyed by a fingerprint of the parser's configuration (see `fingerprint_for`). A BUILD file
+    whose parse reads other files, as some macros do, would go stale when only those files change,
+    which is why the cache is opt-in.
+    """
+
+    LOG_FILE_NAME = "address_maps.log"
+
+    # Beyond this many records, the log is discarded rather than compacted, since it holds no record
+    # of which entries are still in use.
+    _MAX_RECORDS = 100000
+
+    _COMPACTION_MIN_RECORDS = 1024
+    _COMPACTION_RATIO = 2
+
+    @staticmethod
+    def fingerprint_for(*parser_inputs: str) -> str:
+        """Returns a fingerprint of the given descriptions of a parser's configuration."""
+        hasher = hashlib.sha1()
+        for parser_input in parser_inputs:
+            hasher.update(parser_input.encode())
+            hasher.update(b"\0")
+        return hasher.hexdigest()
+
+    @memoized_classmethod
+    def for_root(cls, root: str, parser_fingerprint: str) -> "AddressMapCache":
+        """Returns the cache shared by all parsers in this process with the given fingerprint."""
+        return cls(root, parser_fingerprint)
+
+    def __init__(self, root: str, parser_fingerprint: str) -> None:
+        """
+        :param root: The directory to keep the cache in.
+        :param parser_fingerprint: A fingerprint of the configuration of the parser whose parses are
+                                   cached, as returned by `fingerprint_for`.
+        """
+        self._log = RecordLog(os.path.join(root, self.LOG_FILE_NAME))
+        self._parser_fingerprint = parser_fingerprint
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, str]] = None
+
+    def get(self, filepath: str, filecontent: bytes) -> Optional["AddressMap"]:
+        """Returns the cached parse of the given BUILD file contents, if any."""
+        key = self._key(filepath, filecontent)
+        with self._lock:
+            encoded = self._load().get(key)
+        if encoded is None:
+            return None
+        try:
+            return pickle.loads(zlib.decompress(base64.b64decode(encoded)))  # type: ignore[no-any-return]
+        except Exception as e:
+            # Most likely a class that has since moved or changed shape.
+            logger.debug("Ignoring unreadable cached parse of {}: {!r}".format(filepath, e))
+            return None
+
+    def put(self, filepath: str, filecontent: bytes, address_map: "AddressMap") -> None:
+        """Caches the parse of the given BUILD file contents."""
+        try:
+            pickled = pickle.dumps(address_map, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.debug(
+                "Not caching the parse of {}, which cannot be pickled: {!r}".format(filepath, e)
+            )
+            return
+        key = self._key(filepath, filecontent)
+        encoded = base64.b64encode(zlib.compress(pickled)).decode()
+        with self._lock:
+            self._load()[key] = encoded
+            self._log.append([(key, encoded)])
+
+    def _key(self, filepath: str, filecontent: bytes) -> str:
+        hasher = hashlib.sha1()
+        hasher.update(self._parser_fingerprint.encode())
+        hasher.update(filepath.encode())
+        hasher.update(b"\0")
+        hasher.update(filecontent)
+        return hasher.hexdigest()
+
+    def _load(self) -> Dict[str, str]:
+        if self._entries is not None:
+            return self._entries
+
+        records = self._log.load_compacted(
+            key_fn=lambda record: record[0] if len(record) == 2 else None,
+            max_records=self._MAX_RECORDS,
+            min_compaction_records=self._COMPACTION_MIN_RECORDS,
+            compaction_ratio=self._COMPACTION_RATIO,
+        )
+        self._entries = {key: encoded for key, encoded in records.values()}
+        return self._entries
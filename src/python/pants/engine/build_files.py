@@ -18,7 +18,7 @@ from pants.engine.addressable import (
     BuildFileAddresses,
 )
 from pants.engine.fs import Digest, FilesContent, PathGlobs, Snapshot
-from pants.engine.mapper import AddressFamily, AddressMap, AddressMapper
+from pants.engine.mapper import AddressFamily, AddressMapper
 from pants.engine.objects import Locatable, SerializableFactory, Validatable
 from pants.engine.parser import HydratedStruct
 from pants.engine.rules import RootRule, rule
@@ -56,13 +56,10 @@ async def parse_address_family(address_mapper: AddressMapper, directory: Dir) ->
         raise ResolveError(
             'Directory "{}" does not contain any BUILD files.'.format(directory.path)
         )
-    address_maps = []
-    for filecontent_product in files_content:
-        address_maps.append(
-            AddressMap.parse(
-                filecontent_product.path, filecontent_product.content, address_mapper.parser
-            )
-        )
+    address_maps = [
+        address_mapper.parse(filecontent_product.path, filecontent_product.content)
+        for filecontent_product in files_content
+    ]
     return AddressFamily.create(directory.path, address_maps)
 
 
@@ -4,6 +4,7 @@
 import dataclasses
 import logging
 import os.path
+import threading
 from collections import defaultdict, deque
 from contextlib import contextmanager
 from dataclasses import dataclass
@@ -54,7 +55,7 @@ from pants.option.global_options import (
     GlobMatchErrorBehavior,
     OwnersNotFoundBehavior,
 )
-from pants.source.filespec import any_matches_filespec
+from pants.source.filespec import FilespecIndex
 from pants.source.wrapped_globs import EagerFilesetWithSpec, FilesetRelPathWrapper, Filespec
 from pants.util.meta import frozen_after_init
 from pants.util.ordered_set import FrozenOrderedSet, OrderedSet
@@ -288,17 +289,34 @@ class _DependentGraph:
     ...and have it complete in a similar amount of time by hitting relevant caches.
     """
 
+    # The graph kept up to date across the runs of a pantsd process, with the configuration it was
+    # created for. See `for_configuration`.
+    _incremental = None
+    _incremental_lock = threading.Lock()
+
     @classmethod
     def from_iterable(cls, target_types, address_mapper, adaptor_iter):
         """Create a new DependentGraph from an iterable of TargetAdaptor subclasses."""
         inst = cls(target_types, address_mapper)
-        all_valid_addresses = set()
-        for target_adaptor in adaptor_iter:
-            inst._inject_target(target_adaptor)
-            all_valid_addresses.add(target_adaptor.address)
-        inst._validate(all_valid_addresses)
+        inst.update(adaptor_iter)
         return inst
 
+    @classmethod
+    def for_configuration(cls, target_types, address_mapper):
+        """Returns a DependentGraph shared by all runs in this process with the same configuration.
+
+        The engine may run several requests concurrently, so the shared graph must be queried with
+        `updated_dependents_of_addresses`, which brings it up to date and queries it under a lock.
+        In pantsd, where the engine returns the same TargetAdaptor objects from run to run for the
+        BUILD files that have not changed, only the targets of changed BUILD files need to be
+        re-injected.
+        """
+        key = (address_mapper, frozenset(target_types.items()))
+        with cls._incremental_lock:
+            if cls._incremental is None or cls._incremental[0] != key:
+                cls._incremental = (key, cls(target_types, address_mapper))
+            return cls._incremental[1]
+
     def __init__(self, target_types, address_mapper):
         # TODO: Dependencies and implicit dependencies are mapped independently, because the latter
         # cannot be validated until:
@@ -309,23 +327,77 @@ class _DependentGraph:
         self._implicit_dependent_address_map = defaultdict(set)
         self._target_types = target_types
         self._address_mapper = address_mapper
-
-    def _validate(self, all_valid_addresses):
-        """Validate that all of the dependencies in the graph exist in the given addresses set."""
-        for dependency, dependents in self._dependent_address_map.items():
-            if dependency not in all_valid_addresses:
-                raise AddressLookupError(
-                    "Dependent graph construction failed: {} did not exist. Was depended on by:\n  {}".format(
-                        dependency.spec, "\n  ".join(d.spec for d in dependents)
-                    )
+        # A map from the address of each injected target to the TargetAdaptor it was injected from,
+        # and its declared and implicit dependencies.
+        self._injected: Dict[Address, Tuple[Any, Tuple[Address, ...], Tuple[Address, ...]]] = {}
+        # Addresses that are depended on, but that did not exist as of the last update.
+        self._missing: Set[Address] = set()
+        self._lock = threading.Lock()
+
+    def updated_dependents_of_addresses(self, adaptor_iter, addresses, transitive):
+        """Given all the TargetAdaptors in the repo and an iterable of addresses, return all of
+        those addresses dependents, after bringing the graph up to date with the TargetAdaptors.
+
+        :param adaptor_iter: All the TargetAdaptors in the repo, as for `update`.
+        :param addresses: The addresses to find the dependents of.
+        :param bool transitive: Whether to return transitive dependents, or only direct ones.
+        """
+        with self._lock:
+            self.update(adaptor_iter)
+            if transitive:
+                return self.transitive_dependents_of_addresses(addresses)
+            return self.dependents_of_addresses(addresses)
+
+    def update(self, adaptor_iter):
+        """Brings the graph up to date with the given TargetAdaptors, which must be all the targets
+        in the repo.
+
+        Targets are re-injected only if their TargetAdaptor is not the one they were last injected
+        from, and targets that are no longer present are removed.
+        """
+        all_valid_addresses = set()
+        touched = set()
+        for target_adaptor in adaptor_iter:
+            address = target_adaptor.address
+            all_valid_addresses.add(address)
+            previous = self._injected.get(address)
+            if previous is not None:
+                if previous[0] is target_adaptor:
+                    continue
+                self._remove_target(address, touched)
+            self._inject_target(target_adaptor, touched)
+
+        for address in self._injected.keys() - all_valid_addresses:
+            self._remove_target(address, touched)
+            touched.add(address)
+        self._validate(all_valid_addresses, touched)
+
+    def _validate(self, all_valid_addresses, touched):
+        """Validate that all of the dependencies in the graph exist in the given addresses set.
+
+        Only the dependencies whose dependents changed in this update are checked, along with any
+        found missing by an earlier update.
+        """
+        for dependency in touched | self._missing:
+            if dependency in all_valid_addresses or not self._dependent_address_map.get(dependency):
+                self._missing.discard(dependency)
+            else:
+                self._missing.add(dependency)
+        if self._missing:
+            dependency = min(self._missing, key=lambda address: address.spec)
+            raise AddressLookupError(
+                "Dependent graph construction failed: {} did not exist. Was depended on by:\n  {}".format(
+                    dependency.spec,
+                    "\n  ".join(d.spec for d in self._dependent_address_map[dependency]),
                 )
+            )
 
-    def _inject_target(self, target_adaptor):
+    def _inject_target(self, target_adaptor, touched):
         """Inject a target, respecting all sources of dependencies."""
         target_cls = self._target_types[target_adaptor.type_alias]
 
-        declared_deps = target_adaptor.dependencies
-        implicit_deps = (
+        declared_deps = tuple(target_adaptor.dependencies)
+        implicit_deps = tuple(
             Address.parse(
                 s,
                 relative_to=target_adaptor.address.spec_path,
@@ -337,13 +409,28 @@ class _DependentGraph:
             self._dependent_address_map[dep].add(target_adaptor.address)
         for dep in implicit_deps:
             self._implicit_dependent_address_map[dep].add(target_adaptor.address)
+        self._injected[target_adaptor.address] = (target_adaptor, declared_deps, implicit_deps)
+        touched.update(declared_deps)
+
+    def _remove_target(self, address, touched):
+        _, declared_deps, implicit_deps = self._injected.pop(address)
+        for dependent_address_map, deps in (
+            (self._dependent_address_map, declared_deps),
+            (self._implicit_dependent_address_map, implicit_deps),
+        ):
+            for dep in deps:
+                dependents = dependent_address_map[dep]
+                dependents.discard(address)
+                if not dependents:
+                    del dependent_address_map[dep]
+        touched.update(declared_deps)
 
     def dependents_of_addresses(self, addresses):
         """Given an iterable of addresses, return all of those addresses dependents."""
         seen = OrderedSet(addresses)
         for address in addresses:
-            seen.update(self._dependent_address_map[address])
-            seen.update(self._implicit_dependent_address_map[address])
+            seen.update(self._dependent_address_map.get(address, ()))
+            seen.update(self._implicit_dependent_address_map.get(address, ()))
         return seen
 
     def transitive_dependents_of_addresses(self, addresses):
@@ -360,8 +447,8 @@ class _DependentGraph:
 
             closure.add(address)
             result.append(address)
-            to_visit.extend(self._dependent_address_map[address])
-            to_visit.extend(self._implicit_dependent_address_map[address])
+            to_visit.extend(self._dependent_address_map.get(address, ()))
+            to_visit.extend(self._implicit_dependent_address_map.get(address, ()))
 
         return result
 
@@ -502,6 +589,84 @@ class Owners:
     addresses: Addresses
 
 
+class _SourcesOwnershipIndex:
+    """An index of the `sources` filespecs of the targets that `find_owners` has seen.
+
+    The index is shared by all runs in this process, so in pantsd, where the engine returns the same
+    HydratedTargets from run to run for the BUILD files that have not changed, only the targets of
+    changed BUILD files need to be re-indexed. The engine runs `find_owners` concurrently, so each
+    request updates and matches against the index under a lock.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def instance(cls) -> "_SourcesOwnershipIndex":
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._index = FilespecIndex()
+        self._addresses_by_dir: DefaultDict[str, Set[Address]] = defaultdict(set)
+
+    def owners_of_any(
+        self,
+        directories: Iterable[str],
+        hydrated_targets: Iterable[HydratedTarget],
+        sources: Iterable[str],
+    ) -> Set[Address]:
+        """Returns the addresses of the indexed targets whose `sources` match any of the given
+        sources, after bringing the index up to date with the given targets.
+
+        :param directories: The directories whose targets are all among `hydrated_targets`.
+        :param hydrated_targets: The targets declared in `directories`.
+        :param sources: The sources to find the owners of.
+        """
+        with self._lock:
+            self._update(directories, hydrated_targets)
+            return cast(Set[Address], self._index.owners_of_any(sources))
+
+    def _update(
+        self, directories: Iterable[str], hydrated_targets: Iterable[HydratedTarget]
+    ) -> None:
+        present = {ht.adaptor.address for ht in hydrated_targets}
+        for directory in directories:
+            vanished = self._addresses_by_dir.get(directory, set()) - present
+            for address in vanished:
+                self._remove(address)
+
+        for ht in hydrated_targets:
+            address = ht.adaptor.address
+            # NB: Deleted files can only be matched against the 'filespec' (ie, `PathGlobs`) for a
+            # target, so we don't match against the target's resolved files here.
+            target_sources = ht.adaptor.kwargs().get("sources", None)
+            if target_sources is None:
+                self._remove(address)
+            elif self._index.get(address) != target_sources.filespec:
+                self._index.add(address, target_sources.filespec)
+                self._addresses_by_dir[address.spec_path].add(address)
+
+    def _remove(self, address: Address) -> None:
+        self._index.remove(address)
+        addresses = self._addresses_by_dir.get(address.spec_path)
+        if addresses is not None:
+            addresses.discard(address)
+            if not addresses:
+                del self._addresses_by_dir[address.spec_path]
+
+
+def _ancestor_dirs(directory: str) -> Iterator[str]:
+    """Yields the given directory and each of its ancestors, up to and including the buildroot."""
+    while directory:
+        yield directory
+        directory = os.path.dirname(directory)
+    yield ""
+
+
 @rule
 async def find_owners(owners_request: OwnersRequest) -> Owners:
     sources_set = FrozenOrderedSet(owners_request.sources)
@@ -511,21 +676,17 @@ async def find_owners(owners_request: OwnersRequest) -> Owners:
     candidate_specs = tuple(AscendantAddresses(directory=d) for d in dirs_set)
     candidate_targets = await Get[HydratedTargets](AddressSpecs(candidate_specs))
 
-    # Match the source globs against the expanded candidate targets.
-    def owns_any_source(legacy_target: HydratedTarget) -> bool:
-        """Given a `HydratedTarget` instance, check if it owns the given source file."""
-        target_kwargs = legacy_target.adaptor.kwargs()
-
-        # Handle `sources`-declaring targets.
-        # NB: Deleted files can only be matched against the 'filespec' (ie, `PathGlobs`) for a target,
-        # so we don't actually call `fileset.matches` here.
-        # TODO: This matching logic should be implemented using the rust `fs` crate for two reasons:
-        #  1) having two implementations isn't great
-        #  2) we're expanding sources via HydratedTarget, but it isn't necessary to do that to match
-        target_sources = target_kwargs.get("sources", None)
-        return target_sources and any_matches_filespec(
-            paths=sources_set, spec=target_sources.filespec
-        )
+    # Match the source globs of the candidate targets against the sources, via an index that only
+    # matches each source against the globs that could possibly match it.
+    # TODO: This matching logic should be implemented using the rust `fs` crate for two reasons:
+    #  1) having two implementations isn't great
+    #  2) we're expanding sources via HydratedTarget, but it isn't necessary to do that to match
+    # NB: The index may also hold targets seen by earlier requests, so only candidates may own.
+    source_owners = _SourcesOwnershipIndex.instance().owners_of_any(
+        {ancestor for d in dirs_set for ancestor in _ancestor_dirs(d)},
+        candidate_targets,
+        sources_set,
+    )
 
     build_file_addresses = await MultiGet(
         Get[BuildFileAddress](Address, ht.adaptor.address) for ht in candidate_targets
@@ -533,7 +694,8 @@ async def find_owners(owners_request: OwnersRequest) -> Owners:
     owners = Addresses(
         ht.adaptor.address
         for ht, bfa in zip(candidate_targets, build_file_addresses)
-        if LegacyAddressMapper.any_is_declaring_file(bfa, sources_set) or owns_any_source(ht)
+        if ht.adaptor.address in source_owners
+        or LegacyAddressMapper.any_is_declaring_file(bfa, sources_set)
     )
     return Owners(owners)
 
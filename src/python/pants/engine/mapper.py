@@ -7,6 +7,7 @@ from typing import Any, Dict, Iterable, Optional, Tuple, Union
 
 from pants.base.exceptions import DuplicateNameError, MappingError, UnaddressableObjectError
 from pants.build_graph.address import BuildFileAddress
+from pants.engine.address_map_cache import AddressMapCache
 from pants.engine.objects import Serializable
 from pants.engine.parser import Parser
 from pants.util.memo import memoized_property
@@ -156,6 +157,7 @@ class AddressMapper:
     build_ignore_patterns: Tuple[str, ...]
     exclude_target_regexps: Tuple[str, ...]
     subproject_roots: Tuple[str, ...]
+    address_map_cache: Optional[AddressMapCache]
 
     def __init__(
         self,
@@ -164,6 +166,7 @@ class AddressMapper:
         build_ignore_patterns: Optional[Iterable[str]] = None,
         exclude_target_regexps: Optional[Iterable[str]] = None,
         subproject_roots: Optional[Iterable[str]] = None,
+        address_map_cache: Optional[AddressMapCache] = None,
     ) -> None:
         """Create an AddressMapper.
 
@@ -175,12 +178,24 @@ class AddressMapper:
                               used to resolve addresses.
         :param build_ignore_patterns: A list of path ignore patterns used when searching for BUILD files.
         :param exclude_target_regexps: A list of regular expressions for excluding targets.
+        :param address_map_cache: A cache of earlier parses of BUILD files by this parser, if any.
         """
         self.parser = parser
         self.build_patterns = tuple(build_patterns or ["BUILD", "BUILD.*"])
         self.build_ignore_patterns = tuple(build_ignore_patterns or [])
         self.exclude_target_regexps = tuple(exclude_target_regexps or [])
         self.subproject_roots = tuple(subproject_roots or [])
+        self.address_map_cache = address_map_cache
+
+    def parse(self, filepath: str, filecontent: bytes) -> AddressMap:
+        """Parses the given BUILD file, or returns an earlier parse of the same contents."""
+        if self.address_map_cache is None:
+            return AddressMap.parse(filepath, filecontent, self.parser)
+        address_map = self.address_map_cache.get(filepath, filecontent)
+        if address_map is None:
+            address_map = AddressMap.parse(filepath, filecontent, self.parser)
+            self.address_map_cache.put(filepath, filecontent, address_map)
+        return address_map
 
     def __repr__(self):
         return "AddressMapper(parser={}, build_patterns={})".format(
@@ -7,12 +7,16 @@ class PantsDaemonStats:
 
     def __init__(self):
         self.scheduler_metrics = {}
+        self.invalidation_metrics = {}
 
     def set_scheduler_metrics(self, scheduler_metrics):
         self.scheduler_metrics = {
             key: value for (key, value) in scheduler_metrics.items() if key != "engine_workunits"
         }
 
+    def set_invalidation_metrics(self, invalidation_metrics):
+        self.invalidation_metrics = dict(invalidation_metrics)
+
     def set_target_root_size(self, size):
         self.scheduler_metrics["target_root_size"] = size
 
@@ -22,4 +26,5 @@ class PantsDaemonStats:
     def get_all(self):
         for key in ["target_root_size", "affected_targets_size"]:
             self.scheduler_metrics.setdefault(key, 0)
+        self.scheduler_metrics.update(self.invalidation_metrics)
         return self.scheduler_metrics
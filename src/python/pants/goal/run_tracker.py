@@ -14,12 +14,10 @@ from collections import OrderedDict
 from contextlib import contextmanager
 from typing import Any, Dict, Optional
 
-import requests
-
 from pants.auth.basic_auth import BasicAuth
 from pants.base.exiter import PANTS_FAILED_EXIT_CODE, PANTS_SUCCEEDED_EXIT_CODE
 from pants.base.run_info import RunInfo
-from pants.base.worker_pool import SubprocPool, WorkerPool
+from pants.base.worker_pool import ProcessWorkerPool, SubprocPool, WorkerPool
 from pants.base.workunit import WorkUnit, WorkUnitLabel
 from pants.goal.aggregated_timings import AggregatedTimings
 from pants.goal.artifact_cache_stats import ArtifactCacheStats
@@ -121,6 +119,14 @@ class RunTracker(Subsystem):
             default=multiprocessing.cpu_count(),
             help="Number of threads for background work.",
         )
+        register(
+            "--num-background-processes",
+            advanced=True,
+            type=int,
+            default=0,
+            help="Number of subprocesses to run CPU-bound background work in, such as creating "
+            "artifacts for the artifact cache. If 0, such work runs in the background threads.",
+        )
         register(
             "--stats-local-json-file",
             advanced=True,
@@ -182,6 +188,9 @@ class RunTracker(Subsystem):
         # Number of threads for background work.
         self._num_background_workers = self.get_options().num_background_workers
 
+        # Number of subprocesses for CPU-bound background work, if any.
+        self._num_background_processes = self.get_options().num_background_processes
+
         # self._threadlocal.current_workunit contains the current workunit for the calling thread.
         # Note that multiple threads may share a name (e.g., all the threads in a pool).
         self._threadlocal = threading.local()
@@ -456,6 +465,8 @@ class RunTracker(Subsystem):
         # The other redirect codes either must, or in practice do, cause the user agent to switch the
         # method to GET. So when they are encountered on a POST, it indicates an auth problem (a
         # redirection to a login page).
+        import requests
+
         def do_post(url, num_redirects_allowed):
             if num_redirects_allowed < 0:
                 return error("too many redirects.")
@@ -677,12 +688,21 @@ class RunTracker(Subsystem):
 
     def background_worker_pool(self):
         if self._background_worker_pool is None:  # Initialize lazily.
-            self._background_worker_pool = WorkerPool(
-                parent_workunit=self.get_background_root_workunit(),
-                run_tracker=self,
-                num_workers=self._num_background_workers,
-                thread_name_prefix="background",
-            )
+            if self._num_background_processes > 0:
+                self._background_worker_pool = ProcessWorkerPool(
+                    parent_workunit=self.get_background_root_workunit(),
+                    run_tracker=self,
+                    num_workers=self._num_background_workers,
+                    thread_name_prefix="background",
+                    num_processes=self._num_background_processes,
+                )
+            else:
+                self._background_worker_pool = WorkerPool(
+                    parent_workunit=self.get_background_root_workunit(),
+                    run_tracker=self,
+                    num_workers=self._num_background_workers,
+                    thread_name_prefix="background",
+                )
         return self._background_worker_pool
 
     def shutdown_worker_pool(self):
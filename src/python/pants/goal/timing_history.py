@@ -0,0 +1,146 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import heapq
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+from pants.util.memo import memoized_classmethod
+from pants.util.record_log import Record, RecordLog
+
+T = TypeVar("T")
+
+
+class TimingHistory:
+    """Remembers how long units of work took in previous runs, so that later runs can schedule
+    similar work by its expected duration.
+
+    Timings are keyed by the options scope of the task that did the work and by a key that the task
+    chooses, usually a target address, and are kept in a single append-only `RecordLog` that is read
+    once, on first use. Timings recorded during a run are appended to it by `flush`.
+
+    Each key's estimate is an exponentially decaying average of its recorded timings, so that it
+    tracks changes in the work without being thrown by a single slow or fast run. Keys that have not
+    been recorded for `_MAX_AGE_SECS` are forgotten when the log is compacted.
+    """
+
+    LOG_FILE_NAME = "timings.log"
+
+    # The weight of the previous estimate when folding in a newly recorded timing.
+    _DECAY = 0.5
+
+    _MAX_AGE_SECS = 30 * 24 * 60 * 60
+
+    _COMPACTION_MIN_RECORDS = 1024
+    _COMPACTION_RATIO = 2
+
+    @classmethod
+    def for_pants_workdir(cls, pants_workdir: str) -> "TimingHistory":
+        """Returns the history shared by all tasks in this process using the given workdir."""
+        return cls.for_root(os.path.join(pants_workdir, "timing_history"))
+
+    @memoized_classmethod
+    def for_root(cls, root: str) -> "TimingHistory":
+        """Returns the history shared by all tasks in this process under the given root."""
+        return cls(root)
+
+    def __init__(self, root: str) -> None:
+        """
+        :param root: The directory to keep the history in.
+        """
+        self._log = RecordLog(os.path.join(root, self.LOG_FILE_NAME))
+        self._lock = threading.Lock()
+        # A map from (scope, key) to the estimated seconds and the time they were last recorded.
+        self._timings: Optional[Dict[Tuple[str, str], Tuple[float, int]]] = None
+        self._pending: List[Tuple[str, str, str, str]] = []
+
+    def get(self, scope: str, key: str) -> Optional[float]:
+        """Returns the estimated duration in seconds for the given key, if any was recorded."""
+        with self._lock:
+            timing = self._load().get((scope, key))
+        return timing[0] if timing else None
+
+    def get_for_target(self, scope: str, target) -> Optional[float]:
+        """Returns the estimated duration in seconds of the given target's work in the given scope."""
+        return self.get(scope, target.address.spec)
+
+    def record(self, scope: str, key: str, secs: float) -> None:
+        """Folds a newly measured duration for the given key into its estimate."""
+        now = int(time.time())
+        with self._lock:
+            timings = self._load()
+            previous = timings.get((scope, key))
+            if previous is not None:
+                secs = self._DECAY * previous[0] + (1 - self._DECAY) * secs
+            timings[(scope, key)] = (secs, now)
+            self._pending.append((scope, key, repr(secs), str(now)))
+
+    def record_for_target(self, scope: str, target, secs: float) -> None:
+        """Folds a newly measured duration of the given target's work into its estimate."""
+        self.record(scope, target.address.spec, secs)
+
+    def flush(self) -> None:
+        """Persists the timings recorded since the last flush."""
+        with self._lock:
+            if self._pending:
+                self._log.append(self._pending)
+                self._pending = []
+
+    def _load(self) -> Dict[Tuple[str, str], Tuple[float, int]]:
+        if self._timings is not None:
+            return self._timings
+
+        cutoff = time.time() - self._MAX_AGE_SECS
+        records = self._log.load_compacted(
+            key_fn=self._timing_key,
+            live_fn=lambda record: int(record[3]) >= cutoff,
+            min_compaction_records=self._COMPACTION_MIN_RECORDS,
+            compaction_ratio=self._COMPACTION_RATIO,
+        )
+        live = {
+            (scope, key): (float(secs), int(recorded_at))
+            for scope, key, secs, recorded_at in records.values()
+        }
+        self._timings = live
+        return live
+
+    @staticmethod
+    def _timing_key(record: Record) -> Optional[Tuple[str, str]]:
+        if len(record) != 4:
+            return None
+        try:
+            float(record[2])
+            int(record[3])
+        except ValueError:
+            return None
+        return (record[0], record[1])
+
+
+def balance_by_duration(
+    items: Sequence[T], estimate: Callable[[T], float], num_partitions: int, max_size: int
+) -> List[List[T]]:
+    """Splits items into partitions whose estimated total durations are as even as possible.
+
+    Items are assigned longest first to the partition with the least estimated work so far that has
+    fewer than `max_size` items. Each partition keeps its items in their original order.
+
+    :param items: The items to partition.
+    :param estimate: A function returning the estimated duration of an item.
+    :param num_partitions: The number of partitions to split the items into.
+    :param max_size: The maximum number of items in a partition. `num_partitions * max_size` must be
+                     at least the number of items.
+    :returns: The non-empty partitions.
+    """
+    assert num_partitions * max_size >= len(items)
+    estimates = [estimate(item) for item in items]
+    partitions: List[List[int]] = [[] for _ in range(num_partitions)]
+    # A heap of (estimated work, partition index) for partitions with room for more items.
+    open_partitions = [(0.0, index) for index in range(num_partitions)]
+    for item_index in sorted(range(len(items)), key=lambda i: (-estimates[i], i)):
+        work, index = heapq.heappop(open_partitions)
+        partitions[index].append(item_index)
+        if len(partitions[index]) < max_size:
+            heapq.heappush(open_partitions, (work + estimates[item_index], index))
+    return [[items[i] for i in sorted(partition)] for partition in partitions if partition]
@@ -2,6 +2,7 @@
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
 import logging
+import os
 from dataclasses import dataclass
 from typing import Any, Iterable, List, Optional, Tuple, cast
 
@@ -21,6 +22,7 @@ from pants.binaries.binary_util import rules as binary_util_rules
 from pants.build_graph.build_configuration import BuildConfiguration
 from pants.build_graph.build_file_aliases import BuildFileAliases
 from pants.build_graph.remote_sources import RemoteSources
+from pants.engine.address_map_cache import AddressMapCache
 from pants.engine.build_files import create_graph_rules
 from pants.engine.console import Console
 from pants.engine.fs import Workspace, create_fs_rules
@@ -66,10 +68,45 @@ from pants.option.global_options import (
 from pants.option.options import Options
 from pants.option.options_bootstrapper import OptionsBootstrapper
 from pants.scm.subsystems.changed import rules as changed_rules
+from pants.version import VERSION
 
 logger = logging.getLogger(__name__)
 
 
+def _address_map_cache(
+    bootstrap_options,
+    parser: LegacyPythonCallbacksParser,
+    build_file_aliases: BuildFileAliases,
+    build_file_imports_behavior: BuildFileImportsBehavior,
+) -> AddressMapCache:
+    """Returns the cache of BUILD file parses by a parser with the given configuration."""
+
+    def qualified_name(obj):
+        # Classes and functions name themselves, other objects are named by their type.
+        named = obj if hasattr(obj, "__qualname__") else type(obj)
+        return "{}.{}".format(named.__module__, named.__qualname__)
+
+    def describe(aliases):
+        return ",".join(
+            "{}={}".format(alias, qualified_name(obj)) for alias, obj in sorted(aliases.items())
+        )
+
+    parser_fingerprint = AddressMapCache.fingerprint_for(
+        VERSION,
+        qualified_name(parser),
+        build_file_imports_behavior.value,
+        ",".join(bootstrap_options.backend_packages),
+        ",".join(bootstrap_options.plugins),
+        describe(build_file_aliases.target_types),
+        describe(build_file_aliases.target_macro_factories),
+        describe(build_file_aliases.objects),
+        describe(build_file_aliases.context_aware_object_factories),
+    )
+    return AddressMapCache.for_root(
+        os.path.join(bootstrap_options.pants_workdir, "build_file_parse_cache"), parser_fingerprint
+    )
+
+
 def _tuplify(v):
     if v is None:
         return None
@@ -380,6 +417,13 @@ class EngineInitializer:
             build_ignore_patterns=build_ignore_patterns,
             exclude_target_regexps=exclude_target_regexps,
             subproject_roots=subproject_roots,
+            address_map_cache=(
+                _address_map_cache(
+                    bootstrap_options, parser, build_file_aliases, build_file_imports_behavior
+                )
+                if bootstrap_options.build_file_parse_cache
+                else None
+            ),
         )
 
         @rule
@@ -7,10 +7,8 @@ import os
 import shutil
 import site
 import uuid
-from typing import Iterable, Iterator, List, Optional, Type, TypeVar, cast
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional, Type, TypeVar, cast
 
-from pex import resolver
-from pex.interpreter import PythonInterpreter
 from pkg_resources import Distribution, WorkingSet
 from pkg_resources import working_set as global_working_set
 
@@ -25,6 +23,9 @@ from pants.util.dirutil import safe_concurrent_rename, safe_delete, safe_open
 from pants.util.memo import memoized_property
 from pants.version import PANTS_SEMVER
 
+if TYPE_CHECKING:
+    from pex.interpreter import PythonInterpreter  # noqa: F401
+
 logger = logging.getLogger(__name__)
 
 
@@ -40,10 +41,10 @@ class PluginResolver:
         self,
         options_bootstrapper: OptionsBootstrapper,
         *,
-        interpreter: Optional[PythonInterpreter] = None,
+        interpreter: Optional["PythonInterpreter"] = None,
     ) -> None:
         self._options_bootstrapper = options_bootstrapper
-        self._interpreter = interpreter or PythonInterpreter.get()
+        self._requested_interpreter = interpreter
 
         bootstrap_options = self._options_bootstrapper.get_bootstrap_options().for_global_scope()
         self._plugin_requirements: List[str] = sorted(
@@ -68,6 +69,12 @@ class PluginResolver:
                 working_set.add_entry(resolved_plugin_location)
         return working_set
 
+    @memoized_property
+    def _interpreter(self) -> "PythonInterpreter":
+        from pex.interpreter import PythonInterpreter
+
+        return self._requested_interpreter or PythonInterpreter.get()
+
     def _resolve_plugin_locations(self) -> Iterator[str]:
         hasher = hashlib.sha1()
 
@@ -98,6 +105,8 @@ class PluginResolver:
         logger.info(
             "Resolving new plugins...:\n  {}".format("\n  ".join(self._plugin_requirements))
         )
+        from pex import resolver
+
         resolved_dists = resolver.resolve(
             self._plugin_requirements,
             indexes=self._python_repos.indexes,
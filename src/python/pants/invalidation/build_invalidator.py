@@ -1,17 +1,17 @@
 # Copyright 2014 Pants project contributors (see CONTRIBUTORS.md).
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
-import errno
 import hashlib
 import os
+import weakref
 from abc import ABC, abstractmethod
 from collections import namedtuple
 
+from pants.base.fingerprint_strategy import DefaultFingerprintStrategy
 from pants.base.hash_utils import hash_all
 from pants.build_graph.target import Target
-from pants.fs.fs import safe_filename
+from pants.invalidation.fingerprint_store import DirectoryFingerprintStore, LogFingerprintStore
 from pants.subsystem.subsystem import Subsystem
-from pants.util.dirutil import safe_mkdir
 
 # Bump this to invalidate all existing keys in artifact caches across all pants deployments in the
 # world. Do this if you've made a change that invalidates existing artifacts, e.g.,  fixed a bug
@@ -82,6 +82,13 @@ class CacheKeyGeneratorInterface(ABC):
 
 
 class CacheKeyGenerator(CacheKeyGeneratorInterface):
+    # The fingerprint strategies for which each target's transitive fingerprint has already been
+    # memoized on the target, shared by the generators of all tasks in the run. Entries go away
+    # with their targets.
+    _transitively_fingerprinted: "weakref.WeakKeyDictionary[Target, set]" = (
+        weakref.WeakKeyDictionary()
+    )
+
     def __init__(self, *base_fingerprint_inputs):
         """
         :base_fingerprint_inputs: Information to be included in the fingerprint for all cache keys
@@ -97,6 +104,7 @@ class CacheKeyGenerator(CacheKeyGeneratorInterface):
         hasher = self._base_hasher.copy()
         key_suffix = hasher.hexdigest()[:12]
         if transitive:
+            self._fingerprint_dependencies_first(target, fingerprint_strategy)
             target_key = target.transitive_invalidation_hash(fingerprint_strategy)
         else:
             target_key = target.invalidation_hash(fingerprint_strategy)
@@ -108,6 +116,41 @@ class CacheKeyGenerator(CacheKeyGeneratorInterface):
         else:
             return None
 
+    @classmethod
+    def _fingerprint_dependencies_first(cls, target, fingerprint_strategy):
+        """Memoizes the transitive fingerprints of the target's dependencies, bottom-up.
+
+        A target's transitive fingerprint is memoized on the target, but computing it recurses
+        through every dependency whose fingerprint is not memoized yet. Instead, this walks the
+        dependencies not yet fingerprinted with the strategy in any task's generator, and
+        fingerprints each after its own dependencies, so that every fingerprint is computed once,
+        from memoized fingerprints of its dependencies.
+        """
+        fingerprint_strategy = fingerprint_strategy or DefaultFingerprintStrategy()
+        if fingerprint_strategy.direct(target):
+            # Only the dependencies' own fingerprints are used.
+            return
+
+        def fingerprinted(tgt):
+            return fingerprint_strategy in cls._transitively_fingerprinted.get(tgt, ())
+
+        visited = {target}
+        stack = [(target, iter(target.dependencies))]
+        while stack:
+            tgt, dependencies = stack[-1]
+            for dep in dependencies:
+                if dep not in visited and not fingerprinted(dep):
+                    visited.add(dep)
+                    stack.append((dep, iter(dep.dependencies)))
+                    break
+            else:
+                stack.pop()
+                if tgt is not target:
+                    # A dependency's fingerprint is computed at a depth of at least 1, where the
+                    # strategy's `direct` does not apply.
+                    tgt.transitive_invalidation_hash(fingerprint_strategy, depth=1)
+                    cls._transitively_fingerprinted.setdefault(tgt, set()).add(fingerprint_strategy)
+
 
 class UncacheableCacheKeyGenerator(CacheKeyGeneratorInterface):
     """A cache key generator that always returns uncacheable cache keys."""
@@ -122,9 +165,28 @@ class UncacheableCacheKeyGenerator(CacheKeyGeneratorInterface):
 class BuildInvalidator:
     """Invalidates build targets based on the SHA1 hash of source files and other inputs."""
 
+    FINGERPRINT_STORES = {
+        "log": LogFingerprintStore,
+        "directory": DirectoryFingerprintStore,
+    }
+
     class Factory(Subsystem):
         options_scope = "build-invalidator"
 
+        @classmethod
+        def register_options(cls, register):
+            super().register_options(register)
+            register(
+                "--fingerprint-store",
+                advanced=True,
+                choices=sorted(BuildInvalidator.FINGERPRINT_STORES.keys()),
+                default="log",
+                help="How to persist target fingerprints between runs. log: a single append-only "
+                "log per task, read in bulk and appended to in batches. directory: one file per "
+                "target. Fingerprints recorded by the directory store are migrated into the log "
+                "as they are read.",
+            )
+
         @classmethod
         def create(cls, build_task=None):
             """Creates a build invalidator optionally scoped to a task.
@@ -133,10 +195,11 @@ class BuildInvalidator:
                                    supplied the build invalidator will act globally across all build
                                    tasks.
             """
-            root = os.path.join(
-                cls.global_instance().get_options().pants_workdir, "build_invalidator"
+            options = cls.global_instance().get_options()
+            root = os.path.join(options.pants_workdir, "build_invalidator")
+            return BuildInvalidator(
+                root, scope=build_task, fingerprint_store=options.fingerprint_store
             )
-            return BuildInvalidator(root, scope=build_task)
 
     @staticmethod
     def cacheable(cache_key):
@@ -147,17 +210,18 @@ class BuildInvalidator:
         """
         return cache_key.cacheable
 
-    def __init__(self, root, scope=None):
+    def __init__(self, root, scope=None, fingerprint_store="log"):
         """Create a build invalidator using the given root fingerprint database directory.
 
         :param str root: The root directory to use for storing build invalidation fingerprints.
         :param str scope: The scope of this invalidator; if `None` then this invalidator will be global.
+        :param str fingerprint_store: The name of the `FINGERPRINT_STORES` entry to persist
+                                      fingerprints with.
         """
         root = os.path.join(root, GLOBAL_CACHE_KEY_GEN_VERSION)
         if scope:
             root = os.path.join(root, scope)
-        self._root = root
-        safe_mkdir(self._root)
+        self._store = self.FINGERPRINT_STORES[fingerprint_store](root)
 
     def previous_key(self, cache_key):
         """If there was a previous successful build for the given key, return the previous key.
@@ -189,42 +253,29 @@ class BuildInvalidator:
     def update(self, cache_key):
         """Makes cache_key the valid version of the corresponding target set.
 
+        The update may be buffered until the next call to `flush`, but is immediately visible to
+        this invalidator.
+
         :param cache_key: A CacheKey object (typically returned by CacheKeyGenerator.key_for()).
         """
         if self.cacheable(cache_key):
-            self._write_sha(cache_key)
+            self._store.put(cache_key.id, cache_key.hash)
 
     def force_invalidate_all(self):
         """Force-invalidates all cached items."""
-        safe_mkdir(self._root, clean=True)
+        self._store.clear()
 
     def force_invalidate(self, cache_key):
-        """Force-invalidate the cached item."""
-        try:
-            if self.cacheable(cache_key):
-                os.unlink(self._sha_file(cache_key))
-        except OSError as e:
-            if e.errno != errno.ENOENT:
-                raise
+        """Force-invalidate the cached item.
 
-    def _sha_file(self, cache_key):
-        return self._sha_file_by_id(cache_key.id)
-
-    def _sha_file_by_id(self, id):
-        return os.path.join(self._root, safe_filename(id, extension=".hash"))
+        As with `update`, the invalidation may be buffered until the next call to `flush`.
+        """
+        if self.cacheable(cache_key):
+            self._store.delete(cache_key.id)
 
-    def _write_sha(self, cache_key):
-        with open(self._sha_file(cache_key), "w") as fd:
-            fd.write(cache_key.hash)
+    def flush(self):
+        """Persists any buffered updates and invalidations."""
+        self._store.flush()
 
     def _read_sha(self, cache_key):
-        return self._read_sha_by_id(cache_key.id)
-
-    def _read_sha_by_id(self, id):
-        try:
-            with open(self._sha_file_by_id(id), "r") as fd:
-                return fd.read().strip()
-        except IOError as e:
-            if e.errno != errno.ENOENT:
-                raise
-            return None  # File doesn't exist.
+        return self._store.get(cache_key.id)
@@ -318,6 +318,7 @@ class InvalidationCacheManager:
             self._invalidator.update(vts.cache_key)
             vts.valid = True
             self._artifact_write_callback(vts)
+        self._invalidator.flush()
 
     def force_invalidate(self, vts):
         """Force invalidation of a VersionedTargetSet."""
@@ -326,6 +327,8 @@ class InvalidationCacheManager:
             vt.valid = False
         self._invalidator.force_invalidate(vts.cache_key)
         vts.valid = False
+        # Invalidations must be durable before the caller goes on to mutate any results.
+        self._invalidator.flush()
 
     def check(self, targets, topological_order=False):
         """Checks whether each of the targets has changed and invalidates it if so.
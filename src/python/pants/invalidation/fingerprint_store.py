@@ -0,0 +1,196 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import errno
+import os
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Set, Tuple
+
+from pants.fs.fs import safe_filename
+from pants.util.dirutil import safe_delete, safe_mkdir
+from pants.util.record_log import RecordLog
+
+
+class FingerprintStore(ABC):
+    """A persistent map from a cache key id to the hash of its last successful build.
+
+    Mutations may be buffered in memory until `flush` is called, but must always be visible to
+    subsequent reads through the same store.
+    """
+
+    def __init__(self, root: str) -> None:
+        """
+        :param root: The directory this store keeps its fingerprints in.
+        """
+        self._root = root
+        safe_mkdir(self._root)
+
+    @property
+    def root(self) -> str:
+        return self._root
+
+    @abstractmethod
+    def get(self, id: str) -> Optional[str]:
+        """Return the recorded hash for the given id, or `None` if there is none."""
+
+    @abstractmethod
+    def put(self, id: str, hash: str) -> None:
+        """Record the given hash for the given id."""
+
+    @abstractmethod
+    def delete(self, id: str) -> None:
+        """Remove any recorded hash for the given id."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove all recorded hashes, including those of stores nested under this store's root."""
+
+    def flush(self) -> None:
+        """Persist any buffered mutations."""
+
+
+class DirectoryFingerprintStore(FingerprintStore):
+    """Stores each fingerprint in its own `<id>.hash` file under the root directory."""
+
+    def get(self, id):
+        try:
+            with open(self._hash_file(id), "r") as fd:
+                return fd.read().strip()
+        except IOError as e:
+            if e.errno != errno.ENOENT:
+                raise
+            return None  # File doesn't exist.
+
+    def put(self, id, hash):
+        with open(self._hash_file(id), "w") as fd:
+            fd.write(hash)
+
+    def delete(self, id):
+        safe_delete(self._hash_file(id))
+
+    def clear(self):
+        safe_mkdir(self._root, clean=True)
+
+    def _hash_file(self, id):
+        return os.path.join(self._root, safe_filename(id, extension=".hash"))
+
+
+class LogFingerprintStore(FingerprintStore):
+    """Stores all fingerprints in a single append-only log under the root directory.
+
+    The log is read in one bulk read the first time it is consulted, and buffered mutations are
+    appended to it in one write per `flush`. A record torn by a crash mid-write is ignored on the
+    next load rather than mistaken for a valid fingerprint.
+
+    Fingerprints left behind by a `DirectoryFingerprintStore` in the same root are read on demand
+    and migrated into the log as they are encountered.
+
+    A store may be used from many threads, such as those of a compile's worker pool.
+    """
+
+    LOG_FILE_NAME = "fingerprints.log"
+
+    # The log is rewritten with only its live records on load once it holds at least this many
+    # records and at least `_COMPACTION_RATIO` times as many records as live entries.
+    _COMPACTION_MIN_RECORDS = 1024
+    _COMPACTION_RATIO = 2
+
+    _TOMBSTONE = ""
+
+    # All stores live in this process, so that clearing a root can reset the in-memory state of
+    # stores nested under it.
+    _live_stores: "weakref.WeakSet[LogFingerprintStore]" = weakref.WeakSet()
+
+    def __init__(self, root: str) -> None:
+        super().__init__(root)
+        # Reentrant, since a `get` may migrate a legacy hash with a `put`.
+        self._lock = threading.RLock()
+        self._reset()
+        self._live_stores.add(self)
+
+    def _reset(self) -> None:
+        self._log = RecordLog(os.path.join(self._root, self.LOG_FILE_NAME))
+        self._entries: Optional[Dict[str, str]] = None
+        self._legacy_files: Set[str] = set()
+        self._legacy_files_to_remove: Set[str] = set()
+        self._pending: List[Tuple[str, str]] = []
+
+    def get(self, id):
+        with self._lock:
+            entries = self._load()
+            hash = entries.get(id)
+            if hash is None and self._legacy_files:
+                hash = self._migrate_legacy_hash(id)
+            return hash
+
+    def put(self, id, hash):
+        with self._lock:
+            self._load()[id] = hash
+            self._forget_legacy_hash(id)
+            self._pending.append((id, hash))
+
+    def delete(self, id):
+        with self._lock:
+            recorded = self._load().pop(id, None) is not None
+            if self._forget_legacy_hash(id) or recorded:
+                self._pending.append((id, self._TOMBSTONE))
+
+    def clear(self):
+        root = os.path.join(self._root, "")
+        for store in list(self._live_stores):
+            if os.path.join(store.root, "").startswith(root):
+                with store._lock:
+                    store._reset()
+        with self._lock:
+            safe_mkdir(self._root, clean=True)
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, []
+            legacy_files_to_remove, self._legacy_files_to_remove = (
+                self._legacy_files_to_remove,
+                set(),
+            )
+            # Appended under the lock, so that the records of concurrent flushes are logged in the
+            # order they were made.
+            if pending:
+                self._log.append(pending)
+        for legacy_file in legacy_files_to_remove:
+            safe_delete(os.path.join(self._root, legacy_file))
+
+    def _load(self) -> Dict[str, str]:
+        if self._entries is not None:
+            return self._entries
+
+        records = self._log.load_compacted(
+            key_fn=lambda record: record[0] if len(record) == 2 else None,
+            live_fn=lambda record: record[1] != self._TOMBSTONE,
+            min_compaction_records=self._COMPACTION_MIN_RECORDS,
+            compaction_ratio=self._COMPACTION_RATIO,
+        )
+        entries = {id: hash for id, hash in records.values()}
+        self._entries = entries
+
+        if os.path.isdir(self._root):
+            self._legacy_files = {name for name in os.listdir(self._root) if name.endswith(".hash")}
+        return entries
+
+    def _migrate_legacy_hash(self, id: str) -> Optional[str]:
+        legacy_file = safe_filename(id, extension=".hash")
+        if legacy_file not in self._legacy_files:
+            return None
+        with open(os.path.join(self._root, legacy_file), "r") as fd:
+            hash = fd.read().strip()
+        self.put(id, hash)
+        return hash
+
+    def _forget_legacy_hash(self, id: str) -> bool:
+        if self._legacy_files:
+            legacy_file = safe_filename(id, extension=".hash")
+            if legacy_file in self._legacy_files:
+                self._legacy_files.discard(legacy_file)
+                self._legacy_files_to_remove.add(legacy_file)
+                return True
+        return False
@@ -61,6 +61,11 @@ class NailgunExecutor(Executor, FingerprintedProcessManager):
 
     If a nailgun is not available for a given set of jvm args and classpath, one is launched and re-
     used for the given jvm args and classpath on subsequent runs.
+
+    Up to `pool_size` nailguns are kept running for an identity, each for a different set of jvm
+    args and classpath, so that alternating between them does not restart a JVM (and lose its JIT
+    warmup) every time. When none of them match and the pool is full, the nailgun that was least
+    recently used, by this or an earlier run, is replaced.
     """
 
     # 'NGServer 0.9.1 started on 127.0.0.1, port 53785.'
@@ -78,6 +83,9 @@ class NailgunExecutor(Executor, FingerprintedProcessManager):
     _NAILGUN_SPAWN_LOCK = threading.Lock()
     _PROCESS_NAME = "java"
 
+    # The metadata key under which the time that a nailgun was last used is recorded.
+    _LAST_USED_KEY = "last_used"
+
     def __init__(
         self,
         identity,
@@ -88,6 +96,7 @@ class NailgunExecutor(Executor, FingerprintedProcessManager):
         connect_timeout=10,
         connect_attempts=5,
         metadata_base_dir=None,
+        pool_size=1,
     ):
         Executor.__init__(self, distribution=distribution)
         FingerprintedProcessManager.__init__(
@@ -102,20 +111,74 @@ class NailgunExecutor(Executor, FingerprintedProcessManager):
                 "Workdir must be a path string, not: {workdir}".format(workdir=workdir)
             )
 
+        if pool_size < 1:
+            raise ValueError("The nailgun pool size must be at least 1, not: {}".format(pool_size))
+
         self._identity = identity
         self._workdir = workdir
-        self._ng_stdout = os.path.join(workdir, "stdout")
-        self._ng_stderr = os.path.join(workdir, "stderr")
         self._nailgun_classpath = ensure_str_list(nailgun_classpath)
         self._startup_timeout = startup_timeout
         self._connect_timeout = connect_timeout
         self._connect_attempts = connect_attempts
+        self._pool_size = pool_size
+        self._use_slot(0)
 
     def __str__(self):
         return "NailgunExecutor({identity}, dist={dist}, pid={pid} socket={socket})".format(
             identity=self._identity, dist=self._distribution, pid=self.pid, socket=self.socket
         )
 
+    def _use_slot(self, slot):
+        """Points this executor at the nailgun in the given slot of its pool.
+
+        The first slot is named after the identity alone, like the single nailgun that was used
+        before pooling, so that a running nailgun is picked up across the change.
+        """
+        name = self._identity if slot == 0 else "{}_{}".format(self._identity, slot)
+        slot_workdir = self._workdir if slot == 0 else os.path.join(self._workdir, str(slot))
+        self._name = name.lower().strip()
+        self._process = None
+        self._ng_stdout = os.path.join(slot_workdir, "stdout")
+        self._ng_stderr = os.path.join(slot_workdir, "stderr")
+
+    def _choose_slot(self, fingerprint):
+        """Returns the slot of the nailgun to use for the given fingerprint.
+
+        This is the slot of a live nailgun with that fingerprint if there is one, or else an empty
+        slot, or else the slot of the least recently used nailgun.
+        """
+        if self._pool_size == 1:
+            return 0
+        empty_slot = None
+        last_used_by_slot = {}
+        for slot in range(self._pool_size):
+            self._use_slot(slot)
+            if not self.is_alive():
+                if empty_slot is None:
+                    empty_slot = slot
+                continue
+            if self.has_current_fingerprint(fingerprint):
+                return slot
+            last_used_by_slot[slot] = (
+                self.read_metadata_by_name(self.name, self._LAST_USED_KEY, float) or 0.0
+            )
+        if empty_slot is not None:
+            return empty_slot
+        return min(last_used_by_slot, key=lambda slot: last_used_by_slot[slot])
+
+    def _record_use(self):
+        self.write_metadata_by_name(self.name, self._LAST_USED_KEY, str(time.time()))
+
+    def _is_connectable(self, nailgun):
+        """Returns True if the given client can connect to its nailgun, which health-checks a
+        nailgun that we did not just spawn."""
+        try:
+            with closing(nailgun.try_connect()):
+                return True
+        except nailgun.NailgunConnectionError as e:
+            logger.debug("Could not connect to nailgun {}: {}".format(self._name, e))
+            return False
+
     def _create_owner_arg(self, workdir):
         # Currently the owner is identified via the full path to the workdir.
         return "=".join((self._PANTS_OWNER_ARG_PREFIX, workdir))
@@ -206,22 +269,35 @@ class NailgunExecutor(Executor, FingerprintedProcessManager):
         new_fingerprint = self._fingerprint(jvm_options, classpath, self._distribution.version)
 
         with self._NAILGUN_SPAWN_LOCK:
+            self._use_slot(self._choose_slot(new_fingerprint))
             running, updated = self._check_nailgun_state(new_fingerprint)
 
-            if running and updated:
+            if running and not updated:
+                client = self._create_ngclient(
+                    port=self.socket, stdout=stdout, stderr=stderr, stdin=stdin
+                )
+                if self._is_connectable(client):
+                    self._record_use()
+                    return client
                 logger.debug(
-                    "Found running nailgun server that needs updating, killing {server}".format(
-                        server=self._identity
+                    "Found running nailgun server that is not connectable, killing {server}".format(
+                        server=self._name
                     )
                 )
                 self.terminate()
-
-            if (not running) or (running and updated):
-                return self._spawn_nailgun_server(
-                    new_fingerprint, jvm_options, classpath, stdout, stderr, stdin
+            elif running and updated:
+                logger.debug(
+                    "Found running nailgun server that needs updating, killing {server}".format(
+                        server=self._name
+                    )
                 )
+                self.terminate()
 
-        return self._create_ngclient(port=self.socket, stdout=stdout, stderr=stderr, stdin=stdin)
+            client = self._spawn_nailgun_server(
+                new_fingerprint, jvm_options, classpath, stdout, stderr, stdin
+            )
+            self._record_use()
+            return client
 
     class InitialNailgunConnectTimedOut(Exception):
         _msg_fmt = """Failed to read nailgun output after {timeout} seconds!
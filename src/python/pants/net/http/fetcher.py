@@ -9,8 +9,7 @@ import tempfile
 import time
 from abc import ABC, abstractmethod
 from contextlib import closing, contextmanager
-
-import requests
+from http import HTTPStatus
 
 from pants.util.dirutil import safe_open
 from pants.util.strutil import strip_prefix
@@ -203,7 +202,11 @@ class Fetcher:
         :param requests_api: An optional requests api-like object.
         """
         self._root_dir = root_dir
-        self._requests = requests_api or requests
+        if requests_api is None:
+            import requests
+
+            requests_api = requests
+        self._requests = requests_api
 
     class _Response(ABC):
         """Abstracts a fetch response."""
@@ -238,13 +241,13 @@ class Fetcher:
             """Close the underlying fetched file stream."""
 
     class _RequestsResponse(_Response):
-        _TRANSIENT_EXCEPTION_TYPES = (requests.ConnectionError, requests.Timeout)
-
         @classmethod
         def as_fetcher_error(cls, url, e):
+            import requests
+
             exception_factory = (
                 Fetcher.TransientError
-                if isinstance(e, cls._TRANSIENT_EXCEPTION_TYPES)
+                if isinstance(e, (requests.ConnectionError, requests.Timeout))
                 else Fetcher.PermanentError
             )
             return exception_factory("Problem GETing data from {}: {}".format(url, e))
@@ -267,6 +270,8 @@ class Fetcher:
             return int(size) if size else None
 
         def iter_content(self, chunk_size_bytes):
+            import requests
+
             try:
                 return self._resp.iter_content(chunk_size=chunk_size_bytes)
             except requests.RequestException as e:
@@ -281,7 +286,7 @@ class Fetcher:
 
         @property
         def status_code(self):
-            return requests.codes.ok
+            return HTTPStatus.OK.value
 
         @property
         def size(self):
@@ -326,6 +331,8 @@ class Fetcher:
             except IOError as e:
                 raise self.PermanentError("Problem reading data from {}: {}".format(path, e))
         else:
+            import requests
+
             try:
                 resp = self._requests.get(
                     url, stream=True, timeout=timeout_secs, allow_redirects=True
@@ -350,7 +357,7 @@ class Fetcher:
         timeout_secs = timeout_secs or 1.0
 
         with closing(self._fetch(url, timeout_secs=timeout_secs)) as resp:
-            if resp.status_code != requests.codes.ok:
+            if resp.status_code != HTTPStatus.OK:
                 listener.status(resp.status_code)
                 raise self.PermanentError(
                     "Fetch of {} failed with status code {}".format(url, resp.status_code),
@@ -6,10 +6,12 @@ import getpass
 import io
 import itertools
 import os
+import pickle
 import re
+import sys
 from abc import ABC, abstractmethod
 from contextlib import contextmanager
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from functools import partial
 from hashlib import sha1
 from pathlib import PurePath
@@ -20,6 +22,7 @@ from typing_extensions import Literal
 
 from pants.base.build_environment import get_buildroot, get_pants_cachedir, get_pants_configdir
 from pants.option.ranked_value import Value
+from pants.util.dirutil import safe_concurrent_creation, safe_mkdir_for
 from pants.util.eval import parse_expression
 from pants.util.ordered_set import OrderedSet
 
@@ -44,6 +47,12 @@ class Config(ABC):
     class ConfigValidationError(ConfigError):
         pass
 
+    # The name of the directory under the pants cachedir that holds parsed TOML config files.
+    TOML_CACHE_DIR_NAME = "config_cache"
+
+    # The parsed contents of TOML config files, by the digest of their contents.
+    _toml_cache: ClassVar[Dict[str, Dict[str, Any]]] = {}
+
     @classmethod
     def load_file_contents(
         cls, file_contents, *, seed_values: Optional[SeedValues] = None,
@@ -98,7 +107,7 @@ class Config(ABC):
 
             config_values: _ConfigValues
             if PurePath(config_path).suffix == ".toml":
-                toml_values = cast(Dict[str, Any], toml.loads(content.decode()))
+                toml_values = cls._parse_toml(content, content_digest)
                 toml_values["DEFAULT"] = {
                     **normalized_seed_values,
                     **toml_values.get("DEFAULT", {}),
@@ -116,6 +125,36 @@ class Config(ABC):
             )
         return _ChainedConfig(tuple(reversed(single_file_configs)))
 
+    @classmethod
+    def _parse_toml(cls, content: bytes, content_digest: str) -> Dict[str, Any]:
+        """Returns the parsed contents of a TOML config file.
+
+        Parsing TOML is a large part of the cost of bootstrapping options, and every run parses the
+        same few files at least twice. Parses are cached in memory and on disk under the pants
+        cachedir, keyed by the digest of the file contents, so that only new or edited config files
+        are parsed. Failing to read or write the on-disk cache falls back to parsing.
+
+        :returns: A new top-level dict, which the caller may modify. Nested values are shared.
+        """
+        key = "{}-{}-py{}{}".format(content_digest, toml.__version__, *sys.version_info[:2])
+        parsed = cls._toml_cache.get(key)
+        if parsed is None:
+            cache_path = os.path.join(get_pants_cachedir(), cls.TOML_CACHE_DIR_NAME, key)
+            try:
+                with open(cache_path, "rb") as fh:
+                    parsed = cast(Dict[str, Any], pickle.load(fh))
+            except Exception:
+                parsed = cast(Dict[str, Any], toml.loads(content.decode()))
+                try:
+                    safe_mkdir_for(cache_path)
+                    with safe_concurrent_creation(cache_path) as tmp_path:
+                        with open(tmp_path, "wb") as fh:
+                            pickle.dump(parsed, fh, protocol=pickle.HIGHEST_PROTOCOL)
+                except OSError:
+                    pass
+            cls._toml_cache[key] = parsed
+        return dict(parsed)
+
     @staticmethod
     def _determine_seed_values(*, seed_values: Optional[SeedValues] = None) -> Dict[str, str]:
         """We pre-populate several default values to allow %([key-name])s interpolation.
@@ -269,6 +308,10 @@ _TomlValue = Union[_TomlPrimitve, List[_TomlPrimitve]]
 class _TomlValues(_ConfigValues):
     values: Dict[str, Any]
 
+    # Options are looked up many times while bootstrapping, and `values` is never modified once
+    # constructed, so lookups are memoized here.
+    _memo: Dict[Any, Any] = field(default_factory=dict, init=False, repr=False, compare=False)
+
     @staticmethod
     def _is_an_option(option_value: Union[_TomlValue, Dict]) -> bool:
         """Determine if the value is actually an option belonging to that section.
@@ -432,6 +475,19 @@ class _TomlValues(_ConfigValues):
             return True
 
     def get_value(self, section: str, option: str) -> Optional[str]:
+        key = ("get_value", section, option)
+        if key not in self._memo:
+            try:
+                self._memo[key] = (self._compute_value(section, option), None)
+            except (configparser.NoSectionError, configparser.NoOptionError) as e:
+                self._memo[key] = (None, (type(e), e.args))
+        value, error = self._memo[key]
+        if error is not None:
+            error_type, error_args = error
+            raise error_type(*error_args)
+        return cast(Optional[str], value)
+
+    def _compute_value(self, section: str, option: str) -> Optional[str]:
         section_values = self._find_section_values(section)
         if section_values is None:
             raise configparser.NoSectionError(section)
@@ -476,10 +532,12 @@ class _TomlValues(_ConfigValues):
 
     @property
     def defaults(self) -> Mapping[str, str]:
-        return {
-            option: self._stringify_val_without_interpolation(option_val)
-            for option, option_val in self.values["DEFAULT"].items()
-        }
+        if "defaults" not in self._memo:
+            self._memo["defaults"] = {
+                option: self._stringify_val_without_interpolation(option_val)
+                for option, option_val in self.values["DEFAULT"].items()
+            }
+        return cast(Mapping[str, str], self._memo["defaults"])
 
 
 @dataclass(frozen=True)
@@ -2,6 +2,8 @@
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
 import configparser
+import os
+import unittest.mock
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from enum import Enum
@@ -12,7 +14,7 @@ import pytest
 
 from pants.option.config import Config, TomlSerializer
 from pants.testutil.test_base import TestBase
-from pants.util.contextutil import temporary_file
+from pants.util.contextutil import environment_as, temporary_dir, temporary_file
 from pants.util.enums import match
 from pants.util.ordered_set import OrderedSet
 
@@ -430,3 +432,38 @@ def test_toml_serializer() -> None:
         "cache": {"java": {"o": ""}},
         "inception": {"nested": {"nested-again": {"one-more": {"o": ""}}}},
     }
+
+
+def test_toml_parse_cache() -> None:
+    content = dedent(
+        """\
+        [DEFAULT]
+        name = "foo"
+
+        [a]
+        list = ["%(name)s", "bar"]
+        """
+    )
+    with temporary_dir() as cache_home, environment_as(XDG_CACHE_HOME=cache_home):
+        with temporary_file(binary_mode=False, suffix=".toml") as config_file:
+            config_file.write(content)
+            config_file.close()
+
+            def load() -> Config:
+                return Config.load([config_file.name], seed_values={"buildroot": "/buildroot"})
+
+            with unittest.mock.patch.dict(Config._toml_cache, clear=True):
+                assert load().get_value("a", "list") == '["foo", "bar"]'
+                assert len(os.listdir(os.path.join(cache_home, "pants", "config_cache"))) == 1
+
+            # A new process reads the parse from disk rather than parsing again.
+            with unittest.mock.patch.dict(Config._toml_cache, clear=True), unittest.mock.patch(
+                "toml.loads", side_effect=AssertionError("should not be called")
+            ):
+                config = load()
+                assert config.get_value("a", "list") == '["foo", "bar"]'
+                assert config.get_value("a", "name") == "foo"
+                with pytest.raises(configparser.NoOptionError):
+                    config.get_value("a", "missing")
+                with pytest.raises(configparser.NoOptionError):
+                    config.get_value("a", "missing")
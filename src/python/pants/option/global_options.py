@@ -422,6 +422,17 @@ class GlobalOptions(Subsystem):
             "This does not affect any other filesystem operations. "
             "Patterns use the gitignore pattern syntax (https://git-scm.com/docs/gitignore).",
         )
+        register(
+            "--build-file-parse-cache",
+            advanced=True,
+            type=bool,
+            default=False,
+            help="Keep the parses of BUILD files on disk, and reuse them in later runs for the BUILD "
+            "files whose contents have not changed. This speeds up graph construction in runs "
+            "without pantsd. Only enable this if no BUILD file macro or object reads files other "
+            "than the BUILD file being parsed, as such a parse will not be redone when only those "
+            "files change.",
+        )
         register(
             "--pants-ignore",
             advanced=True,
@@ -631,6 +642,16 @@ class GlobalOptions(Subsystem):
             default=None,
             help="The directory to log pantsd output to.",
         )
+        register(
+            "--pantsd-fs-event-quiet-period",
+            advanced=True,
+            type=float,
+            default=0.05,
+            help="The length of time (in seconds) pantsd waits for further filesystem events after "
+            "receiving one, so that a burst of events (such as from a `git checkout`) invalidates "
+            "the graph in a single batch. Batching stops after a few seconds even if events keep "
+            "arriving.",
+        )
         register(
             "--pantsd-invalidation-globs",
             advanced=True,
@@ -6,7 +6,7 @@ from collections import defaultdict
 from hashlib import sha1
 
 from pants.base.build_environment import get_buildroot
-from pants.base.hash_utils import CoercingEncoder, json_hash
+from pants.base.hash_utils import CoercingEncoder, hash_files, json_hash
 from pants.option.custom_types import (
     UnsetBool,
     dict_with_files_option,
@@ -126,11 +126,7 @@ class OptionsFingerprinter:
             return filepath
 
     def _fingerprint_dirs(self, dirpaths, topdown=True, onerror=None, followlinks=False):
-        """Returns a fingerprint of the given file directories and all their sub contents.
-
-        This assumes that the file directories are of reasonable size to cause memory or performance
-        issues.
-        """
+        """Returns a fingerprint of the given file directories and all their sub contents."""
         # Note that we don't sort the dirpaths, as their order may have meaning.
         filepaths = []
         for dirpath in dirpaths:
@@ -146,17 +142,13 @@ class OptionsFingerprinter:
         return self._fingerprint_files(filepaths)
 
     def _fingerprint_files(self, filepaths):
-        """Returns a fingerprint of the given filepaths and their contents.
-
-        This assumes the files are small enough to be read into memory.
-        """
+        """Returns a fingerprint of the given filepaths and their contents."""
         hasher = sha1()
+        filepaths = [self._assert_in_buildroot(filepath) for filepath in filepaths]
         # Note that we don't sort the filepaths, as their order may have meaning.
-        for filepath in filepaths:
-            filepath = self._assert_in_buildroot(filepath)
+        for filepath, file_digest in zip(filepaths, hash_files(filepaths, memoize=True)):
             hasher.update(os.path.relpath(filepath, get_buildroot()).encode())
-            with open(filepath, "rb") as f:
-                hasher.update(f.read())
+            hasher.update(file_digest.encode())
         return hasher.hexdigest()
 
     def _fingerprint_primitives(self, val):
@@ -26,9 +26,6 @@ from typing import (
     Union,
 )
 
-import Levenshtein
-import yaml
-
 from pants.base.build_environment import get_buildroot
 from pants.base.deprecated import validate_deprecation_semver, warn_or_error
 from pants.option.config import Config
@@ -327,6 +324,8 @@ class Parser:
     ):
         """Identify similar option names to unconsumed flags and raise a ParseError with those
         names."""
+        import Levenshtein
+
         matching_flags = {}
         for flag_name in flag_value_map.keys():
             # We will be matching option names without their leading hyphens, in order to capture both
@@ -661,6 +660,8 @@ class Parser:
                 if val_or_str.startswith("@@"):  # Support a literal @ for fromfile values via @@.
                     return val_or_str[1:]
                 else:
+                    import yaml
+
                     fromfile = val_or_str[1:]
                     try:
                         with open(fromfile, "r") as fp:
@@ -101,42 +101,60 @@ class ExclusiveRequestTimeout(Exception):
 
 
 class PailgunHandleRequestLock:
-    """Convenience lock to implement Lock.acquire(timeout), which is not available in Python 2."""
+    """A lock that is granted to requests in the order in which they asked for it.
 
-    # TODO(#6071): remove and replace for the py3 Lock() when we don't have to support py2 anymore.
+    A request takes a ticket on arrival and is granted the lock once every earlier ticket has been
+    served or abandoned, so a request waiting behind a long run is not overtaken by later arrivals
+    that happen to ask just as the lock is released.
+    """
 
     def __init__(self):
-        self.cond = threading.Condition()
-        self.available = True
-
-    def acquire(self, timeout=0.0):
-        """Try to acquire the lock, blocking until the timeout is reached. Will return immediately
-        if the lock is acquired.
+        self._cond = threading.Condition()
+        self._next_ticket = 0
+        self._serving = 0
+        self._abandoned = set()
+
+    def take_ticket(self):
+        """Returns a ticket for the lock, to pass to `acquire`."""
+        with self._cond:
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            return ticket
+
+    def waiting_ahead_of(self, ticket):
+        """Returns the number of requests holding or waiting for the lock ahead of the ticket."""
+        with self._cond:
+            return ticket - self._serving - sum(1 for t in self._abandoned if t < ticket)
+
+    def acquire(self, ticket, timeout=0.0):
+        """Try to acquire the lock for the ticket, blocking until the timeout is reached. Will return
+        immediately if the lock is acquired.
 
         :return True if the lock was acquired, False if the timeout was reached.
         """
-        self.cond.acquire()
-        if self.available:
-            self.available = False
-            self.cond.release()
-            return True
-        else:
-            self.cond.wait(timeout=timeout)
-            # We have the lock!
-            if not self.available:
-                self.cond.release()
-                return False
+        with self._cond:
+            return self._cond.wait_for(lambda: self._serving == ticket, timeout=timeout)
+
+    def abandon(self, ticket):
+        """Gives up a ticket that has not acquired the lock, so that later tickets need not wait for
+        it."""
+        with self._cond:
+            if ticket == self._serving:
+                self._advance()
             else:
-                self.available = False
-                self.cond.release()
-                return True
+                self._abandoned.add(ticket)
 
     def release(self):
         """Release the lock."""
-        self.cond.acquire()
-        self.available = True
-        self.cond.notify()
-        self.cond.release()
+        with self._cond:
+            self._advance()
+
+    def _advance(self):
+        self._serving += 1
+        while self._serving in self._abandoned:
+            self._abandoned.remove(self._serving)
+            self._serving += 1
+        self._cond.notify_all()
 
 
 class PailgunServer(ThreadingMixIn, TCPServer):
@@ -250,7 +268,7 @@ class PailgunServer(ThreadingMixIn, TCPServer):
         """Ensure that this is the only pants running.
 
         We currently don't allow parallel pants runs, so this function blocks a request thread until
-        there are no more requests being handled.
+        the requests that arrived before it have been handled.
         """
         # TODO add `did_poll` to pantsd metrics
 
@@ -270,24 +288,28 @@ class PailgunServer(ThreadingMixIn, TCPServer):
         time_polled = 0.0
         user_notification_interval = 5.0  # Stop polling to notify the user every second.
         self.logger.debug(f"request {request} is trying to acquire the request lock.")
+        ticket = self.free_to_handle_request_lock.take_ticket()
 
         # NB: Optimistically try to acquire the lock without blocking, in case we are the only request being handled.
         # This could be merged into the `while` loop below, but separating this special case for logging helps.
-        if self.free_to_handle_request_lock.acquire(timeout=0):
+        if self.free_to_handle_request_lock.acquire(ticket, timeout=0):
             with yield_and_release(time_polled):
                 yield
-        else:
+            return
+
+        try:
             self.logger.debug(
                 f"request {request} didn't acquire the lock on the first try, polling..."
             )
-            # We have to wait for another request to finish being handled.
+            # We have to wait for the requests ahead of us to finish being handled.
             self._send_stderr(
                 request,
-                "Another pants invocation is running. "
+                "Another pants invocation is running{}. "
                 "Will wait {} for it to finish before giving up.\n".format(
+                    self._waiting_message(ticket),
                     "forever"
                     if self._should_poll_forever(timeout)
-                    else "up to {} seconds".format(timeout)
+                    else "up to {} seconds".format(timeout),
                 ),
             )
             self._send_stderr(
@@ -296,19 +318,31 @@ class PailgunServer(ThreadingMixIn, TCPServer):
                 "press Ctrl-C and run this command with PANTS_CONCURRENT=True "
                 "in the environment.\n",
             )
-            while not self.free_to_handle_request_lock.acquire(timeout=user_notification_interval):
+            while not self.free_to_handle_request_lock.acquire(
+                ticket, timeout=user_notification_interval
+            ):
                 time_polled += user_notification_interval
                 if self._should_keep_polling(timeout, time_polled):
                     self._send_stderr(
                         request,
-                        f"Waiting for invocation to finish (waited for {time_polled}s so far)...\n",
+                        f"Waiting for invocation to finish{self._waiting_message(ticket)} "
+                        f"(waited for {time_polled}s so far)...\n",
                     )
                 else:  # We have timed out.
                     raise ExclusiveRequestTimeout(
                         "Timed out while waiting for another pants invocation to finish."
                     )
-            with yield_and_release(time_polled):
-                yield
+        except BaseException:
+            self.free_to_handle_request_lock.abandon(ticket)
+            raise
+        with yield_and_release(time_polled):
+            yield
+
+    def _waiting_message(self, ticket):
+        ahead = self.free_to_handle_request_lock.waiting_ahead_of(ticket)
+        if ahead <= 1:
+            return ""
+        return " ({} invocations are ahead of this one)".format(ahead)
 
     def process_request_thread(self, request, client_address):
         """Override of ThreadingMixIn.process_request_thread() that delegates to the request
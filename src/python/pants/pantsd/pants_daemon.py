@@ -227,6 +227,7 @@ class PantsDaemon(FingerprintedProcessManager):
                 ),
                 pantsd_pidfile=pidfile,
                 union_membership=union_membership,
+                fs_event_quiet_period=bootstrap_options.pantsd_fs_event_quiet_period,
             )
 
             pailgun_service = PailgunService(
@@ -6,7 +6,8 @@ import os
 import queue
 import sys
 import threading
-from typing import List, Optional, Set, Tuple, cast
+import time
+from typing import Dict, List, Optional, Set, Tuple, cast
 
 from pants.base.exiter import PANTS_SUCCEEDED_EXIT_CODE
 from pants.base.specs import Specs
@@ -29,6 +30,10 @@ class SchedulerService(PantsService):
 
     QUEUE_SIZE = 64
 
+    # The longest time to keep batching filesystem events while they continue to arrive, so that a
+    # steady stream of events cannot starve invalidation.
+    MAX_BATCH_WAIT = 2.0
+
     def __init__(
         self,
         *,
@@ -38,6 +43,7 @@ class SchedulerService(PantsService):
         invalidation_globs: List[str],
         pantsd_pidfile: Optional[str],
         union_membership: UnionMembership,
+        fs_event_quiet_period: float = 0.05,
     ) -> None:
         """
         :param fs_event_service: An unstarted FSEventService instance for setting up filesystem event handlers.
@@ -46,6 +52,8 @@ class SchedulerService(PantsService):
         :param invalidation_globs: A list of `globs` that when encountered in filesystem event
                                    subscriptions will tear down the daemon.
         :param pantsd_pidfile: The path to the pantsd pidfile for fs event monitoring.
+        :param fs_event_quiet_period: The time in seconds to wait for further filesystem events
+                                      before invalidating the files changed by a batch of them.
         """
         super().__init__()
         self._fs_event_service = fs_event_service
@@ -54,6 +62,7 @@ class SchedulerService(PantsService):
         self._build_root = build_root
         self._pantsd_pidfile = pantsd_pidfile
         self._union_membership = union_membership
+        self._fs_event_quiet_period = fs_event_quiet_period
 
         self._scheduler = legacy_graph_scheduler.scheduler
         # This session is only used for checking whether any invalidation globs have been invalidated.
@@ -66,6 +75,7 @@ class SchedulerService(PantsService):
         self._watchman_is_running = threading.Event()
         self._invalidating_snapshot = None
         self._invalidating_files: Set[str] = set()
+        self._invalidation_metrics = InvalidationMetrics()
 
         self._loop_condition = LoopCondition()
 
@@ -105,7 +115,7 @@ class SchedulerService(PantsService):
                 len(event["files"]), event["subscription"]
             )
         )
-        self._event_queue.put(event)
+        self._event_queue.put((time.time(), event))
 
     def _maybe_invalidate_scheduler_batch(self):
         new_snapshot = self._get_snapshot()
@@ -152,44 +162,99 @@ class SchedulerService(PantsService):
 
         self._maybe_invalidate_scheduler_batch()
 
-    def _process_event_queue(self):
-        """File event notification queue processor."""
+    def _next_event_batch(self):
+        """Returns the queued events, after waiting for the queue to be quiet.
+
+        Everything already queued is taken at once, however long it has waited. Waiting for the
+        queue to be quiet is bounded by `MAX_BATCH_WAIT` from when the first event is taken.
+
+        Each event in the returned list is a tuple of the time it was received and the event.
+        """
         try:
-            event = self._event_queue.get(timeout=0.05)
+            batch = [self._event_queue.get(timeout=0.05)]
         except queue.Empty:
-            return
+            return []
 
-        try:
-            subscription, is_initial_event, files = (
-                event["subscription"],
-                event["is_fresh_instance"],
-                event["files"],
-            )
-        except (KeyError, UnicodeDecodeError) as e:
-            self._logger.warning("%r raised by invalid watchman event: %s", e, event)
+        deadline = time.time() + self.MAX_BATCH_WAIT
+        while True:
+            try:
+                while True:
+                    batch.append(self._event_queue.get_nowait())
+            except queue.Empty:
+                pass
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return batch
+            try:
+                batch.append(
+                    self._event_queue.get(timeout=min(self._fs_event_quiet_period, remaining))
+                )
+            except queue.Empty:
+                return batch
+
+    def _process_event_queue(self):
+        """File event notification queue processor.
+
+        Events that arrive within the quiet period of one another are coalesced, so that their
+        changed files are invalidated together.
+        """
+        batch = self._next_event_batch()
+        if not batch:
             return
 
-        self._logger.debug(
-            "processing {} files for subscription {} (first_event={})".format(
-                len(files), subscription, is_initial_event
+        changed_files: Set[str] = set()
+        pidfile_changed = False
+        for _, event in batch:
+            try:
+                subscription, is_initial_event, files = (
+                    event["subscription"],
+                    event["is_fresh_instance"],
+                    event["files"],
+                )
+            except (KeyError, UnicodeDecodeError) as e:
+                self._logger.warning("%r raised by invalid watchman event: %s", e, event)
+                continue
+
+            self._logger.debug(
+                "processing {} files for subscription {} (first_event={})".format(
+                    len(files), subscription, is_initial_event
+                )
             )
-        )
 
-        # The first watchman event for all_files is a listing of all files - ignore it.
-        if (
-            not is_initial_event
-            and subscription == self._fs_event_service.PANTS_ALL_FILES_SUBSCRIPTION_NAME
-        ):
-            self._handle_batch_event(files)
+            # The first watchman event for all_files is a listing of all files - ignore it.
+            if (
+                not is_initial_event
+                and subscription == self._fs_event_service.PANTS_ALL_FILES_SUBSCRIPTION_NAME
+            ):
+                changed_files.update(files)
+
+            # However, we do want to check for the initial event in the pid file creation.
+            if subscription == self._fs_event_service.PANTS_PID_SUBSCRIPTION_NAME:
+                pidfile_changed = True
+
+        if changed_files:
+            start = time.time()
+            self._handle_batch_event(sorted(changed_files))
+            end = time.time()
+            self._invalidation_metrics.record_batch(
+                num_events=len(batch),
+                num_files=len(changed_files),
+                invalidation_secs=end - start,
+                latency_secs=end - batch[0][0],
+            )
 
-        # However, we do want to check for the initial event in the pid file creation.
-        if subscription == self._fs_event_service.PANTS_PID_SUBSCRIPTION_NAME:
+        if pidfile_changed:
             self._maybe_invalidate_scheduler_pidfile()
 
         if not self._watchman_is_running.is_set():
             self._watchman_is_running.set()
 
-        self._event_queue.task_done()
+        for _ in batch:
+            self._event_queue.task_done()
+
+    def invalidation_metrics(self) -> Dict[str, float]:
+        """Returns metrics about the batches of filesystem events processed by this service."""
+        return self._invalidation_metrics.get_all()
 
     def product_graph_len(self):
         """Provides the size of the captive product graph.
@@ -321,3 +386,41 @@ class LoopCondition:
             previous_iteration = self._iteration
             self._condition.wait(timeout)
             return previous_iteration != self._iteration
+
+
+class InvalidationMetrics:
+    """Tracks the sizes and latencies of the batches of files invalidated by the SchedulerService.
+
+    The latency of a batch is the time from the receipt of its first event to the end of its
+    invalidation, and so includes the time spent waiting for further events.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {
+            "fs_event_batches": 0,
+            "fs_events": 0,
+            "fs_event_files_invalidated": 0,
+            "fs_event_max_batch_files": 0,
+            "fs_event_invalidation_secs": 0.0,
+            "fs_event_max_latency_secs": 0.0,
+            "fs_event_last_latency_secs": 0.0,
+        }
+
+    def record_batch(self, num_events, num_files, invalidation_secs, latency_secs):
+        with self._lock:
+            self._metrics["fs_event_batches"] += 1
+            self._metrics["fs_events"] += num_events
+            self._metrics["fs_event_files_invalidated"] += num_files
+            self._metrics["fs_event_max_batch_files"] = max(
+                self._metrics["fs_event_max_batch_files"], num_files
+            )
+            self._metrics["fs_event_invalidation_secs"] += invalidation_secs
+            self._metrics["fs_event_max_latency_secs"] = max(
+                self._metrics["fs_event_max_latency_secs"], latency_secs
+            )
+            self._metrics["fs_event_last_latency_secs"] = latency_secs
+
+    def get_all(self):
+        with self._lock:
+            return dict(self._metrics)
@@ -63,12 +63,15 @@ async def find_owners(
     ]
 
     bfa = build_configuration.registered_aliases()
-    graph = _DependentGraph.from_iterable(
-        target_types_from_build_file_aliases(bfa), address_mapper, all_structs
+    graph = _DependentGraph.for_configuration(
+        target_types_from_build_file_aliases(bfa), address_mapper
     )
-    if changed_request.include_dependees == IncludeDependeesOption.DIRECT:
-        return ChangedAddresses(Addresses(graph.dependents_of_addresses(owners.addresses)))
-    return ChangedAddresses(Addresses(graph.transitive_dependents_of_addresses(owners.addresses)))
+    dependents = graph.updated_dependents_of_addresses(
+        all_structs,
+        owners.addresses,
+        transitive=changed_request.include_dependees == IncludeDependeesOption.TRANSITIVE,
+    )
+    return ChangedAddresses(Addresses(dependents))
 
 
 @dataclass(frozen=True)
@@ -1,26 +1,309 @@
 # Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
-from typing import Iterable, List
+import os
+import re
+from collections import defaultdict
+from typing import (
+    DefaultDict,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Pattern,
+    Sequence,
+    Set,
+    Tuple,
+)
 
 from pants.engine.fs import PathGlobs
 from pants.engine.native import Native
 from pants.source.wrapped_globs import Filespec
+from pants.util.memo import memoized
+
+
+class _UntranslatableGlob(Exception):
+    """Raised for a glob that uses syntax that `CompiledFilespec` does not translate."""
+
+
+def _translate_component(component: str) -> str:
+    """Translates a path component of a glob, other than `**`, into a regular expression."""
+    if "**" in component or any(c in component for c in "[]{}\\"):
+        raise _UntranslatableGlob(component)
+    return "".join("[^/]*" if c == "*" else "[^/]" if c == "?" else re.escape(c) for c in component)
+
+
+def _translate_include(glob: str) -> str:
+    """Translates an include glob into a regular expression, with the semantics of the `glob` crate
+    patterns that the engine matches paths against in memory."""
+    if glob.startswith(("/", "!")):
+        raise _UntranslatableGlob(glob)
+    # Like the engine, ignore empty and `.` components, and repeated `**` components.
+    components: List[str] = []
+    for component in glob.split("/"):
+        if component in ("", ".") or (component == "**" and components[-1:] == ["**"]):
+            continue
+        components.append(component)
+
+    regex = []
+    for i, component in enumerate(components):
+        is_last = i == len(components) - 1
+        if component == "**":
+            # Any number of directories, or anything at all at the end of the glob.
+            regex.append(".*" if is_last else "(?:.*/)?")
+        else:
+            regex.append(_translate_component(component) + ("" if is_last else "/"))
+    return "".join(regex)
+
+
+def _translate_exclude(glob: str) -> Optional[str]:
+    """Translates an exclude glob into a regular expression, with the semantics of the gitignore
+    patterns that the engine excludes files with.
+
+    Returns None for a glob that cannot exclude any file.
+    """
+    if glob.startswith(("#", "!", "\\")) or glob != glob.rstrip():
+        raise _UntranslatableGlob(glob)
+    is_anchored = glob.startswith("/")
+    if is_anchored:
+        glob = glob[1:]
+    if glob.endswith("/"):
+        # Only matches directories.
+        return None
+    if not glob:
+        return None
+    # A glob without a slash matches files of that name in any directory.
+    if not is_anchored and "/" not in glob and glob != "**":
+        glob = f"**/{glob}"
+    # A glob ending in `/**` only matches what is inside the directory.
+    if glob.endswith("/**"):
+        glob = f"{glob}/*"
+
+    components = glob.split("/")
+    regex = []
+    for i, component in enumerate(components):
+        is_first, is_last = i == 0, i == len(components) - 1
+        if component == "**":
+            if not is_first and components[i - 1] == "**":
+                raise _UntranslatableGlob(glob)
+            # Each of these includes the slashes that separate `**` from its neighbours.
+            if is_first and is_last:
+                regex.append(".*")
+            elif is_first:
+                regex.append("(?:/?|.*/)")
+            elif is_last:
+                regex.append("/.*")
+            else:
+                regex.append("(?:/|/.*/)")
+        else:
+            if not is_first and components[i - 1] != "**":
+                regex.append("/")
+            regex.append(_translate_component(component))
+    return "".join(regex)
+
+
+def _join_alternatives(regexes: Iterable[str]) -> Optional[Pattern]:
+    regexes = list(regexes)
+    if not regexes:
+        return None
+    return re.compile("|".join(f"(?:{regex})" for regex in regexes), re.DOTALL)
+
+
+class CompiledFilespec:
+    """The include and exclude globs of a filespec, compiled for matching many paths.
+
+    Globs are translated into a single regular expression for includes and another for excludes,
+    which match paths the same way as the engine's in-memory glob matching: includes with the
+    semantics of the `glob` crate, and excludes with those of gitignore files. This avoids a call
+    into the engine, which parses the globs anew, for every batch of paths.
+
+    Globs that use syntax that is not translated, such as character classes or escapes, are matched
+    by the engine instead.
+    """
+
+    def __init__(self, include: Sequence[str], exclude: Sequence[str]) -> None:
+        """
+        :param include: The globs to match.
+        :param exclude: The globs of paths not to match, even if they match an include glob.
+        """
+        self._include_globs = tuple(include)
+        self._exclude_globs = tuple(exclude)
+        try:
+            self._include = _join_alternatives(_translate_include(g) for g in include)
+            self._exclude = _join_alternatives(
+                regex for regex in (_translate_exclude(g) for g in exclude) if regex is not None
+            )
+            self._is_translated = True
+        except _UntranslatableGlob:
+            self._is_translated = False
+
+    def matches(self, path: str) -> bool:
+        """Returns True if the given path matches the filespec."""
+        return self.matches_any([path])
+
+    def matches_any(self, paths: Iterable[str]) -> bool:
+        """Returns True if any of the given paths matches the filespec."""
+        if not self._is_translated:
+            return self._engine_matches_any(paths)
+        return any(self._matches(path) for path in paths)
+
+    def filter(self, paths: Iterable[str]) -> List[str]:
+        """Returns those of the given paths that match the filespec, in order."""
+        if not self._is_translated:
+            return [path for path in paths if self._engine_matches_any([path])]
+        return [path for path in paths if self._matches(path)]
+
+    def _matches(self, path: str) -> bool:
+        if self._include is None or not self._include.fullmatch(path):
+            return False
+        # Like gitignore, excludes ignore a leading `./`.
+        if path.startswith("./"):
+            path = path[2:]
+        return self._exclude is None or not self._exclude.fullmatch(path)
+
+    def _engine_matches_any(self, paths: Iterable[str]) -> bool:
+        path_globs = PathGlobs(
+            globs=(*self._include_globs, *(f"!{e}" for e in self._exclude_globs))
+        )
+        return Native().match_path_globs(path_globs, paths)
+
+
+@memoized
+def _compile_globs(include: Tuple[str, ...], exclude: Tuple[str, ...]) -> CompiledFilespec:
+    return CompiledFilespec(include, exclude)
+
+
+def compile_filespec(spec: Filespec) -> CompiledFilespec:
+    """Returns the given filespec compiled for matching, which is cached for equal filespecs."""
+    exclude_patterns: List[str] = []
+    for exclude_spec in spec.get("exclude", []):
+        exclude_patterns.extend(exclude_spec["globs"])
+    return _compile_globs(tuple(spec["globs"]), tuple(exclude_patterns))
 
 
 def globs_matches(
     paths: Iterable[str], patterns: Iterable[str], exclude_patterns: Iterable[str],
 ) -> bool:
-    path_globs = PathGlobs(globs=(*patterns, *(f"!{e}" for e in exclude_patterns)))
-    return Native().match_path_globs(path_globs, paths)
+    return _compile_globs(tuple(patterns), tuple(exclude_patterns)).matches_any(paths)
 
 
 def matches_filespec(path: str, spec: Filespec) -> bool:
-    return any_matches_filespec([path], spec)
+    return compile_filespec(spec).matches(path)
 
 
 def any_matches_filespec(paths: Iterable[str], spec: Filespec) -> bool:
-    exclude_patterns: List[str] = []
-    for exclude_spec in spec.get("exclude", []):
-        exclude_patterns.extend(exclude_spec["globs"])
-    return globs_matches(paths, spec["globs"], exclude_patterns)
+    return compile_filespec(spec).matches_any(paths)
+
+
+# The characters that make a path component a glob pattern, rather than a literal name.
+_GLOB_CHARS = frozenset("*?[")
+
+
+def glob_literal_dir(glob: str) -> str:
+    """Returns the longest directory prefix of the given glob that has no wildcards.
+
+    Every path that the glob matches is under this directory.
+    """
+    # Like the engine, ignore empty and `.` components.
+    components = [component for component in glob.split("/") if component not in ("", ".")]
+    literal_components: List[str] = []
+    for component in components[:-1]:
+        if _GLOB_CHARS.intersection(component):
+            break
+        literal_components.append(component)
+    return "/".join(literal_components)
+
+
+class FilespecIndex:
+    """An index of the filespecs of many owners, such as targets, for finding the owners of paths.
+
+    Each of an owner's globs is filed in a trie of path components under the directory returned by
+    `glob_literal_dir`. A path is then only matched against the filespecs of the owners filed under
+    one of its ancestor directories, so finding the owners of many paths takes time proportional to
+    the number of paths rather than to the number of paths times the number of owners.
+    """
+
+    class _Node:
+        __slots__ = ("children", "owners")
+
+        def __init__(self) -> None:
+            self.children: Dict[str, "FilespecIndex._Node"] = {}
+            self.owners: Set[Hashable] = set()
+
+    def __init__(self) -> None:
+        self._root = self._Node()
+        self._filespecs: Dict[Hashable, Filespec] = {}
+
+    def __len__(self) -> int:
+        return len(self._filespecs)
+
+    def get(self, owner: Hashable) -> Optional[Filespec]:
+        """Returns the filespec of the given owner, if it is indexed."""
+        return self._filespecs.get(owner)
+
+    def add(self, owner: Hashable, filespec: Filespec) -> None:
+        """Indexes the filespec of the given owner, replacing any filespec it had."""
+        self.remove(owner)
+        self._filespecs[owner] = filespec
+        for literal_dir in self._literal_dirs(filespec):
+            node = self._root
+            for component in self._components(literal_dir):
+                child = node.children.get(component)
+                if child is None:
+                    child = node.children[component] = self._Node()
+                node = child
+            node.owners.add(owner)
+
+    def remove(self, owner: Hashable) -> None:
+        """Removes the given owner from the index, if it is indexed."""
+        filespec = self._filespecs.pop(owner, None)
+        if filespec is None:
+            return
+        for literal_dir in self._literal_dirs(filespec):
+            components = self._components(literal_dir)
+            nodes = [self._root]
+            for component in components:
+                nodes.append(nodes[-1].children[component])
+            nodes[-1].owners.discard(owner)
+            # Prune the nodes that no longer lead to any owner.
+            for depth in range(len(components), 0, -1):
+                if nodes[depth].owners or nodes[depth].children:
+                    break
+                del nodes[depth - 1].children[components[depth - 1]]
+
+    def candidates(self, paths: Iterable[str]) -> Dict[Hashable, List[str]]:
+        """Returns the owners that might own any of the given paths, with the paths they might own.
+
+        An owner is a candidate for a path if it has a glob under one of the path's ancestor
+        directories. Whether it actually owns the path is decided by its filespec.
+        """
+        candidates: DefaultDict[Hashable, List[str]] = defaultdict(list)
+        for path in paths:
+            node = self._root
+            owners = set(node.owners)
+            for component in self._components(os.path.dirname(path)):
+                child = node.children.get(component)
+                if child is None:
+                    break
+                node = child
+                owners.update(node.owners)
+            for owner in owners:
+                candidates[owner].append(path)
+        return candidates
+
+    def owners_of_any(self, paths: Iterable[str]) -> Set[Hashable]:
+        """Returns the owners whose filespecs match any of the given paths."""
+        return {
+            owner
+            for owner, owner_paths in self.candidates(paths).items()
+            if any_matches_filespec(owner_paths, self._filespecs[owner])
+        }
+
+    @staticmethod
+    def _literal_dirs(filespec: Filespec) -> Set[str]:
+        return {glob_literal_dir(glob) for glob in filespec["globs"]}
+
+    @staticmethod
+    def _components(directory: str) -> List[str]:
+        return directory.split("/") if directory else []
@@ -1,10 +1,18 @@
 # Copyright 2017 Pants project contributors (see CONTRIBUTORS.md).
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
+import unittest
 from typing import Tuple
 
 from pants.engine.fs import PathGlobs, Snapshot
-from pants.source.filespec import matches_filespec
+from pants.source.filespec import (
+    CompiledFilespec,
+    FilespecIndex,
+    compile_filespec,
+    glob_literal_dir,
+    matches_filespec,
+)
+from pants.source.wrapped_globs import Filespec
 from pants.testutil.test_base import TestBase
 
 
@@ -117,3 +125,128 @@ class FilespecTest(TestBase):
 
     def test_matches_literal_file(self) -> None:
         self.assert_rule_match("a/b/c.py", ("a/b/c.py",))
+
+    def test_index_owners_of_any(self) -> None:
+        index = FilespecIndex()
+        index.add("a", {"globs": ["a/*.py"], "exclude": [{"globs": ["a/x.py"]}]})
+        index.add("a_b", {"globs": ["a/b/*.py"]})
+        self.assertEqual({"a"}, index.owners_of_any(["a/f.py", "a/b/f.txt"]))
+        self.assertEqual(set(), index.owners_of_any(["a/x.py"]))
+        self.assertEqual({"a", "a_b"}, index.owners_of_any(["a/x.py", "a/y.py", "a/b/f.py"]))
+
+
+class FilespecIndexTest(unittest.TestCase):
+    def test_glob_literal_dir(self) -> None:
+        self.assertEqual("a/b", glob_literal_dir("a/b/c.py"))
+        self.assertEqual("a/b", glob_literal_dir("a/b/*.py"))
+        self.assertEqual("a", glob_literal_dir("a/*/c.py"))
+        self.assertEqual("a", glob_literal_dir("a/**/*.py"))
+        self.assertEqual("a", glob_literal_dir("a/[bc]/d.py"))
+        self.assertEqual("", glob_literal_dir("*/b/c.py"))
+        self.assertEqual("", glob_literal_dir("c.py"))
+        self.assertEqual("", glob_literal_dir("./c.py"))
+        self.assertEqual("a", glob_literal_dir("a//b/"))
+
+    def test_candidates(self) -> None:
+        index = FilespecIndex()
+        index.add("root", {"globs": ["**/*.py"]})
+        index.add("a", {"globs": ["a/*.py"]})
+        index.add("a_b", {"globs": ["a/b/*.py", "a/b/c/*.py"]})
+        index.add("d", {"globs": ["d/*.py"], "exclude": [{"globs": ["d/x.py"]}]})
+
+        candidates = index.candidates(["a/b/c/f.py", "a/f.py", "d/f.py", "e/f.py"])
+        self.assertEqual(
+            {
+                "root": ["a/b/c/f.py", "a/f.py", "d/f.py", "e/f.py"],
+                "a": ["a/b/c/f.py", "a/f.py"],
+                "a_b": ["a/b/c/f.py"],
+                "d": ["d/f.py"],
+            },
+            candidates,
+        )
+
+    def test_replace_and_remove(self) -> None:
+        index = FilespecIndex()
+        index.add("t", {"globs": ["a/b/*.py"]})
+        self.assertEqual({"t": ["a/b/f.py"]}, index.candidates(["a/b/f.py"]))
+
+        index.add("t", {"globs": ["c/*.py"]})
+        self.assertEqual({"globs": ["c/*.py"]}, index.get("t"))
+        self.assertEqual({}, index.candidates(["a/b/f.py"]))
+        self.assertEqual({"t": ["c/f.py"]}, index.candidates(["c/f.py"]))
+
+        index.remove("t")
+        index.remove("t")
+        self.assertEqual(0, len(index))
+        self.assertIsNone(index.get("t"))
+        self.assertEqual({}, index.candidates(["c/f.py"]))
+        # Nodes that no longer lead to any owner are pruned.
+        self.assertEqual({}, index._root.children)
+
+
+class CompiledFilespecTest(unittest.TestCase):
+    def assert_matches(
+        self, include: str, matches: Tuple[str, ...], non_matches: Tuple[str, ...] = (),
+    ) -> None:
+        compiled = CompiledFilespec([include], [])
+        self.assertTrue(compiled._is_translated)
+        for path in matches:
+            self.assertTrue(compiled.matches(path), f"{include} doesn't match path `{path}`")
+        for path in non_matches:
+            self.assertFalse(compiled.matches(path), f"{include} erroneously matches `{path}`")
+
+    def test_single_star(self) -> None:
+        self.assert_matches("a/b/*/f.py", ("a/b/c/f.py",), ("a/b/c/d/f.py", "a/b/f.py"))
+        self.assert_matches("*/bar/b*", ("foo/bar/baz",), ("foo/koo/bar/baz", "foo/bar/bar/zoo"))
+        self.assert_matches("foo*/bar", ("foofighters.venv/bar",), ("foofighters/baz/bar",))
+
+    def test_question_mark(self) -> None:
+        self.assert_matches("a/?.py", ("a/b.py",), ("a/bc.py", "a//.py"))
+
+    def test_double_star(self) -> None:
+        self.assert_matches("**", ("a/b/c", "b"))
+        self.assert_matches("a/**/f", ("a/f", "a/b/c/d/e/f"), ("af", "a/bf"))
+        self.assert_matches("a/b/**", ("a/b/d", "a/b/c/d/e/f"), ("a/b",))
+        self.assert_matches("**/**/f", ("f", "a/f"))
+
+    def test_literals(self) -> None:
+        self.assert_matches("a/b/c.py", ("a/b/c.py",), ("a/b/cxpy", "a/b/c.py/d"))
+        self.assert_matches(".*", (".dots",), ("b", "a/.dots"))
+        self.assert_matches("./*.py", ("f.py",), ("a/f.py",))
+        self.assert_matches("dist/", ("dist",), ("cdist", "dist/dist"))
+
+    def test_excludes(self) -> None:
+        compiled = CompiledFilespec(
+            ["a/**/*.py"], ["x.py", "/a/y.py", "a/b/", "a/c/**", "a/d/*.py"]
+        )
+        self.assertTrue(compiled._is_translated)
+        self.assertEqual(
+            ["a/b/y.py", "a/b/z.py", "a/d/e/z.py"],
+            compiled.filter(
+                [
+                    "a/x.py",
+                    "a/b/x.py",
+                    "a/y.py",
+                    "a/b/y.py",
+                    "a/b/z.py",
+                    "a/c/z.py",
+                    "a/c/d/z.py",
+                    "a/d/z.py",
+                    "a/d/e/z.py",
+                ]
+            ),
+        )
+        self.assertTrue(compiled.matches_any(["a/x.py", "a/b/y.py"]))
+        self.assertFalse(compiled.matches_any(["a/x.py", "a/y.py"]))
+        self.assertFalse(CompiledFilespec([], []).matches_any(["a/x.py"]))
+
+    def test_untranslated_syntax(self) -> None:
+        for include, exclude in (("a/[bc].py", ""), ("a/**b", ""), ("a/*", "!b"), ("a/*", "\\#b")):
+            compiled = CompiledFilespec([include], [exclude] if exclude else [])
+            self.assertFalse(compiled._is_translated, f"{include} !{exclude}")
+
+    def test_compile_filespec_cached(self) -> None:
+        spec: Filespec = {"globs": ["a/*.py"], "exclude": [{"globs": ["a/b.py"]}]}
+        compiled = compile_filespec(spec)
+        self.assertIs(compiled, compile_filespec({**spec}))
+        self.assertEqual(["a/a.py"], compiled.filter(["a/a.py", "a/b.py"]))
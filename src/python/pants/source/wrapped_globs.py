@@ -4,7 +4,7 @@
 import os
 from abc import ABC, abstractmethod
 from hashlib import sha1
-from typing import Callable, Iterable, Iterator, List, Sequence, Tuple, cast
+from typing import Callable, FrozenSet, Iterable, Iterator, List, Sequence, Tuple, cast
 
 from twitter.common.dirutil.fileset import Fileset
 from typing_extensions import TypedDict
@@ -130,9 +130,13 @@ class EagerFilesetWithSpec(FilesetWithSpec):
             self.rel_root, self._snapshot,
         )
 
+    @memoized_property
+    def _file_set(self) -> FrozenSet[str]:
+        return frozenset(self.files)
+
     def matches(self, path_from_buildroot: str) -> bool:
         path_relative_to_rel_root = fast_relpath_optional(path_from_buildroot, self.rel_root)
-        return path_relative_to_rel_root is not None and path_relative_to_rel_root in self.files
+        return path_relative_to_rel_root is not None and path_relative_to_rel_root in self._file_set
 
 
 class LazyFilesetWithSpec(FilesetWithSpec):
@@ -162,10 +166,12 @@ class LazyFilesetWithSpec(FilesetWithSpec):
                 h.update(f.read())
         return h.digest()
 
+    @memoized_property
+    def _paths_from_buildroot(self) -> FrozenSet[str]:
+        return frozenset(self.paths_from_buildroot_iter())
+
     def matches(self, path_from_buildroot: str) -> bool:
-        return any(
-            path_from_buildroot == path_in_spec for path_in_spec in self.paths_from_buildroot_iter()
-        )
+        return path_from_buildroot in self._paths_from_buildroot
 
 
 class FilesetRelPathWrapper(ABC):
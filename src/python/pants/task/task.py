@@ -618,11 +618,18 @@ class TaskBase(SubsystemClientMixin, Optionable, metaclass=ABCMeta):
             return [], [], []
 
         read_cache = self._cache_factory.get_read_cache()
-        items = [
-            (read_cache, vt.cache_key, vt.current_results_dir if self.cache_target_dirs else None)
-            for vt in vts
+        requests = [
+            (vt.cache_key, vt.current_results_dir if self.cache_target_dirs else None) for vt in vts
         ]
-        res = self.context.subproc_map(call_use_cached_files, items)
+        if read_cache.max_concurrent_lookups > 1:
+            # Reads wait on the network, so they overlap on threads.
+            results = dict(read_cache.use_cached_files_many(requests))
+            res = [results[cache_key] for cache_key, _ in requests]
+        else:
+            res = self.context.subproc_map(
+                call_use_cached_files,
+                [(read_cache, cache_key, results_dir) for cache_key, results_dir in requests],
+            )
 
         cached_vts = []
         uncached_vts = []
@@ -688,9 +695,9 @@ class TaskBase(SubsystemClientMixin, Optionable, metaclass=ABCMeta):
                 overwrite = always_overwrite or vts.cache_key in self._cache_key_errors
                 args_tuples.append((cache, vts.cache_key, artifactfiles, overwrite))
 
-            return Work(
-                lambda x: self.context.subproc_map(call_insert, x), [(args_tuples,)], "insert"
-            )
+            # Creating artifacts is CPU-bound, so each runs in a subprocess if the background worker
+            # pool has them (see `--run-tracker-num-background-processes`).
+            return Work(call_insert, [(args,) for args in args_tuples], "insert", cpu_bound=True)
         else:
             return None
 
@@ -8,14 +8,16 @@ import shutil
 import subprocess
 import xml.etree.ElementTree as ET
 from abc import abstractmethod
+from collections import defaultdict
 from contextlib import contextmanager
 
 from pants.base.build_environment import get_buildroot
 from pants.base.exceptions import ErrorWhileTesting, TaskError
 from pants.build_graph.files import Files
+from pants.goal.timing_history import TimingHistory
 from pants.invalidation.cache_manager import VersionedTargetSet
 from pants.task.task import Task
-from pants.util.contextutil import temporary_dir
+from pants.util.contextutil import Timer, temporary_dir
 from pants.util.dirutil import safe_mkdir, safe_mkdir_for
 from pants.util.memo import memoized_classproperty, memoized_property
 
@@ -449,6 +451,98 @@ class PartitionedTestRunnerTaskMixin(TestRunnerTaskMixin, Task):
             help="Run tests in a chroot. Any loose files tests depend on via `{}` dependencies "
             "will be copied to the chroot.".format(Files.alias()),
         )
+        register(
+            "--balance-by-measured-durations",
+            advanced=True,
+            type=bool,
+            default=True,
+            help="Remember how long each test target took to run, and use those durations to "
+            "balance and order the test runs of later runs.",
+        )
+
+    @memoized_property
+    def _timing_history(self):
+        if not self.get_options().balance_by_measured_durations:
+            return None
+        return TimingHistory.for_pants_workdir(self.get_options().pants_workdir)
+
+    def estimated_test_duration(self, target):
+        """Returns the estimated time in seconds to run the tests of the given target, if known.
+
+        :rtype: float or None
+        """
+        timing_history = self._timing_history
+        if timing_history is None:
+            return None
+        return timing_history.get_for_target(self.options_scope, target)
+
+    def estimated_test_case_duration(self, test_name):
+        """Returns the estimated time in seconds to run the given test, if known.
+
+        :param string test_name: The name the test's durations were reported under.
+        :rtype: float or None
+        """
+        timing_history = self._timing_history
+        if timing_history is None:
+            return None
+        return timing_history.get(self.options_scope, test_name)
+
+    def report_all_info_for_single_test(self, scope, target, test_name, test_info):
+        super().report_all_info_for_single_test(scope, target, test_name, test_info)
+        duration = test_info.get("time")
+        if target is not None and duration is not None:
+            # Keyed by test, as the results of a test may be reported more than once.
+            self._reported_test_durations[
+                (target, test_info.get("classname"), test_name)
+            ] = duration
+
+    def report_test_case_duration(self, test_name, secs):
+        """Reports how long a test took, to be recorded once its partition completes.
+
+        :param string test_name: A name for the test that cannot be mistaken for a target address.
+        :param float secs: The time in seconds the test took.
+        """
+        self._reported_test_case_durations[test_name] = secs
+
+    @memoized_property
+    def _reported_test_durations(self):
+        return {}
+
+    @memoized_property
+    def _reported_test_case_durations(self):
+        return {}
+
+    def _record_test_durations(self, test_targets, secs, complete):
+        """Records the time taken to run the tests of the given targets.
+
+        Targets are recorded with the sum of the durations of their tests reported from the test
+        results, if there were any, or else with an even split of the time taken by the whole run.
+
+        :param list test_targets: The targets whose tests were run.
+        :param float secs: The time taken by the whole run.
+        :param bool complete: Whether all the tests ran. Nothing is recorded for a run cut short.
+        """
+        reported_targets = defaultdict(float)
+        for (target, _, _), duration in self._reported_test_durations.items():
+            reported_targets[target] += duration
+        reported_test_cases = dict(self._reported_test_case_durations)
+        self._reported_test_durations.clear()
+        self._reported_test_case_durations.clear()
+
+        timing_history = self._timing_history
+        if timing_history is None or not complete or not test_targets:
+            return
+        if reported_targets:
+            for target, duration in reported_targets.items():
+                timing_history.record_for_target(self.options_scope, target, duration)
+        else:
+            for target in test_targets:
+                timing_history.record_for_target(
+                    self.options_scope, target, secs / len(test_targets)
+                )
+        for test_name, duration in reported_test_cases.items():
+            timing_history.record(self.options_scope, test_name, duration)
+        timing_history.flush()
 
     @staticmethod
     def _vts_for_partition(invalidation_check):
@@ -607,7 +701,13 @@ class PartitionedTestRunnerTaskMixin(TestRunnerTaskMixin, Task):
             ]
 
             # 2.) Write all results that will be potentially cached to output_dir.
-            result = self.run_tests(fail_fast, invalid_test_tgts, *args).checked()
+            with Timer() as timer:
+                result = self.run_tests(fail_fast, invalid_test_tgts, *args)
+            # A run cut short by --fail-fast says little about how long the tests take.
+            self._record_test_durations(
+                invalid_test_tgts, timer.elapsed, complete=result.success or not fail_fast
+            )
+            result = result.checked()
 
             cache_vts = self._vts_for_partition(invalidation_check)
             if invalidation_check.all_vts == invalidation_check.invalid_vts:
@@ -412,14 +412,16 @@ def safe_concurrent_rename(src: str, dst: str) -> None:
 
 def safe_rm_oldest_items_in_dir(
     root_dir: str, num_of_items_to_keep: int, excludes: Iterable[str] = frozenset()
-) -> None:
+) -> List[str]:
     """Keep `num_of_items_to_keep` newly modified items besides `excludes` in `root_dir` then remove
     the rest.
 
     :param root_dir: the folder to examine
     :param num_of_items_to_keep: number of files/folders/symlinks to keep after the cleanup
     :param excludes: absolute paths excluded from removal (must be prefixed with `root_dir`)
+    :returns: the paths of the removed items
     """
+    removed: List[str] = []
     if os.path.isdir(root_dir):
         found_files = []
         for old_file in os.listdir(root_dir):
@@ -429,6 +431,8 @@ def safe_rm_oldest_items_in_dir(
         found_files = sorted(found_files, key=lambda x: x[1], reverse=True)
         for cur_file, _ in found_files[num_of_items_to_keep:]:
             rm_rf(cur_file)
+            removed.append(cur_file)
+    return removed
 
 
 @contextmanager
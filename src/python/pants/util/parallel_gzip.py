@@ -0,0 +1,110 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import io
+import struct
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import BinaryIO, Deque, Optional
+
+# The size of the window of preceding data that deflate back-references may reach into.
+_WINDOW_SIZE = 32 * 1024
+
+
+def _deflate_block(block: bytes, compresslevel: int, zdict: Optional[bytes], last: bool) -> bytes:
+    compressor = (
+        zlib.compressobj(compresslevel, zlib.DEFLATED, -zlib.MAX_WBITS, zdict=zdict)
+        if zdict
+        else zlib.compressobj(compresslevel, zlib.DEFLATED, -zlib.MAX_WBITS)
+    )
+    # A sync flush ends the block's deflate output on a byte boundary without ending the stream, so
+    # the outputs of consecutive blocks concatenate into a single valid deflate stream.
+    return compressor.compress(block) + compressor.flush(
+        zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH
+    )
+
+
+class ParallelGzipWriter(io.RawIOBase):
+    """A writable stream that gzips the data written to it using several threads.
+
+    Like pigz, the data is split into blocks which are deflated independently on a thread pool (zlib
+    releases the GIL while compressing), each primed with the tail of the previous block so that
+    compression barely suffers. The blocks are stitched back together into a single-member gzip
+    stream, so the output is readable by any gzip reader.
+
+    Closing the writer does not close the underlying file.
+    """
+
+    DEFAULT_BLOCK_SIZE = 256 * 1024
+
+    def __init__(
+        self,
+        fileobj: BinaryIO,
+        compresslevel: int = 9,
+        threads: int = 1,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+    ) -> None:
+        """
+        :param fileobj: The binary file to write the gzipped stream to.
+        :param compresslevel: The gzip compression level, 0-9.
+        :param threads: The number of threads to compress with.
+        :param block_size: The number of uncompressed bytes to compress per block.
+        """
+        super().__init__()
+        self._fileobj = fileobj
+        self._compresslevel = compresslevel
+        self._threads = max(1, threads)
+        self._block_size = block_size
+
+        self._executor = ThreadPoolExecutor(max_workers=self._threads)
+        self._pending: Deque["Future[bytes]"] = deque()
+        self._buffer = bytearray()
+        self._previous_tail: Optional[bytes] = None
+        self._crc = 0
+        self._size = 0
+
+        # A minimal header: no file name, and a zero mtime for reproducibility. The OS is "unknown".
+        self._fileobj.write(b"\x1f\x8b\x08\x00" + struct.pack("<I", 0) + b"\x00\xff")
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:  # type: ignore[override]
+        if self.closed:
+            raise ValueError("write to closed file")
+        data = memoryview(data).cast("B")
+        self._crc = zlib.crc32(data, self._crc)
+        self._size += len(data)
+        self._buffer += data
+        while len(self._buffer) >= self._block_size:
+            block = bytes(self._buffer[: self._block_size])
+            del self._buffer[: self._block_size]
+            self._submit(block, last=False)
+        return len(data)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            self._submit(bytes(self._buffer), last=True)
+            self._buffer = bytearray()
+            self._drain(0)
+            self._fileobj.write(struct.pack("<II", self._crc, self._size & 0xFFFFFFFF))
+        finally:
+            self._executor.shutdown(wait=True)
+            super().close()
+
+    def _submit(self, block: bytes, last: bool) -> None:
+        self._pending.append(
+            self._executor.submit(
+                _deflate_block, block, self._compresslevel, self._previous_tail, last
+            )
+        )
+        self._previous_tail = block[-_WINDOW_SIZE:]
+        # Bound the memory held by blocks waiting to be written.
+        self._drain(2 * self._threads)
+
+    def _drain(self, max_pending: int) -> None:
+        while len(self._pending) > max_pending:
+            self._fileobj.write(self._pending.popleft().result())
@@ -0,0 +1,184 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import errno
+import fcntl
+import logging
+import os
+import zlib
+from contextlib import contextmanager
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+from pants.util.dirutil import safe_concurrent_creation, safe_mkdir_for
+
+logger = logging.getLogger(__name__)
+
+
+Record = Tuple[str, ...]
+
+
+class RecordLog:
+    """An append-only log of records, each a tuple of tab-free strings, stored in a single file.
+
+    The log is read back with one bulk read, and each call to `append` issues a single write. Every
+    record carries a checksum, so a record torn by a crash mid-write is skipped on the next read
+    rather than being mistaken for a valid one.
+
+    Appends from concurrent processes share a lock on a file next to the log, which `rewrite`,
+    `delete` and the compaction done by `load_compacted` take exclusively. Since the log is only
+    ever replaced while no append is in progress, and appends open the log afresh, no record
+    appended by another process is lost to a rewrite. Reads take no lock: the log is replaced by an
+    atomic rename, and a record still being appended is skipped as torn.
+    """
+
+    def __init__(self, path: str, shared: bool = True) -> None:
+        """
+        :param path: The path of the file backing this log.
+        :param shared: Whether other processes may write to the log concurrently. A log that is only
+                       ever written by one process at a time skips the lock, and its lock file.
+        """
+        self._path = path
+        self._lock_path = path + ".lock" if shared else None
+        self._torn_tail = False
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def read(self) -> List[Record]:
+        """Returns all the intact records in the log, in the order they were appended."""
+        try:
+            with open(self._path, "rb") as fd:
+                data = fd.read()
+        except IOError as e:
+            if e.errno != errno.ENOENT:
+                raise
+            data = b""
+
+        lines = data.split(b"\n")
+        # The final element is either empty or a record torn by a crash before its newline landed.
+        self._torn_tail = bool(lines.pop())
+
+        records = []
+        for line in lines:
+            record = self._decode(line)
+            if record is None:
+                logger.debug("Ignoring corrupt record in {}.".format(self._path))
+            else:
+                records.append(record)
+        return records
+
+    def append(self, records: Iterable[Record]) -> None:
+        """Appends the given records to the log in a single write."""
+        data = b"".join(self._encode(record) for record in records)
+        if not data:
+            return
+        if self._torn_tail:
+            # Terminate the torn record so that it does not swallow the first one appended.
+            data = b"\n" + data
+            self._torn_tail = False
+        with self._locked(exclusive=False):
+            with open(self._path, "ab") as fd:
+                fd.write(data)
+
+    def rewrite(self, records: Iterable[Record]) -> None:
+        """Atomically replaces the contents of the log with the given records."""
+        with self._locked(exclusive=True):
+            self._replace(records)
+
+    def delete(self) -> None:
+        """Removes the log, if it exists."""
+        with self._locked(exclusive=True):
+            self._delete()
+
+    def load_compacted(
+        self,
+        key_fn: Callable[[Record], Optional[Hashable]],
+        live_fn: Optional[Callable[[Record], bool]] = None,
+        max_records: Optional[int] = None,
+        min_compaction_records: int = 1024,
+        compaction_ratio: int = 2,
+    ) -> Dict[Hashable, Record]:
+        """Returns the latest record for each key in the log, compacting the log if it has grown.
+
+        The log is compacted to just the returned records once it holds at least
+        `min_compaction_records` records and `compaction_ratio` times as many as are returned. The
+        log is re-read under an exclusive lock to compact it, so that records appended by other
+        processes in the meantime are kept.
+
+        :param key_fn: Returns the key of a record, or None for a record that should be ignored.
+        :param live_fn: Returns whether a record that is the latest for its key is still live, rather
+                        than a removal or an expired record. Defaults to treating all records as live.
+        :param max_records: A number of records beyond which the log is discarded rather than
+                            compacted, for logs that hold no record of which entries are still in use.
+        :param min_compaction_records: The smallest log to compact.
+        :param compaction_ratio: How many times larger than its live records the log must be to be
+                                 compacted.
+        """
+        records = self.read()
+        if max_records is not None and len(records) > max_records:
+            with self._locked(exclusive=True):
+                self._delete()
+            return {}
+
+        live = self._latest(records, key_fn, live_fn)
+        if len(records) >= max(min_compaction_records, compaction_ratio * len(live)):
+            with self._locked(exclusive=True):
+                live = self._latest(self.read(), key_fn, live_fn)
+                self._replace(live.values())
+        return live
+
+    @staticmethod
+    def _latest(
+        records: Iterable[Record],
+        key_fn: Callable[[Record], Optional[Hashable]],
+        live_fn: Optional[Callable[[Record], bool]],
+    ) -> Dict[Hashable, Record]:
+        latest: Dict[Hashable, Record] = {}
+        for record in records:
+            key = key_fn(record)
+            if key is not None:
+                latest[key] = record
+        if live_fn is None:
+            return latest
+        return {key: record for key, record in latest.items() if live_fn(record)}
+
+    @contextmanager
+    def _locked(self, exclusive: bool) -> Iterator[None]:
+        if self._lock_path is None:
+            yield
+            return
+        safe_mkdir_for(self._lock_path)
+        # Closing the file releases the lock.
+        with open(self._lock_path, "a") as fd:
+            fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            yield
+
+    def _replace(self, records: Iterable[Record]) -> None:
+        with safe_concurrent_creation(self._path) as tmp_path:
+            with open(tmp_path, "wb") as fd:
+                fd.write(b"".join(self._encode(record) for record in records))
+        self._torn_tail = False
+
+    def _delete(self) -> None:
+        try:
+            os.unlink(self._path)
+        except OSError as e:
+            if e.errno != errno.ENOENT:
+                raise
+        self._torn_tail = False
+
+    @staticmethod
+    def _encode(record: Record) -> bytes:
+        payload = "\t".join(record).encode()
+        return b"%08x %s\n" % (zlib.crc32(payload), payload)
+
+    @staticmethod
+    def _decode(line: bytes) -> Optional[Record]:
+        checksum, _, payload = line.partition(b" ")
+        try:
+            if int(checksum, 16) != zlib.crc32(payload):
+                return None
+            return tuple(payload.decode().split("\t"))
+        except ValueError:
+            return None
@@ -436,6 +436,95 @@ class ClasspathProductsTest(TestBase):
         )
         self.assertEqual([("fred-conf", expected_entry)], classpath_target_tuples)
 
+    def test_lookups_reflect_changes_to_products(self):
+        b = self.make_target("b", JvmTarget, excludes=[Exclude("com.example", "lib")])
+        a = self.make_target("a", JvmTarget, dependencies=[b])
+        classpath_product = ClasspathProducts(self.pants_workdir)
+        resolved_jar = self.add_example_jar_classpath_element_for(classpath_product, a)
+        a_closure = a.closure(bfs=True)
+
+        self.assertEqual(
+            [("default", resolved_jar.pants_path)], classpath_product.get_for_targets(a_closure)
+        )
+        # Results are copies, so mutating one does not affect later lookups.
+        classpath_product.get_for_targets(a_closure).clear()
+        self.assertEqual(
+            [("default", resolved_jar.pants_path)], classpath_product.get_for_targets(a_closure)
+        )
+
+        classpath_product.add_for_target(b, [("default", self.path("b/path"))])
+        self.assertEqual(
+            [("default", resolved_jar.pants_path), ("default", self.path("b/path"))],
+            classpath_product.get_for_targets(a_closure),
+        )
+
+        self.add_excludes_for_targets(classpath_product, b, a)
+        self.assertEqual(
+            [("default", self.path("b/path"))], classpath_product.get_for_targets(a_closure)
+        )
+
+        classpath_product.remove_for_target(b, [("default", self.path("b/path"))])
+        self.assertEqual([], classpath_product.get_for_targets(a_closure))
+
+    def test_lookups_reflect_changes_to_build_graph(self):
+        c = self.make_target("c", JvmTarget, excludes=[Exclude("com.example", "lib")])
+        a = self.make_target("a", JvmTarget)
+        classpath_product = ClasspathProducts(self.pants_workdir)
+        resolved_jar = self.add_example_jar_classpath_element_for(classpath_product, a)
+        self.add_excludes_for_targets(classpath_product, c, a)
+
+        self.assertEqual(
+            [("default", resolved_jar.pants_path)], classpath_product.get_for_target(a)
+        )
+        # Excludes are collected from the closure of the targets looked up, which now includes c.
+        a.inject_dependency(c.address)
+        self.assertEqual([], classpath_product.get_for_target(a))
+
+    def test_lookups_computed_across_a_change_are_not_cached(self):
+        a = self.make_target("a", JvmTarget)
+        classpath_product = ClasspathProducts(self.pants_workdir)
+        classpath_product.add_for_target(a, [("default", self.path("a/path"))])
+
+        def compute():
+            # Simulates another thread changing the products while this lookup is computed.
+            classpath_product.add_for_target(a, [("default", self.path("a/other"))])
+            return [("default", self.path("a/path"))]
+
+        self.assertEqual(
+            [("default", self.path("a/path"))],
+            classpath_product._cached_lookup(("entries", (a,)), [a], compute),
+        )
+        self.assertEqual(
+            [("default", self.path("a/path")), ("default", self.path("a/other"))],
+            classpath_product._cached_lookup(
+                ("entries", (a,)), [a], lambda: classpath_product.get_for_target(a)
+            ),
+        )
+
+    def test_lookups_computed_during_a_change_are_not_cached(self):
+        a = self.make_target("a", JvmTarget)
+        classpath_product = ClasspathProducts(self.pants_workdir)
+        classpath_product.add_for_target(a, [("default", self.path("a/path"))])
+        classpath_product.get_classpath_entries_for_targets([a])
+
+        add_for_target = classpath_product._classpaths.add_for_target
+
+        def add_for_target_after_a_lookup(target, products):
+            # Simulates another thread looking up the products while they are being changed.
+            classpath_product.get_classpath_entries_for_targets([a])
+            add_for_target(target, products)
+
+        classpath_product._classpaths.add_for_target = add_for_target_after_a_lookup
+        classpath_product.add_for_target(a, [("default", self.path("a/other"))])
+
+        self.assertEqual(
+            [("default", self.path("a/path")), ("default", self.path("a/other"))],
+            [
+                (conf, entry.path)
+                for conf, entry in classpath_product.get_classpath_entries_for_targets([a])
+            ],
+        )
+
     def test_get_artifact_classpath_entries_for_targets(self):
         b = self.make_target("b", JvmTarget, excludes=[Exclude("com.example", "lib")])
         a = self.make_target("a", JvmTarget, dependencies=[b])
@@ -679,4 +768,6 @@ class ClasspathProductsTest(TestBase):
         classpath_product.add_excludes_for_targets(targets)
 
     def add_example_jar_classpath_element_for(self, classpath_product, target):
-        self.add_jar_classpath_element_for_path(classpath_product, target, self._example_jar_path())
+        return self.add_jar_classpath_element_for_path(
+            classpath_product, target, self._example_jar_path()
+        )
@@ -4,6 +4,7 @@
 import os
 import re
 from typing import List
+from unittest import mock
 
 from pants.backend.jvm.targets.jar_library import JarLibrary
 from pants.backend.jvm.targets.java_library import JavaLibrary
@@ -131,6 +132,41 @@ class TestConsolidateClasspath(JvmBinaryTaskTestBase):
         found = set(os.listdir(self.pants_workdir))
         self.assertTrue(expected_deps - found == set())
 
+    def test_unchanged_classes_are_not_rejarred(self):
+        self.app_target = self.make_target(
+            spec="//foo:foo-app",
+            target_type=JvmApp,
+            basename="FooApp",
+            dependencies=[self.binary_target],
+        )
+        task_dir = os.path.join(
+            self.pants_workdir, "pants_backend_jvm_tasks_consolidate_classpath_ConsolidateClasspath"
+        )
+
+        def execute_counting_jars():
+            task_context = self.context(target_roots=[self.app_target])
+            self._setup_classpath(task_context)
+            with mock.patch.object(
+                ConsolidateClasspath,
+                "open_jar",
+                autospec=True,
+                side_effect=ConsolidateClasspath.open_jar,
+            ) as open_jar:
+                self.execute(task_context)
+            return open_jar.call_count
+
+        self.assertEqual(1, execute_counting_jars())
+
+        # Invalidate the binary without changing its classes: the previous jar is reused.
+        safe_file_dump(os.path.join(self.build_root, "foo/Foo.java"), "// changed content")
+        self.assertEqual(0, execute_counting_jars())
+
+        found_files = [os.path.basename(f) for f in self.iter_files(task_dir)]
+        consolidate_classpath_jar = self.find_consolidate_classpath_jar(found_files)
+        self.assertEqual(
+            sorted([consolidate_classpath_jar, "Foo.class", "foo.txt", "file"]), sorted(found_files)
+        )
+
     @staticmethod
     def find_consolidate_classpath_jar(files: List[str]) -> str:
         matching = [f for f in files if re.match("output-[0-9a-f]{6}\.jar", f)]
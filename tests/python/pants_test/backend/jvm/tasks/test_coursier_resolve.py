@@ -4,6 +4,7 @@
 import os
 import re
 from contextlib import contextmanager
+from unittest import mock
 from unittest.mock import MagicMock
 
 from pants.backend.jvm.subsystems.jar_dependency_management import (
@@ -23,6 +24,7 @@ from pants.base.exceptions import TaskError
 from pants.java import util
 from pants.java.jar.exclude import Exclude
 from pants.java.jar.jar_dependency import JarDependency
+from pants.java.jar.jar_dependency_utils import M2Coordinate
 from pants.task.task import Task
 from pants.testutil.jvm.nailgun_task_test_base import NailgunTaskTestBase
 from pants.testutil.subsystem.util import init_subsystem
@@ -260,6 +262,59 @@ class CoursierResolveTest(NailgunTaskTestBase):
             task.execute()
             task.runjava.assert_not_called()
 
+    def test_same_jars_for_other_targets_do_not_invoke_coursier(self):
+        junit_jar_lib = self._make_junit_target()
+        other_junit_jar_lib = self.make_target(
+            "//:other", JarLibrary, jars=[JarDependency("junit", "junit", rev="4.12")]
+        )
+        with self._temp_workdir(), self._temp_task_cache_dir():
+            self.resolve([junit_jar_lib])
+
+            # The targets differ, but their jars resolve to the same result.
+            task = self.prepare_execute(self.context(target_roots=[other_junit_jar_lib]))
+            task.runjava = MagicMock()
+            task.execute()
+            task.runjava.assert_not_called()
+            compile_classpath = task.context.products.get_data("compile_classpath")
+            self.assertEqual(2, len(compile_classpath.get_for_target(other_junit_jar_lib)))
+
+    def test_same_jars_with_cache_ignored_invoke_coursier(self):
+        junit_jar_lib = self._make_junit_target()
+        other_junit_jar_lib = self.make_target(
+            "//:other", JarLibrary, jars=[JarDependency("junit", "junit", rev="4.12")]
+        )
+        with self._temp_workdir(), self._temp_task_cache_dir():
+            self.resolve([junit_jar_lib])
+
+            self.set_options_for_scope(f"cache.{self.options_scope}", ignore=True)
+            task = self.prepare_execute(self.context(target_roots=[other_junit_jar_lib]))
+            with mock.patch.object(task, "_read_cached_resolve") as read_cached_resolve:
+                task.execute()
+                read_cached_resolve.assert_not_called()
+
+    def test_resolve_cache_is_pruned(self):
+        with self._temp_workdir(), self._temp_task_cache_dir():
+            task = self.prepare_execute(self.context())
+            with mock.patch.object(CoursierResolve, "_MAX_CACHED_RESOLVES", 1):
+                task._write_cached_resolve("a", {"default": []})
+                task._write_cached_resolve("b", {"default": []})
+            self.assertIsNone(task._read_cached_resolve("a"))
+            self.assertEqual({"default": []}, task._read_cached_resolve("b"))
+
+    def test_resolve_cache_key_ignores_order(self):
+        junit = JarDependency("junit", "junit", rev="4.12")
+        guava = JarDependency("com.google.guava", "guava", rev="18.0", excludes=[Exclude("a", "b")])
+        pinned = [M2Coordinate("org.hamcrest", "hamcrest-core", "1.3")]
+
+        def key(jars, excludes=()):
+            return CoursierResolve._resolve_cache_key(
+                ["fetch"], jars, excludes, pinned, sources=False, javadoc=False
+            )
+
+        self.assertEqual(key([junit, guava]), key([guava, junit]))
+        self.assertNotEqual(key([junit, guava]), key([junit]))
+        self.assertNotEqual(key([junit]), key([junit], excludes=[Exclude("junit")]))
+
     def test_when_invalid_hardlink_and_coursier_cache_should_trigger_resolve(self):
         jar_lib = self._make_junit_target()
         with self._temp_workdir():
@@ -0,0 +1,57 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import os
+import unittest
+from unittest import mock
+
+from pants.backend.jvm.tasks.jar_entry_index import JarEntryIndex
+from pants.util.contextutil import open_zip, temporary_dir
+
+
+class JarEntryIndexTest(unittest.TestCase):
+    @staticmethod
+    def create_jar(path, *names):
+        with open_zip(path, "w") as jar:
+            for name in names:
+                jar.writestr(name, b"")
+        return path
+
+    def test_entries(self):
+        with temporary_dir() as tmpdir:
+            a = self.create_jar(os.path.join(tmpdir, "a.jar"), "a/", "a/A.class")
+            b = self.create_jar(os.path.join(tmpdir, "b.jar"), "b/B.class", "假如.class")
+            index = JarEntryIndex(os.path.join(tmpdir, "index"))
+            self.assertEqual(
+                {a: ("a/", "a/A.class"), b: ("b/B.class", "假如.class")}, index.entries([a, b])
+            )
+
+    def test_persists_across_instances(self):
+        with temporary_dir() as tmpdir:
+            root = os.path.join(tmpdir, "index")
+            a = self.create_jar(os.path.join(tmpdir, "a.jar"), "A.class")
+            JarEntryIndex(root).entries([a])
+
+            with mock.patch.object(JarEntryIndex, "_read_names", side_effect=AssertionError):
+                self.assertEqual({a: ("A.class",)}, JarEntryIndex(root).entries([a]))
+
+    def test_rewritten_jar_is_read_again(self):
+        with temporary_dir() as tmpdir:
+            root = os.path.join(tmpdir, "index")
+            a = self.create_jar(os.path.join(tmpdir, "a.jar"), "A.class")
+            JarEntryIndex(root).entries([a])
+
+            self.create_jar(a, "A.class", "B.class")
+            self.assertEqual({a: ("A.class", "B.class")}, JarEntryIndex(root).entries([a]))
+
+    def test_log_is_compacted(self):
+        with temporary_dir() as tmpdir:
+            root = os.path.join(tmpdir, "index")
+            a = self.create_jar(os.path.join(tmpdir, "a.jar"), "A.class")
+            with mock.patch.object(JarEntryIndex, "_COMPACTION_MIN_RECORDS", 2):
+                for mtime_ns in range(3):
+                    os.utime(a, ns=(mtime_ns, mtime_ns))
+                    JarEntryIndex(root).entries([a])
+                index = JarEntryIndex(root)
+                self.assertEqual({a: ("A.class",)}, index.entries([a]))
+                self.assertEqual(1, len(index._log.read()))
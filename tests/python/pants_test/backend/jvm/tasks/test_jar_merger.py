@@ -0,0 +1,142 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import os
+import unittest
+import zipfile
+
+from pants.backend.jvm.targets.jvm_binary import Duplicate, JarRules, Skip
+from pants.backend.jvm.tasks.jar_merger import JarMerger
+from pants.java.jar.manifest import Manifest
+from pants.util.contextutil import open_zip
+from pants.util.dirutil import safe_file_dump, safe_mkdtemp, safe_rmtree
+
+
+class JarMergerTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = safe_mkdtemp()
+
+    def tearDown(self):
+        safe_rmtree(self.tmpdir)
+
+    def create_jar(self, name, entries, compress_type=zipfile.ZIP_DEFLATED):
+        path = os.path.join(self.tmpdir, name)
+        with open_zip(path, "w", compression=compress_type) as jar:
+            jar.writestr(Manifest.PATH, b"Manifest-Version: 1.0\nMain-Class: Ignored\n")
+            for dest, contents in entries.items():
+                jar.writestr(dest, contents)
+        return path
+
+    def merge(self, jar_rules=None, compressed=True, main=None, **sources):
+        path = os.path.join(self.tmpdir, "merged.jar")
+        merger = JarMerger(path, compressed=compressed, jar_rules=jar_rules or JarRules())
+        for jar in sources.get("jars", []):
+            merger.add_jar(jar)
+        for dest, contents in sources.get("contents", {}).items():
+            merger.add_bytes(dest, contents)
+        manifest = Manifest()
+        manifest.addentry(Manifest.MANIFEST_VERSION, "1.0")
+        if main:
+            manifest.addentry(Manifest.MAIN_CLASS, main)
+        merger.write(manifest)
+        return path
+
+    def test_listing(self):
+        jar = self.create_jar("a.jar", {"a/b/C.class": b"c"})
+        merged = self.merge(jars=[jar], contents={"d/e.txt": b"e"}, main="a.b.C")
+        with open_zip(merged) as zf:
+            self.assertEqual(
+                ["META-INF/", "META-INF/MANIFEST.MF", "a/", "a/b/", "a/b/C.class", "d/", "d/e.txt"],
+                zf.namelist(),
+            )
+            self.assertEqual(b"c", zf.read("a/b/C.class"))
+            self.assertEqual(b"e", zf.read("d/e.txt"))
+            self.assertEqual(
+                b"Manifest-Version: 1.0\nMain-Class: a.b.C\n", zf.read("META-INF/MANIFEST.MF")
+            )
+
+    def test_copies_compressed_entries_as_is(self):
+        contents = b"class contents " * 1000
+        jar = self.create_jar("a.jar", {"A.class": contents})
+        merged = self.merge(jars=[jar])
+        with open_zip(jar) as source, open_zip(merged) as zf:
+            info = zf.getinfo("A.class")
+            self.assertEqual(zipfile.ZIP_DEFLATED, info.compress_type)
+            self.assertEqual(source.getinfo("A.class").compress_size, info.compress_size)
+            self.assertEqual(contents, zf.read("A.class"))
+            self.assertIsNone(zf.testzip())
+
+    def test_recompresses_entries_as_requested(self):
+        jar = self.create_jar("a.jar", {"A.class": b"a" * 1000})
+        merged = self.merge(jars=[jar], compressed=False)
+        with open_zip(merged) as zf:
+            self.assertEqual(zipfile.ZIP_STORED, zf.getinfo("A.class").compress_type)
+            self.assertEqual(b"a" * 1000, zf.read("A.class"))
+
+    def test_duplicates(self):
+        first = self.create_jar(
+            "first.jar",
+            {"A.class": b"first", "META-INF/services/S": b"one", "B.class": b"first"},
+            compress_type=zipfile.ZIP_STORED,
+        )
+        second = self.create_jar(
+            "second.jar",
+            {"A.class": b"second", "META-INF/services/S": b"two", "B.class": b"second"},
+        )
+        rules = JarRules(
+            rules=[
+                Duplicate(r"^META-INF/services/", Duplicate.CONCAT_TEXT),
+                Duplicate(r"^B\.class$", Duplicate.REPLACE),
+            ],
+            default_dup_action=Duplicate.SKIP,
+        )
+        merged = self.merge(jar_rules=rules, jars=[first, second])
+        with open_zip(merged) as zf:
+            self.assertEqual(b"first", zf.read("A.class"))
+            self.assertEqual(b"second", zf.read("B.class"))
+            self.assertEqual(b"one\ntwo", zf.read("META-INF/services/S"))
+
+    def test_duplicate_fail(self):
+        first = self.create_jar("first.jar", {"A.class": b"first"})
+        second = self.create_jar("second.jar", {"A.class": b"second"})
+        with self.assertRaises(Duplicate.Error):
+            self.merge(jar_rules=JarRules(default_dup_action=Duplicate.FAIL), jars=[first, second])
+
+    def test_skip(self):
+        jar = self.create_jar("a.jar", {"META-INF/SIGNER.SF": b"sig", "A.class": b"a"})
+        merged = self.merge(jar_rules=JarRules(rules=[Skip(r"^META-INF/[^/]+\.SF$")]), jars=[jar])
+        with open_zip(merged) as zf:
+            self.assertEqual(["META-INF/", "META-INF/MANIFEST.MF", "A.class"], zf.namelist())
+
+    def test_rule_patterns_match_anywhere_in_paths(self):
+        jar = self.create_jar(
+            "a.jar", {"a/META-INF/SIGNER.SF": b"sig", "a/SIGNER.SFX": b"x", "A.class": b"a"}
+        )
+        merged = self.merge(jar_rules=JarRules(rules=[Skip(r"META-INF/.*\.SF$")]), jars=[jar])
+        with open_zip(merged) as zf:
+            self.assertEqual(
+                ["META-INF/", "META-INF/MANIFEST.MF", "a/", "a/SIGNER.SFX", "A.class"],
+                zf.namelist(),
+            )
+
+    def test_directory(self):
+        classes = os.path.join(self.tmpdir, "classes")
+        safe_file_dump(os.path.join(classes, "a/B.class"), "b")
+        os.makedirs(os.path.join(classes, "empty"))
+        path = os.path.join(self.tmpdir, "merged.jar")
+        merger = JarMerger(path, compressed=True, jar_rules=JarRules())
+        merger.add_directory(classes, "prefix")
+        merger.write(Manifest())
+        with open_zip(path) as zf:
+            self.assertEqual(
+                [
+                    "META-INF/",
+                    "META-INF/MANIFEST.MF",
+                    "prefix/",
+                    "prefix/a/",
+                    "prefix/empty/",
+                    "prefix/a/B.class",
+                ],
+                zf.namelist(),
+            )
+            self.assertEqual(b"b", zf.read("prefix/a/B.class"))
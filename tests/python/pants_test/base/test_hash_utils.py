@@ -4,7 +4,9 @@
 import hashlib
 import json
 import math
+import os
 import re
+import time
 import unittest
 from collections import OrderedDict
 from enum import Enum
@@ -16,6 +18,7 @@ from pants.base.hash_utils import (
     hash_all,
     hash_dir,
     hash_file,
+    hash_files,
     stable_json_sha1,
 )
 from pants.util.contextutil import temporary_dir, temporary_file, temporary_file_path
@@ -40,6 +43,79 @@ class TestHashUtils(unittest.TestCase):
 
             self.assertEqual(expected_hash.hexdigest(), hash_file(fd.name, digest=hashlib.md5()))
 
+    def test_hash_files(self):
+        with temporary_dir() as root:
+            contents = [b"jake jones", b"", b"jane george" * 200000]
+            paths = []
+            for index, content in enumerate(contents):
+                path = os.path.join(root, str(index))
+                with open(path, "wb") as fp:
+                    fp.write(content)
+                paths.append(path)
+
+            expected = [hashlib.sha1(content).hexdigest() for content in contents]
+            self.assertEqual(expected, hash_files(paths))
+            self.assertEqual(expected[2], hash_file(paths[2]))
+            self.assertEqual(expected[:1], hash_files(paths[:1]))
+            self.assertEqual([], hash_files([]))
+
+    def test_hash_file_truncated_while_read(self):
+        with temporary_file() as fd:
+            fd.write(b"jake jones" * 300000)
+            fd.close()
+
+            class TruncatingDigest:
+                def __init__(self):
+                    self._digest = hashlib.sha1()
+
+                def update(self, data):
+                    os.truncate(fd.name, 0)
+                    self._digest.update(data)
+
+                def hexdigest(self):
+                    return self._digest.hexdigest()
+
+            # The read comes up short, rather than faulting as a memory-mapped read would.
+            self.assertEqual(
+                hashlib.sha1((b"jake jones" * 300000)[: 1024 * 1024]).hexdigest(),
+                hash_file(fd.name, digest=TruncatingDigest()),
+            )
+
+    def test_hash_files_memoized(self):
+        with temporary_dir() as root:
+            path = os.path.join(root, "a")
+            with open(path, "wb") as fp:
+                fp.write(b"jake jones")
+            an_hour_ago = int(time.time() - 3600) * 1000000000
+            os.utime(path, ns=(an_hour_ago, an_hour_ago))
+            self.assertEqual([hash_file(path)], hash_files([path], memoize=True))
+
+            # A change to the contents that leaves the size and mtime alone goes unnoticed...
+            stat = os.stat(path)
+            with open(path, "wb") as fp:
+                fp.write(b"jane jones")
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            self.assertNotEqual([hash_file(path)], hash_files([path], memoize=True))
+            self.assertEqual([hash_file(path)], hash_files([path]))
+
+            # ...but any other change is not.
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+            self.assertEqual([hash_file(path)], hash_files([path], memoize=True))
+
+    def test_hash_files_recently_modified_not_memoized(self):
+        with temporary_dir() as root:
+            path = os.path.join(root, "a")
+            with open(path, "wb") as fp:
+                fp.write(b"jake jones")
+            self.assertEqual([hash_file(path)], hash_files([path], memoize=True))
+
+            # A change within the granularity of the mtime is still noticed.
+            stat = os.stat(path)
+            with open(path, "wb") as fp:
+                fp.write(b"jane jones")
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            self.assertEqual([hash_file(path)], hash_files([path], memoize=True))
+
     def test_hash_dir_invalid(self):
         with temporary_file_path() as path:
             with self.assertRaises(TypeError):
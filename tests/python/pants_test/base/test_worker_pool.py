@@ -1,23 +1,54 @@
 # Copyright 2015 Pants project contributors (see CONTRIBUTORS.md).
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
+import logging
+import os
 import threading
 import unittest
+from contextlib import contextmanager
 
-from pants.base.worker_pool import Work, WorkerPool
+from pants.base.worker_pool import ProcessWorkerPool, Work, WorkerPool
+from pants.cache.artifact_cache import ArtifactCache, call_insert
 from pants.base.workunit import WorkUnit
+from pants.reporting.report import Report
 from pants.util.contextutil import temporary_dir
 
 
 class FakeRunTracker:
+    def __init__(self):
+        self.logged = []
+        self.workunits = []
+
     def register_thread(self, one):
         pass
 
+    @contextmanager
+    def new_workunit_under_parent(self, name, parent):
+        self.workunits.append(name)
+        yield
+
+    def log(self, level, *msg_elements):
+        self.logged.append((level, "".join(msg_elements)))
+
 
 def keyboard_interrupt_raiser():
     raise KeyboardInterrupt()
 
 
+def square_and_report_pid(x):
+    logging.getLogger(__name__).warning("squaring {}".format(x))
+    return x * x, os.getpid()
+
+
+def value_error_raiser(message):
+    raise ValueError(message)
+
+
+class PidReportingArtifactCache(ArtifactCache):
+    def insert(self, cache_key, paths, overwrite=False):
+        return os.getpid()
+
+
 class WorkerPoolTest(unittest.TestCase):
     def test_keyboard_interrupts_propagated(self):
         condition = threading.Condition()
@@ -30,3 +61,45 @@ class WorkerPoolTest(unittest.TestCase):
                     condition.wait(2)
                 finally:
                     pool.abort()
+
+
+class ProcessWorkerPoolTest(unittest.TestCase):
+    @contextmanager
+    def pool(self):
+        run_tracker = FakeRunTracker()
+        with temporary_dir() as rundir:
+            pool = ProcessWorkerPool(WorkUnit(rundir, None, "work"), run_tracker, 2, "test")
+            try:
+                yield pool, run_tracker
+            finally:
+                pool.shutdown()
+
+    def test_cpu_bound_work_runs_in_subprocesses(self):
+        with self.pool() as (pool, run_tracker):
+            work = Work(square_and_report_pid, [(1,), (2,), (3,)], "square", cpu_bound=True)
+            results = pool.submit_work_and_wait(work)
+        self.assertEqual([1, 4, 9], [square for square, _ in results])
+        self.assertNotIn(os.getpid(), {pid for _, pid in results})
+        self.assertEqual(["square"] * 3, run_tracker.workunits)
+        self.assertEqual(
+            [(Report.WARN, "squaring {}".format(x)) for x in (1, 2, 3)], sorted(run_tracker.logged)
+        )
+
+    def test_other_work_runs_in_threads(self):
+        with self.pool() as (pool, _):
+            results = pool.submit_work_and_wait(Work(square_and_report_pid, [(2,)]))
+        self.assertEqual([(4, os.getpid())], results)
+
+    def test_errors_propagated(self):
+        with self.pool() as (pool, _):
+            with self.assertRaisesRegex(ValueError, "bad input"):
+                pool.submit_work_and_wait(
+                    Work(value_error_raiser, [("bad input",)], cpu_bound=True)
+                )
+
+    def test_artifact_inserts_run_in_subprocesses(self):
+        with temporary_dir() as artifact_root, self.pool() as (pool, _):
+            cache = PidReportingArtifactCache(artifact_root)
+            work = Work(call_insert, [((cache, "key", [], False),)], "insert", cpu_bound=True)
+            (pid,) = pool.submit_work_and_wait(work)
+        self.assertNotEqual(os.getpid(), pid)
@@ -1,13 +1,14 @@
 # Copyright 2014 Pants project contributors (see CONTRIBUTORS.md).
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
+import sys
 import unittest
 from collections import defaultdict
 
 from pants.backend.jvm.targets.jar_library import JarLibrary
 from pants.build_graph.address import Address, parse_spec
 from pants.build_graph.address_lookup_error import AddressLookupError
-from pants.build_graph.build_graph import BuildGraph
+from pants.build_graph.build_graph import BuildGraph, sort_targets
 from pants.build_graph.target import Target
 from pants.java.jar.jar_dependency import JarDependency
 from pants.testutil.test_base import TestBase
@@ -182,6 +183,18 @@ class BuildGraphTest(TestBase):
         )
         assertDependeeWalkPreludeEpilogue(b, ["b-pre", "b-epi", "b"], postorder=True)
 
+    def test_walk_deeper_than_recursion_limit(self):
+        chain = [self.make_target("deep:t0")]
+        for i in range(1, sys.getrecursionlimit() + 100):
+            chain.append(self.make_target(f"deep:t{i}", dependencies=[chain[-1]]))
+        top = chain[-1]
+
+        postorder = self.build_graph.transitive_subgraph_of_addresses([top.address], postorder=True)
+        self.assertEqual(chain, list(postorder))
+        dependees = self.build_graph.transitive_dependees_of_addresses([chain[0].address])
+        self.assertEqual(chain, list(dependees))
+        self.assertEqual(chain[::-1], sort_targets([top]))
+
     def test_target_closure(self):
         a = self.make_target("a")
         self.assertEqual(OrderedSet([a]), a.closure())
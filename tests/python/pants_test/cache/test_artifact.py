@@ -1,13 +1,22 @@
 # Copyright 2015 Pants project contributors (see CONTRIBUTORS.md).
 # Licensed under the Apache License, Version 2.0 (see LICENSE).
 
+import io
 import os
+import stat
+import tarfile
 import unittest
 
-from pants.cache.artifact import ArtifactError, DirectoryArtifact, TarballArtifact
+from pants.cache.artifact import (
+    ArtifactError,
+    ContentAddressedArtifact,
+    DirectoryArtifact,
+    TarballArtifact,
+)
+from pants.cache.blob_store import BlobStore
 from pants.testutil.test_base import TestBase
 from pants.util.contextutil import temporary_dir
-from pants.util.dirutil import safe_mkdir, safe_open
+from pants.util.dirutil import safe_mkdir, safe_open, touch
 
 
 class TarballArtifactTest(TestBase):
@@ -75,6 +84,61 @@ class TarballArtifactTest(TestBase):
             with self.assertRaises(ArtifactError):
                 artifact.extract()
 
+    def test_extract_from_stream(self):
+        with temporary_dir() as tmpdir:
+            artifact_root = os.path.join(tmpdir, "artifacts")
+            extraction_root = os.path.join(tmpdir, "extracted")
+            tarball = os.path.join(tmpdir, "some.tar")
+            path = self.touch_file_in(artifact_root, content="pants" * 10000)
+
+            TarballArtifact(artifact_root, artifact_root, tarball, compression_threads=4).collect(
+                [path]
+            )
+            with open(tarball, "rb") as fd:
+                data = fd.read()
+
+            tee = io.BytesIO()
+            artifact = TarballArtifact(artifact_root, extraction_root, "unused.tar")
+            artifact.extract_from((data[i : i + 1000] for i in range(0, len(data), 1000)), tee=tee)
+
+            self.assertEqual(data, tee.getvalue())
+            with open(os.path.join(extraction_root, "some.file")) as fd:
+                self.assertEqual("pants" * 10000, fd.read())
+
+    def test_corrupt_stream_extraction(self):
+        with temporary_dir() as tmpdir:
+            artifact = TarballArtifact(
+                artifact_root=tmpdir, artifact_extraction_root=tmpdir, tarfile_="unused.tar"
+            )
+            with self.assertRaises(ArtifactError):
+                artifact.extract_from([b"invalid"])
+
+    def test_unsafe_stream_extraction(self):
+        def member(name, **attrs):
+            info = tarfile.TarInfo(name)
+            for attr, value in attrs.items():
+                setattr(info, attr, value)
+            return info
+
+        unsafe_members = [
+            member("../escaped"),
+            member("/absolute"),
+            member("a/../../escaped"),
+            member("link", type=tarfile.SYMTYPE, linkname="../outside"),
+            member("link", type=tarfile.SYMTYPE, linkname="/outside"),
+            member("hardlink", type=tarfile.LNKTYPE, linkname="../outside"),
+        ]
+        for unsafe_member in unsafe_members:
+            with temporary_dir() as tmpdir:
+                data = io.BytesIO()
+                with tarfile.open(fileobj=data, mode="w:gz") as tarout:
+                    tarout.addfile(unsafe_member, io.BytesIO(b""))
+                extraction_root = os.path.join(tmpdir, "extracted")
+                artifact = TarballArtifact(tmpdir, extraction_root, "unused.tar")
+                with self.assertRaises(ArtifactError):
+                    artifact.extract_from([data.getvalue()])
+                self.assertEqual([], os.listdir(tmpdir))
+
     def touch_file_in(self, artifact_root, content=""):
         path = os.path.join(artifact_root, "some.file")
         with safe_open(path, "w") as f:
@@ -101,3 +165,52 @@ class DirectoryArtifactTest(unittest.TestCase):
 
             artifact = DirectoryArtifact(artifact_root, artifact_dir)
             self.assertFalse(artifact.exists())
+
+
+class ContentAddressedArtifactTest(unittest.TestCase):
+    def test_collect_and_extract(self):
+        with temporary_dir() as tmpdir:
+            artifact_root = os.path.join(tmpdir, "artifacts")
+            extraction_root = os.path.join(tmpdir, "extracted")
+            blob_store = BlobStore(os.path.join(tmpdir, "cache"))
+            for relpath in ("a/one.class", "a/b/two.class", "a/b/same.class"):
+                with safe_open(os.path.join(artifact_root, relpath), "w") as fd:
+                    fd.write("pants" if relpath != "a/b/same.class" else "build")
+            safe_mkdir(os.path.join(artifact_root, "a/empty"))
+            os.chmod(os.path.join(artifact_root, "a/one.class"), 0o755)
+
+            manifest = os.path.join(tmpdir, "cache", "some.manifest")
+            collected = ContentAddressedArtifact(artifact_root, artifact_root, manifest, blob_store)
+            collected.collect([os.path.join(artifact_root, "a")])
+            self.assertTrue(collected.exists())
+            self.assertEqual(15, collected.size)
+            # The two files with the same contents share a blob.
+            self.assertEqual(2, len(collected.digests()))
+
+            extracted = ContentAddressedArtifact(
+                artifact_root, extraction_root, manifest, blob_store, hardlink=True
+            )
+            extracted.extract()
+            self.assertEqual(15, extracted.size)
+            with open(os.path.join(extraction_root, "a/b/two.class")) as fd:
+                self.assertEqual("pants", fd.read())
+            self.assertTrue(os.path.isdir(os.path.join(extraction_root, "a/empty")))
+            # Executable files are copied rather than hardlinked, to keep their own mode.
+            one = os.stat(os.path.join(extraction_root, "a/one.class"))
+            self.assertEqual((0o755, 1), (stat.S_IMODE(one.st_mode), one.st_nlink))
+            self.assertEqual(2, os.stat(os.path.join(extraction_root, "a/b/two.class")).st_nlink)
+
+    def test_incomplete_manifest_extraction(self):
+        with temporary_dir() as tmpdir:
+            path = os.path.join(tmpdir, "some.file")
+            touch(path)
+            manifest = os.path.join(tmpdir, "some.manifest")
+            blob_store = BlobStore(tmpdir)
+            ContentAddressedArtifact(tmpdir, tmpdir, manifest, blob_store).collect([path])
+            with open(manifest, "rb") as fd:
+                lines = fd.readlines()
+            with open(manifest, "wb") as fd:
+                fd.writelines(lines[:-1])
+
+            with self.assertRaises(ArtifactError):
+                ContentAddressedArtifact(tmpdir, tmpdir, manifest, blob_store).extract()
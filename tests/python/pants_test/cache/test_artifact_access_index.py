@@ -0,0 +1,103 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import os
+import tempfile
+import unittest
+
+from pants.cache.artifact_access_index import ArtifactAccessIndex
+from pants.util.dirutil import safe_file_dump, safe_rmtree
+
+
+class ArtifactAccessIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(safe_rmtree, self.root)
+
+    def artifact(self, relpath, size, age=0):
+        path = os.path.join(self.root, relpath)
+        safe_file_dump(path, "x" * size)
+        mtime = os.path.getmtime(path) - age
+        os.utime(path, (mtime, mtime))
+        return path
+
+    def evict(self, index, max_size_bytes=None, max_age_secs=None, max_evictions=10, keep=()):
+        return index.evict(
+            max_size_bytes,
+            max_age_secs,
+            max_evictions=max_evictions,
+            max_seed_entries=10,
+            keep=keep,
+        )
+
+    def test_evicts_least_recently_used(self):
+        index = ArtifactAccessIndex(self.root)
+        old = self.artifact("task/a/old.tgz", 10, age=300)
+        used = self.artifact("task/a/used.tgz", 10, age=200)
+        new = self.artifact("task/b/new.tgz", 10, age=100)
+        index.record_access(used)
+
+        self.assertEqual([old, new], self.evict(index, max_size_bytes=10))
+        self.assertTrue(os.path.exists(used))
+        self.assertEqual(10, index.total_size)
+
+    def test_evicts_by_age(self):
+        index = ArtifactAccessIndex(self.root)
+        old = self.artifact("task/a/old.tgz", 10, age=300)
+        new = self.artifact("task/a/new.tgz", 10)
+
+        self.assertEqual([old], self.evict(index, max_age_secs=200))
+        self.assertTrue(os.path.exists(new))
+
+    def test_bounded_evictions(self):
+        index = ArtifactAccessIndex(self.root)
+        paths = [self.artifact("task/a/{}.tgz".format(i), 10, age=100 - i) for i in range(4)]
+
+        self.assertEqual(paths[:2], self.evict(index, max_size_bytes=0, max_evictions=2))
+        self.assertEqual(paths[2:], self.evict(index, max_size_bytes=0, max_evictions=2))
+
+    def test_keep(self):
+        index = ArtifactAccessIndex(self.root)
+        kept = self.artifact("task/a/kept.tgz", 10, age=200)
+        other = self.artifact("task/a/other.tgz", 10, age=100)
+
+        self.assertEqual([other], self.evict(index, max_size_bytes=0, keep=[kept]))
+        self.assertTrue(os.path.exists(kept))
+
+    def test_persisted_across_processes(self):
+        old = self.artifact("task/a/old.tgz", 10, age=300)
+        new = self.artifact("task/a/new.tgz", 10, age=200)
+        ArtifactAccessIndex(self.root).record_access(old)
+
+        # Another index over the same root only learns of the access through the log.
+        os.utime(old, (0, 0))
+        index = ArtifactAccessIndex(self.root)
+        self.assertEqual([new], self.evict(index, max_size_bytes=10))
+
+    def test_indexed_paths(self):
+        index = ArtifactAccessIndex(self.root)
+        old = self.artifact("task/a/old.tgz", 10, age=300)
+        self.assertIsNone(index.indexed_paths())
+
+        self.evict(index)
+        self.assertEqual([old], index.indexed_paths())
+
+        # Artifacts recorded by other processes are listed too.
+        new = self.artifact("task/b/new.manifest", 10)
+        ArtifactAccessIndex(self.root).record_access(new)
+        self.assertEqual({old, new}, set(index.indexed_paths()))
+
+    def test_removed_files_are_forgotten(self):
+        index = ArtifactAccessIndex(self.root)
+        gone = self.artifact("task/a/gone.tgz", 10, age=300)
+        removed = self.artifact("task/a/removed.tgz", 10, age=200)
+        kept = self.artifact("task/a/kept.tgz", 10, age=100)
+
+        self.assertEqual([], self.evict(index, max_size_bytes=30))
+        os.unlink(gone)
+        os.unlink(removed)
+        index.record_removal(removed)
+
+        self.assertEqual([], self.evict(index, max_size_bytes=10))
+        self.assertTrue(os.path.exists(kept))
+        self.assertEqual(10, index.total_size)
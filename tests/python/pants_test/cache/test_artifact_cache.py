@@ -10,12 +10,17 @@ from typing import Iterator
 import pytest
 
 from pants.cache.artifact import TarballArtifact
+from pants.cache.artifact_access_index import ArtifactAccessIndex
 from pants.cache.artifact_cache import (
     NonfatalArtifactCacheError,
     call_insert,
     call_use_cached_files,
 )
-from pants.cache.local_artifact_cache import LocalArtifactCache, TempLocalArtifactCache
+from pants.cache.local_artifact_cache import (
+    ContentAddressedLocalArtifactCache,
+    LocalArtifactCache,
+    TempLocalArtifactCache,
+)
 from pants.cache.pinger import BestUrlSelector, InvalidRESTfulCacheProtoError
 from pants.cache.restful_artifact_cache import RequestsSession, RESTfulArtifactCache
 from pants.invalidation.build_invalidator import CacheKey
@@ -36,16 +41,19 @@ class TestArtifactCache(TestBase):
         return super().subsystems + (RequestsSession.Factory,)
 
     @contextmanager
-    def setup_local_cache(self, seperate_extraction_root=False):
+    def setup_local_cache(self, seperate_extraction_root=False, content_addressed=False):
         with temporary_dir() as artifact_root:
             with temporary_dir() as artifact_extraction_root:
                 with temporary_dir() as cache_root:
                     extraction_root = (
                         artifact_extraction_root if seperate_extraction_root else artifact_root
                     )
-                    yield LocalArtifactCache(
-                        artifact_root, extraction_root, cache_root, compression=1
+                    cache_type = (
+                        ContentAddressedLocalArtifactCache
+                        if content_addressed
+                        else LocalArtifactCache
                     )
+                    yield cache_type(artifact_root, extraction_root, cache_root, compression=1)
 
     @contextmanager
     def setup_server(self, return_failed=False, cache_root=None):
@@ -99,6 +107,52 @@ class TestArtifactCache(TestBase):
         with self.setup_local_cache(seperate_extraction_root=True) as artifact_cache:
             self.do_test_artifact_cache(artifact_cache)
 
+    def test_local_cache_eviction(self):
+        with temporary_dir() as artifact_root, temporary_dir() as cache_root:
+            artifact_cache = LocalArtifactCache(
+                artifact_root,
+                artifact_root,
+                os.path.join(cache_root, "task"),
+                compression=1,
+                max_cache_size_bytes=0,
+                eviction_root=cache_root,
+            )
+            key1 = CacheKey("muppet_key", "fake_hash1")
+            key2 = CacheKey("muppet_key", "fake_hash2")
+            with self.setup_test_file(artifact_root) as path:
+                artifact_cache.insert(key1, [path])
+                self.assertTrue(artifact_cache.has(key1))
+
+                # The newly stored artifact is kept even though it exceeds the budget on its own, but
+                # the least recently used one is evicted to make room for it.
+                artifact_cache.insert(key2, [path])
+                self.assertFalse(artifact_cache.has(key1))
+                self.assertTrue(artifact_cache.has(key2))
+
+    def test_local_cache_prune_records_removals(self):
+        with temporary_dir() as artifact_root, temporary_dir() as cache_root:
+            artifact_cache = LocalArtifactCache(
+                artifact_root,
+                artifact_root,
+                cache_root,
+                compression=1,
+                max_entries_per_target=1,
+                max_cache_size_bytes=1024 * 1024,
+            )
+            key1 = CacheKey("muppet_key", "fake_hash1")
+            key2 = CacheKey("muppet_key", "fake_hash2")
+            with self.setup_test_file(artifact_root) as path:
+                artifact_cache.insert(key1, [path])
+                artifact_cache.insert(key2, [path])
+            self.assertFalse(artifact_cache.has(key1))
+
+            # A fresh view of the index no longer counts the pruned artifact.
+            index = ArtifactAccessIndex(cache_root)
+            index.evict(None, None, max_evictions=0, max_seed_entries=0)
+            self.assertEqual(
+                os.path.getsize(artifact_cache._cache_file_for_key(key2)), index.total_size
+            )
+
     @pytest.mark.flaky(retries=1)  # https://github.com/pantsbuild/pants/issues/6838
     def test_restful_cache(self):
         with self.assertRaises(InvalidRESTfulCacheProtoError):
@@ -155,10 +209,45 @@ class TestArtifactCache(TestBase):
             artifact_cache.delete(key)
             self.assertFalse(artifact_cache.has(key))
 
+    def test_content_addressed_local_cache(self):
+        with self.setup_local_cache(content_addressed=True) as artifact_cache:
+            self.do_test_artifact_cache(artifact_cache)
+
     def test_local_backed_remote_cache(self):
+        self.do_test_local_backed_remote_cache()
+
+    def test_content_addressed_local_backed_remote_cache(self):
+        self.do_test_local_backed_remote_cache(content_addressed=True)
+
+    def test_content_addressed_local_backed_remote_cache_with_seperate_extraction_root(self):
+        with self.setup_server() as server:
+            with self.setup_local_cache(
+                seperate_extraction_root=True, content_addressed=True
+            ) as local:
+                tmp = TempLocalArtifactCache(local.artifact_root, local.artifact_extraction_root, 0)
+                remote = RESTfulArtifactCache(
+                    local.artifact_root, BestUrlSelector([server.url]), tmp
+                )
+                combined = RESTfulArtifactCache(
+                    local.artifact_root, BestUrlSelector([server.url]), local
+                )
+                key = CacheKey("muppet_key", "fake_hash")
+                with self.setup_test_file(local.artifact_root) as path:
+                    remote.insert(key, [path])
+                relpath = os.path.relpath(path, local.artifact_root)
+
+                # The backfilled artifact is stored from where it was extracted.
+                self.assertTrue(bool(combined.use_cached_files(key)))
+                extracted = os.path.join(local.artifact_extraction_root, relpath)
+                os.unlink(extracted)
+                self.assertTrue(bool(local.use_cached_files(key)))
+                with open(extracted, "rb") as f:
+                    self.assertEqual(TEST_CONTENT1, f.read())
+
+    def do_test_local_backed_remote_cache(self, content_addressed=False):
         """make sure that the combined cache finds what it should and that it backfills."""
         with self.setup_server() as server:
-            with self.setup_local_cache() as local:
+            with self.setup_local_cache(content_addressed=content_addressed) as local:
                 tmp = TempLocalArtifactCache(local.artifact_root, local.artifact_extraction_root, 0)
                 remote = RESTfulArtifactCache(
                     local.artifact_root, BestUrlSelector([server.url]), tmp
@@ -265,6 +354,42 @@ class TestArtifactCache(TestBase):
                 call_insert((cache, key, [path], False))
                 self.assertFalse(call_use_cached_files((cache, key, None)))
 
+    def do_test_batched_lookups(self, cache):
+        hit_key = CacheKey("muppet_key", "fake_hash")
+        miss_keys = [CacheKey("missing_key_{}".format(i), "fake_hash") for i in range(5)]
+        all_keys = [hit_key] + miss_keys
+
+        self.assertEqual(
+            {key: False for key in all_keys},
+            dict(cache.use_cached_files_many((key, None) for key in all_keys)),
+        )
+        with self.setup_test_file(cache.artifact_root) as path:
+            cache.insert(hit_key, [path])
+        expected = {key: key == hit_key for key in all_keys}
+        self.assertEqual(
+            expected, dict(cache.use_cached_files_many((key, None) for key in all_keys))
+        )
+        with open(path, "rb") as infile:
+            self.assertEqual(TEST_CONTENT1, infile.read())
+
+    def test_local_cache_batched_lookups(self):
+        with self.setup_local_cache() as cache:
+            self.do_test_batched_lookups(cache)
+
+    def test_restful_cache_batched_lookups(self):
+        with self.setup_rest_cache() as cache:
+            self.do_test_batched_lookups(cache)
+
+    def test_failed_batched_lookups(self):
+        keys = [CacheKey("muppet_key_{}".format(i), "fake_hash") for i in range(3)]
+
+        # Failed requests should be reported as misses, but not raise exceptions.
+        with self.setup_rest_cache(return_failed=True) as cache:
+            self.assertEqual(
+                {key: False for key in keys},
+                dict(cache.use_cached_files_many((key, None) for key in keys)),
+            )
+
     def test_noops_after_max_retries_exceeded(self):
         key = CacheKey("muppet_key", "fake_hash")
 
@@ -0,0 +1,61 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import os
+import time
+import unittest
+
+from pants.cache.blob_store import BlobStore
+from pants.util.contextutil import temporary_dir
+from pants.util.dirutil import safe_file_dump
+
+
+class BlobStoreTest(unittest.TestCase):
+    def test_add_dedups_contents(self):
+        with temporary_dir() as tmpdir:
+            store = BlobStore(tmpdir)
+            first = os.path.join(tmpdir, "first")
+            second = os.path.join(tmpdir, "second")
+            safe_file_dump(first, "pants")
+            safe_file_dump(second, "pants")
+
+            digest, size = store.add(first)
+            self.assertEqual((digest, size), store.add(second))
+            self.assertEqual(5, size)
+            self.assertEqual([digest[2:]], os.listdir(os.path.dirname(store.path_for(digest))))
+
+    def test_materialize(self):
+        with temporary_dir() as tmpdir:
+            store = BlobStore(tmpdir)
+            src = os.path.join(tmpdir, "src")
+            safe_file_dump(src, "pants")
+            digest, _ = store.add(src)
+
+            copied = os.path.join(tmpdir, "out", "copied")
+            store.materialize(digest, copied, 0o644)
+            with open(copied) as fd:
+                self.assertEqual("pants", fd.read())
+            self.assertEqual(1, os.stat(copied).st_nlink)
+
+            linked = os.path.join(tmpdir, "out", "linked")
+            safe_file_dump(linked, "stale")
+            store.materialize(digest, linked, 0o644, hardlink=True)
+            self.assertTrue(os.path.samefile(store.path_for(digest), linked))
+
+    def test_collect_garbage(self):
+        with temporary_dir() as tmpdir:
+            store = BlobStore(tmpdir)
+            digests = []
+            for content in ("live", "dead", "recent"):
+                path = os.path.join(tmpdir, content)
+                safe_file_dump(path, content)
+                digests.append(store.add(path)[0])
+            live, dead, recent = digests
+            old = time.time() - 120
+            for digest in (live, dead):
+                os.utime(store.path_for(digest), (old, old))
+
+            self.assertEqual(1, store.collect_garbage({live}, grace_secs=60))
+            self.assertTrue(os.path.exists(store.path_for(live)))
+            self.assertFalse(os.path.exists(store.path_for(dead)))
+            self.assertTrue(os.path.exists(store.path_for(recent)))
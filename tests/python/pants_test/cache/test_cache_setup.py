@@ -15,7 +15,10 @@ from pants.cache.cache_setup import (
     RemoteCacheSpecRequiredError,
     TooManyCacheSpecsError,
 )
-from pants.cache.local_artifact_cache import LocalArtifactCache
+from pants.cache.local_artifact_cache import (
+    ContentAddressedLocalArtifactCache,
+    LocalArtifactCache,
+)
 from pants.cache.resolver import Resolver
 from pants.cache.restful_artifact_cache import RESTfulArtifactCache
 from pants.subsystem.subsystem import Subsystem
@@ -84,7 +87,12 @@ class TestCacheSetup(TestBase):
             "write_to": [self.EMPTY_URI],
             "write": False,
             "compression_level": 1,
+            "compression_threads": 1,
             "max_entries_per_target": 1,
+            "max_local_cache_size_bytes": None,
+            "max_local_cache_entry_age": None,
+            "local_artifact_layout": "tarball",
+            "hardlink_cached_files": False,
             "write_permissions": None,
             "dereference_symlinks": True,
             # Usually read from global scope.
@@ -179,10 +187,13 @@ class TestCacheSetup(TestBase):
         )
 
     def test_cache_spec_parsing(self):
-        def mk_cache(spec, resolver=None):
+        def mk_cache(spec, resolver=None, **options):
             Subsystem.reset()
             self.set_options_for_scope(
-                CacheSetup.subscope(DummyTask.options_scope), read_from=spec, compression=1
+                CacheSetup.subscope(DummyTask.options_scope),
+                read_from=spec,
+                compression=1,
+                **options,
             )
             self.context(for_task_types=[DummyTask])  # Force option initialization.
             cache_factory = CacheSetup.create_cache_factory_for_task(
@@ -190,8 +201,8 @@ class TestCacheSetup(TestBase):
             )
             return cache_factory.get_read_cache()
 
-        def check(expected_type, spec, resolver=None):
-            cache = mk_cache(spec, resolver=resolver)
+        def check(expected_type, spec, resolver=None, **options):
+            cache = mk_cache(spec, resolver=resolver, **options)
             self.assertIsInstance(cache, expected_type)
             self.assertEqual(cache.artifact_root, self.pants_workdir)
 
@@ -200,6 +211,11 @@ class TestCacheSetup(TestBase):
                 tmpdir, "cachedir"
             )  # Must be a real path, so we can safe_mkdir it.
             check(LocalArtifactCache, [cachedir])
+            check(
+                ContentAddressedLocalArtifactCache,
+                [cachedir],
+                local_artifact_layout="content-addressed",
+            )
             check(RESTfulArtifactCache, ["http://localhost/bar"])
             check(RESTfulArtifactCache, ["https://localhost/bar"])
             check(RESTfulArtifactCache, [cachedir, "http://localhost/bar"])
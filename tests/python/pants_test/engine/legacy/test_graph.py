@@ -3,11 +3,15 @@
 
 import functools
 import os
+import unittest
+from concurrent.futures import ThreadPoolExecutor
 from typing import cast
 
+from pants.build_graph.address import Address
 from pants.build_graph.address_lookup_error import AddressLookupError
 from pants.build_graph.build_file_aliases import BuildFileAliases, TargetMacro
 from pants.build_graph.files import Files
+from pants.engine.legacy.graph import _DependentGraph
 from pants.testutil.test_base import TestBase
 
 
@@ -89,3 +93,101 @@ class GraphTest(TestBase):
         files = self.create_library(path="src/example", target_type="tagged_files", name="things")
         self.assertIn(self._TAG, files.tags)
         self.assertEqual(type(files), Files)
+
+
+class FakeTargetAdaptor:
+    type_alias = "files"
+
+    def __init__(self, spec, *dependency_specs):
+        self.address = Address.parse(spec)
+        self.dependencies = [Address.parse(s) for s in dependency_specs]
+
+    def kwargs(self):
+        return {}
+
+
+class FakeAddressMapper:
+    subproject_roots = ()
+
+
+class DependentGraphTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.graph = _DependentGraph({"files": Files}, FakeAddressMapper())
+
+    def dependents(self, spec):
+        return sorted(
+            a.spec for a in self.graph.transitive_dependents_of_addresses([Address.parse(spec)])
+        )
+
+    def test_update_reinjects_only_changed_targets(self) -> None:
+        a = FakeTargetAdaptor("src:a")
+        b = FakeTargetAdaptor("src:b", "src:a")
+        c = FakeTargetAdaptor("src:c", "src:b")
+        self.graph.update([a, b, c])
+        self.assertEqual(["src:a", "src:b", "src:c"], self.dependents("src:a"))
+
+        # `c` now depends on `a` directly, and `b` is gone.
+        c2 = FakeTargetAdaptor("src:c", "src:a")
+        self.graph.update([a, c2])
+        self.assertEqual(["src:a", "src:c"], self.dependents("src:a"))
+        self.assertEqual(["src:b"], self.dependents("src:b"))
+        self.assertEqual({Address.parse("src:a")}, set(self.graph._dependent_address_map))
+
+    def test_update_reports_missing_dependencies_until_fixed(self) -> None:
+        a = FakeTargetAdaptor("src:a", "src:missing")
+        with self.assertRaisesRegex(AddressLookupError, "src:missing did not exist"):
+            self.graph.update([a])
+        # The unchanged dependent is not re-validated, but the dependency is still missing.
+        with self.assertRaisesRegex(AddressLookupError, "src:missing did not exist"):
+            self.graph.update([a])
+
+        self.graph.update([a, FakeTargetAdaptor("src:missing")])
+        self.assertEqual(["src:a", "src:missing"], self.dependents("src:missing"))
+
+        # Removing a dependent also removes its dependencies on missing targets.
+        b = FakeTargetAdaptor("src:b", "src:gone")
+        with self.assertRaisesRegex(AddressLookupError, "src:gone did not exist"):
+            self.graph.update([b])
+        self.graph.update([])
+        self.assertEqual({}, self.graph._dependent_address_map)
+
+    def test_updated_dependents_of_addresses(self) -> None:
+        a = FakeTargetAdaptor("src:a")
+        b = FakeTargetAdaptor("src:b", "src:a")
+        c = FakeTargetAdaptor("src:c", "src:b")
+        addresses = [Address.parse("src:a")]
+        self.assertEqual(
+            ["src:a", "src:b"],
+            [
+                d.spec
+                for d in self.graph.updated_dependents_of_addresses([a, b, c], addresses, False)
+            ],
+        )
+        self.assertEqual(
+            ["src:a", "src:b", "src:c"],
+            [
+                d.spec
+                for d in self.graph.updated_dependents_of_addresses([a, b, c], addresses, True)
+            ],
+        )
+
+    def test_concurrent_updates_and_queries(self) -> None:
+        generations = [
+            [FakeTargetAdaptor("src:a")]
+            + [FakeTargetAdaptor(f"src:t{i}", "src:a") for i in range(n)]
+            for n in range(1, 50)
+        ]
+        addresses = [Address.parse("src:a")]
+
+        def query(adaptors):
+            return len(self.graph.updated_dependents_of_addresses(adaptors, addresses, True))
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(query, generations * 4))
+        self.assertEqual([len(adaptors) for adaptors in generations * 4], results)
+
+    def test_for_configuration_is_shared(self) -> None:
+        address_mapper = FakeAddressMapper()
+        graph = _DependentGraph.for_configuration({"files": Files}, address_mapper)
+        self.assertIs(graph, _DependentGraph.for_configuration({"files": Files}, address_mapper))
+        self.assertIsNot(graph, _DependentGraph.for_configuration({}, address_mapper))
@@ -0,0 +1,77 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import unittest
+from textwrap import dedent
+
+from pants.engine.address_map_cache import AddressMapCache
+from pants.engine.mapper import AddressMapper
+from pants.engine.parser import SymbolTable
+from pants.util.contextutil import temporary_dir
+from pants_test.engine.examples.parsers import JsonParser
+
+
+class Thing:
+    def __init__(self, **kwargs):
+        self._kwargs = kwargs
+
+    def _asdict(self):
+        return self._kwargs
+
+    def __eq__(self, other):
+        return isinstance(other, Thing) and self._kwargs == other._kwargs
+
+
+class CountingJsonParser(JsonParser):
+    def __init__(self, symbol_table):
+        super().__init__(symbol_table)
+        self.parsed = []
+
+    def parse(self, filepath, filecontent):
+        self.parsed.append(filepath)
+        return super().parse(filepath, filecontent)
+
+
+class AddressMapCacheTest(unittest.TestCase):
+    CONTENT = dedent(
+        """
+        {
+          "type_alias": "thing",
+          "name": "one",
+          "age": 42
+        }
+        """
+    ).encode()
+
+    def mapper(self, root, parser_fingerprint="fp"):
+        parser = CountingJsonParser(SymbolTable({"thing": Thing}))
+        return AddressMapper(parser, address_map_cache=AddressMapCache(root, parser_fingerprint))
+
+    def test_unchanged_files_are_not_reparsed(self):
+        with temporary_dir() as root:
+            first = self.mapper(root)
+            address_map = first.parse("a/BUILD", self.CONTENT)
+            self.assertEqual(["a/BUILD"], first.parser.parsed)
+
+            # A later run reuses the parse.
+            second = self.mapper(root)
+            cached = second.parse("a/BUILD", self.CONTENT)
+            self.assertEqual([], second.parser.parsed)
+            self.assertEqual(address_map.path, cached.path)
+            self.assertEqual(address_map.objects_by_name, cached.objects_by_name)
+
+            # But not for changed contents, another path, or another parser configuration.
+            second.parse("a/BUILD", self.CONTENT.replace(b"42", b"43"))
+            second.parse("b/BUILD", self.CONTENT)
+            self.assertEqual(["a/BUILD", "b/BUILD"], second.parser.parsed)
+            third = self.mapper(root, parser_fingerprint="other")
+            third.parse("a/BUILD", self.CONTENT)
+            self.assertEqual(["a/BUILD"], third.parser.parsed)
+
+    def test_fingerprint_for(self):
+        self.assertEqual(
+            AddressMapCache.fingerprint_for("a", "b"), AddressMapCache.fingerprint_for("a", "b")
+        )
+        self.assertNotEqual(
+            AddressMapCache.fingerprint_for("a", "b"), AddressMapCache.fingerprint_for("ab")
+        )
@@ -0,0 +1,57 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import time
+import unittest
+from unittest import mock
+
+from pants.goal.timing_history import TimingHistory, balance_by_duration
+from pants.util.contextutil import temporary_dir
+
+
+class TimingHistoryTest(unittest.TestCase):
+    def test_record_and_flush(self):
+        with temporary_dir() as root:
+            history = TimingHistory(root)
+            self.assertIsNone(history.get("compile.rsc", "zinc(a:a)"))
+            history.record("compile.rsc", "zinc(a:a)", 1.5)
+            history.record("compile.javac", "zinc(a:a)", 3.0)
+            self.assertEqual(1.5, history.get("compile.rsc", "zinc(a:a)"))
+
+            # Nothing is persisted until the history is flushed.
+            self.assertIsNone(TimingHistory(root).get("compile.rsc", "zinc(a:a)"))
+            history.flush()
+            reloaded = TimingHistory(root)
+            self.assertEqual(1.5, reloaded.get("compile.rsc", "zinc(a:a)"))
+            self.assertEqual(3.0, reloaded.get("compile.javac", "zinc(a:a)"))
+
+    def test_later_timings_decay_earlier_ones(self):
+        with temporary_dir() as root:
+            history = TimingHistory(root)
+            history.record("compile.rsc", "zinc(a:a)", 1.5)
+            history.flush()
+            history.record("compile.rsc", "zinc(a:a)", 2.5)
+            history.flush()
+            self.assertEqual(2.0, TimingHistory(root).get("compile.rsc", "zinc(a:a)"))
+
+    def test_old_timings_are_forgotten(self):
+        with temporary_dir() as root:
+            history = TimingHistory(root)
+            history.record("test.junit", "a:a", 1.0)
+            history.flush()
+            later = time.time() + TimingHistory._MAX_AGE_SECS + 60
+            with mock.patch("time.time", return_value=later):
+                self.assertIsNone(TimingHistory(root).get("test.junit", "a:a"))
+
+    def test_balance_by_duration(self):
+        durations = {"a": 8, "b": 1, "c": 4, "d": 4, "e": 1, "f": 2}
+        partitions = balance_by_duration(list("abcdef"), durations.get, 2, 3)
+        self.assertEqual([["a", "e", "f"], ["b", "c", "d"]], sorted(partitions))
+
+    def test_balance_by_duration_respects_max_size(self):
+        durations = {"a": 100, "b": 1, "c": 1, "d": 1}
+        partitions = balance_by_duration(list("abcd"), durations.get, 2, 2)
+        self.assertEqual([["a", "d"], ["b", "c"]], sorted(partitions))
+
+    def test_balance_by_duration_drops_empty_partitions(self):
+        self.assertEqual([["a"]], balance_by_duration(["a"], lambda _: 1, 3, 1))
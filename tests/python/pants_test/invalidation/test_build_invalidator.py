@@ -5,7 +5,8 @@ import tempfile
 import unittest
 from contextlib import contextmanager
 
-from pants.invalidation.build_invalidator import BuildInvalidator, CacheKey
+from pants.base.fingerprint_strategy import DefaultFingerprintStrategy
+from pants.invalidation.build_invalidator import BuildInvalidator, CacheKey, CacheKeyGenerator
 from pants.testutil.subsystem.util import init_subsystem
 from pants.util.contextutil import temporary_dir
 from pants.util.dirutil import safe_rmtree
@@ -39,6 +40,54 @@ class CacheKeyTest(unittest.TestCase):
         self.assertFalse(CacheKey.uncacheable(id="1").cacheable)
 
 
+class FakeTarget:
+    """Records the transitive fingerprints computed for it, and fails on deep recursion."""
+
+    def __init__(self, name, dependencies=()):
+        self.id = name
+        self.dependencies = list(dependencies)
+        self.computed = []
+        self._memoized = {}
+
+    def transitive_invalidation_hash(self, fingerprint_strategy=None, depth=0):
+        fingerprint_strategy = fingerprint_strategy or DefaultFingerprintStrategy()
+        if fingerprint_strategy not in self._memoized:
+            assert depth < 3, "Fingerprinted {} through deep recursion.".format(self.id)
+            dep_hashes = sorted(
+                dep.transitive_invalidation_hash(fingerprint_strategy, depth + 1)
+                for dep in self.dependencies
+            )
+            self.computed.append(fingerprint_strategy)
+            self._memoized[fingerprint_strategy] = "{}({})".format(self.id, ",".join(dep_hashes))
+        return self._memoized[fingerprint_strategy]
+
+
+class CacheKeyGeneratorTest(unittest.TestCase):
+    def test_transitive_key_computed_bottom_up(self):
+        # A chain deep enough that fingerprinting it recursively would trip the fake's assertion.
+        targets = [FakeTarget("t0")]
+        for i in range(1, 10):
+            targets.append(FakeTarget("t{}".format(i), [targets[-1]]))
+        diamond_top = FakeTarget("top", [targets[-1], targets[4]])
+
+        key = CacheKeyGenerator().key_for_target(diamond_top, transitive=True)
+        self.assertTrue(key.hash.startswith("top(t4(t3(t2(t1(t0())))),t9(t8(t7"))
+        for target in targets + [diamond_top]:
+            self.assertEqual([DefaultFingerprintStrategy()], target.computed)
+
+    def test_transitive_fingerprints_shared_between_generators(self):
+        leaf = FakeTarget("leaf")
+        middle = FakeTarget("middle", [leaf])
+        CacheKeyGenerator("task1").key_for_target(middle, transitive=True)
+        top = FakeTarget("top", [middle])
+        key1 = CacheKeyGenerator("task1").key_for_target(top, transitive=True)
+        key2 = CacheKeyGenerator("task2").key_for_target(top, transitive=True)
+        self.assertEqual(key1.hash.split("_")[0], key2.hash.split("_")[0])
+        self.assertNotEqual(key1, key2)
+        for target in (leaf, middle, top):
+            self.assertEqual(1, len(target.computed))
+
+
 class BaseBuildInvalidatorTest(unittest.TestCase):
     @staticmethod
     def ensure_key_id(key_id):
@@ -132,6 +181,13 @@ class BuildInvalidatorTest(BaseBuildInvalidatorTest):
             self.assertTrue(invalidator.needs_update(key2))
 
 
+class DirectoryBuildInvalidatorTest(BuildInvalidatorTest):
+    @contextmanager
+    def invalidator(self):
+        with temporary_dir() as root:
+            yield BuildInvalidator(root, fingerprint_store="directory")
+
+
 class BuildInvalidatorFactoryTest(BaseBuildInvalidatorTest):
     def setUp(self):
         pants_workdir = tempfile.mkdtemp()
@@ -165,3 +221,13 @@ class BuildInvalidatorFactoryTest(BaseBuildInvalidatorTest):
 
         self.assertTrue(self.scoped_invalidator1.needs_update(self.key))
         self.assertFalse(self.scoped_invalidator2.needs_update(self.key))
+
+    def test_flush_persists(self):
+        self.scoped_invalidator1.update(self.key)
+        self.scoped_invalidator1.flush()
+
+        reloaded_invalidator = BuildInvalidator.Factory.create(build_task="gen")
+        self.assertFalse(reloaded_invalidator.needs_update(self.key))
+        self.assertTrue(
+            BuildInvalidator.Factory.create(build_task="resolve").needs_update(self.key)
+        )
@@ -0,0 +1,138 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from pants.invalidation.fingerprint_store import DirectoryFingerprintStore, LogFingerprintStore
+from pants.util.dirutil import read_file, safe_file_dump, safe_rmtree
+from pants.util.record_log import RecordLog
+
+
+class LogFingerprintStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(safe_rmtree, self.root)
+
+    def log_file(self):
+        return os.path.join(self.root, LogFingerprintStore.LOG_FILE_NAME)
+
+    def test_buffered_until_flush(self):
+        store = LogFingerprintStore(self.root)
+        store.put("a", "1")
+        self.assertEqual("1", store.get("a"))
+        self.assertIsNone(LogFingerprintStore(self.root).get("a"))
+
+        store.flush()
+        self.assertEqual("1", LogFingerprintStore(self.root).get("a"))
+
+    def test_delete(self):
+        store = LogFingerprintStore(self.root)
+        store.put("a", "1")
+        store.put("b", "2")
+        store.flush()
+
+        store.delete("a")
+        self.assertIsNone(store.get("a"))
+        store.flush()
+
+        reloaded = LogFingerprintStore(self.root)
+        self.assertIsNone(reloaded.get("a"))
+        self.assertEqual("2", reloaded.get("b"))
+
+    def test_last_record_wins(self):
+        store = LogFingerprintStore(self.root)
+        store.put("a", "1")
+        store.flush()
+        store.put("a", "2")
+        store.flush()
+        self.assertEqual("2", LogFingerprintStore(self.root).get("a"))
+
+    def test_torn_and_corrupt_records_ignored(self):
+        store = LogFingerprintStore(self.root)
+        store.put("a", "1")
+        store.put("b", "2")
+        store.flush()
+
+        # Simulate a crash part way through appending a record, followed by a further append.
+        with open(self.log_file(), "ab") as fd:
+            fd.write(b"deadbeef c\t3\n")
+            fd.write(RecordLog._encode(("d", "4"))[:-3])
+
+        reloaded = LogFingerprintStore(self.root)
+        self.assertEqual("1", reloaded.get("a"))
+        self.assertEqual("2", reloaded.get("b"))
+        self.assertIsNone(reloaded.get("c"))
+        self.assertIsNone(reloaded.get("d"))
+
+        reloaded.put("e", "5")
+        reloaded.flush()
+        self.assertEqual("5", LogFingerprintStore(self.root).get("e"))
+
+    def test_migrates_directory_store(self):
+        legacy_store = DirectoryFingerprintStore(self.root)
+        legacy_store.put("a", "1")
+        legacy_store.put("b", "2")
+
+        store = LogFingerprintStore(self.root)
+        self.assertEqual("1", store.get("a"))
+        store.delete("b")
+        self.assertIsNone(store.get("b"))
+        store.flush()
+
+        # Only the log, and the lock appends to it take, are left.
+        self.assertEqual(
+            [LogFingerprintStore.LOG_FILE_NAME, LogFingerprintStore.LOG_FILE_NAME + ".lock"],
+            sorted(os.listdir(self.root)),
+        )
+        reloaded = LogFingerprintStore(self.root)
+        self.assertEqual("1", reloaded.get("a"))
+        self.assertIsNone(reloaded.get("b"))
+
+    def test_concurrent_puts_and_flushes(self):
+        legacy_store = DirectoryFingerprintStore(self.root)
+        ids = [str(i) for i in range(200)]
+        for id in ids[::2]:
+            legacy_store.put(id, "legacy")
+
+        store = LogFingerprintStore(self.root)
+
+        def update(id):
+            store.put(id, id)
+            store.flush()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(update, ids))
+
+        self.assertEqual(
+            [LogFingerprintStore.LOG_FILE_NAME, LogFingerprintStore.LOG_FILE_NAME + ".lock"],
+            sorted(os.listdir(self.root)),
+        )
+        reloaded = LogFingerprintStore(self.root)
+        self.assertEqual(ids, [reloaded.get(id) for id in ids])
+
+    def test_compaction(self):
+        store = LogFingerprintStore(self.root)
+        for i in range(LogFingerprintStore._COMPACTION_MIN_RECORDS):
+            store.put("a", str(i))
+        store.flush()
+
+        reloaded = LogFingerprintStore(self.root)
+        self.assertEqual(str(LogFingerprintStore._COMPACTION_MIN_RECORDS - 1), reloaded.get("a"))
+        self.assertEqual(
+            RecordLog._encode(("a", reloaded.get("a"))),
+            read_file(self.log_file(), binary_mode=True),
+        )
+
+    def test_clear_resets_nested_stores(self):
+        store = LogFingerprintStore(self.root)
+        nested_store = LogFingerprintStore(os.path.join(self.root, "nested"))
+        nested_store.put("a", "1")
+        nested_store.flush()
+        safe_file_dump(os.path.join(self.root, "unrelated"), "")
+
+        store.clear()
+        self.assertIsNone(nested_store.get("a"))
+        self.assertEqual([], os.listdir(self.root))
@@ -7,6 +7,7 @@ from contextlib import contextmanager
 
 import psutil
 
+from pants.java.nailgun_client import NailgunClient
 from pants.java.nailgun_executor import NailgunExecutor
 from pants.testutil.test_base import TestBase
 
@@ -97,3 +98,85 @@ Stderr:
 err""",
             ):
                 self.executor._await_socket(timeout=0.0001)
+
+    def _pooled_executor(self, pool_size):
+        return NailgunExecutor(
+            identity="test",
+            workdir="/__non_existent_dir",
+            nailgun_classpath=[],
+            distribution=unittest.mock.Mock(),
+            metadata_base_dir=self.subprocess_dir,
+            pool_size=pool_size,
+        )
+
+    def _assert_chosen_slot(self, executor, expected_slot, alive, fingerprints, last_used):
+        """Asserts the slot chosen for fingerprint "fp", given the state of the nailguns by name."""
+        for name, timestamp in last_used.items():
+            executor.write_metadata_by_name(name, NailgunExecutor._LAST_USED_KEY, str(timestamp))
+        with unittest.mock.patch.object(
+            NailgunExecutor, "is_alive", autospec=True, side_effect=lambda this: this.name in alive
+        ), unittest.mock.patch.object(
+            NailgunExecutor,
+            "has_current_fingerprint",
+            autospec=True,
+            side_effect=lambda this, fp: fingerprints.get(this.name) == fp,
+        ):
+            self.assertEqual(expected_slot, executor._choose_slot("fp"))
+
+    def test_pool_size_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            self._pooled_executor(pool_size=0)
+
+    def test_choose_slot_matching_fingerprint(self):
+        self._assert_chosen_slot(
+            self._pooled_executor(pool_size=3),
+            expected_slot=2,
+            alive={"test", "test_1", "test_2"},
+            fingerprints={"test": "other", "test_1": "other", "test_2": "fp"},
+            last_used={},
+        )
+
+    def test_choose_slot_empty(self):
+        self._assert_chosen_slot(
+            self._pooled_executor(pool_size=3),
+            expected_slot=1,
+            alive={"test", "test_2"},
+            fingerprints={"test": "other", "test_1": "fp", "test_2": "other"},
+            last_used={},
+        )
+
+    def test_choose_slot_least_recently_used(self):
+        self._assert_chosen_slot(
+            self._pooled_executor(pool_size=3),
+            expected_slot=0,
+            alive={"test", "test_1", "test_2"},
+            fingerprints={"test": "a", "test_1": "b", "test_2": "c"},
+            last_used={"test": 10, "test_1": 30, "test_2": 20},
+        )
+
+    def test_slots_have_separate_metadata_and_output(self):
+        executor = self._pooled_executor(pool_size=2)
+        self.assertEqual("test", executor.name)
+        self.assertEqual("/__non_existent_dir/stdout", executor._ng_stdout)
+        executor._use_slot(1)
+        self.assertEqual("test_1", executor.name)
+        self.assertEqual("/__non_existent_dir/1/stdout", executor._ng_stdout)
+
+    def test_unconnectable_nailgun_is_respawned(self):
+        client = unittest.mock.Mock()
+        client.NailgunConnectionError = NailgunClient.NailgunConnectionError
+        client.try_connect.side_effect = NailgunClient.NailgunConnectionError(
+            address=("127.0.0.1", 1), pid=3, pgrp=3, wrapped_exc=OSError("refused")
+        )
+        self.executor._distribution.version = "1.8"
+        with unittest.mock.patch.object(
+            NailgunExecutor, "_check_nailgun_state", return_value=(True, False)
+        ), unittest.mock.patch.object(
+            NailgunExecutor, "_create_ngclient", return_value=client
+        ), unittest.mock.patch.object(
+            NailgunExecutor, "terminate"
+        ) as mock_terminate, unittest.mock.patch.object(
+            NailgunExecutor, "_spawn_nailgun_server", return_value="spawned"
+        ):
+            self.assertEqual("spawned", self.executor._get_nailgun_client([], [], None, None, None))
+            mock_terminate.assert_called_once_with()
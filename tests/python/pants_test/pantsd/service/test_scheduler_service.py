@@ -0,0 +1,75 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import time
+import unittest
+import unittest.mock
+
+from pants.pantsd.service.fs_event_service import FSEventService
+from pants.pantsd.service.scheduler_service import SchedulerService
+
+
+class TestSchedulerService(unittest.TestCase):
+    def setUp(self):
+        self.mock_graph_helper = unittest.mock.Mock()
+        self.mock_scheduler = self.mock_graph_helper.scheduler
+        self.mock_scheduler.invalidate_files.return_value = 0
+        self.service = SchedulerService(
+            fs_event_service=unittest.mock.Mock(spec=FSEventService),
+            legacy_graph_scheduler=self.mock_graph_helper,
+            build_root="/build_root",
+            invalidation_globs=[],
+            pantsd_pidfile=None,
+            union_membership=unittest.mock.Mock(),
+            fs_event_quiet_period=0.01,
+        )
+        self.service._fs_event_service.PANTS_ALL_FILES_SUBSCRIPTION_NAME = "all_files"
+        self.service._fs_event_service.PANTS_PID_SUBSCRIPTION_NAME = "pantsd_pid"
+        # Checking the invalidation globs requires a real scheduler session.
+        self.service._maybe_invalidate_scheduler_batch = unittest.mock.Mock()
+
+    def enqueue(self, files, is_fresh_instance=False):
+        self.service._enqueue_fs_event(
+            dict(subscription="all_files", is_fresh_instance=is_fresh_instance, files=files)
+        )
+
+    def test_events_are_invalidated_in_one_batch(self):
+        self.enqueue(["a", "b"], is_fresh_instance=True)
+        self.enqueue(["b", "c"])
+        self.enqueue(["c", "a"])
+        self.service._process_event_queue()
+
+        self.mock_scheduler.invalidate_files.assert_called_once_with(["a", "b", "c"])
+        self.assertTrue(self.service._watchman_is_running.is_set())
+
+        metrics = self.service.invalidation_metrics()
+        self.assertEqual(1, metrics["fs_event_batches"])
+        self.assertEqual(3, metrics["fs_events"])
+        self.assertEqual(3, metrics["fs_event_max_batch_files"])
+
+    def test_initial_event_is_not_invalidated(self):
+        self.enqueue(["a"], is_fresh_instance=True)
+        self.service._process_event_queue()
+
+        self.mock_scheduler.invalidate_files.assert_not_called()
+        self.assertEqual(0, self.service.invalidation_metrics()["fs_event_batches"])
+
+    def test_queued_events_are_taken_in_one_batch(self):
+        self.service.MAX_BATCH_WAIT = 0
+        # Events that have waited longer than the batch wait are not split up.
+        with unittest.mock.patch("time.time", return_value=time.time() - 60):
+            self.enqueue(["a"])
+            self.enqueue(["b"])
+        self.service._process_event_queue()
+
+        self.mock_scheduler.invalidate_files.assert_called_once_with(["a", "b"])
+
+    def test_batching_is_bounded(self):
+        self.service.MAX_BATCH_WAIT = 0.05
+        self.service._fs_event_quiet_period = 60
+        self.enqueue(["a"])
+        start = time.time()
+        self.service._process_event_queue()
+
+        self.assertLess(time.time() - start, 30)
+        self.mock_scheduler.invalidate_files.assert_called_once_with(["a"])
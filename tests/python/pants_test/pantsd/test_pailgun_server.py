@@ -10,11 +10,47 @@ from queue import Queue
 from socketserver import TCPServer
 
 from pants.java.nailgun_protocol import ChunkType, MaybeShutdownSocket, NailgunProtocol
-from pants.pantsd.pailgun_server import PailgunHandler, PailgunServer
+from pants.pantsd.pailgun_server import PailgunHandler, PailgunHandleRequestLock, PailgunServer
 
 PATCH_OPTS = dict(autospec=True, spec_set=True)
 
 
+class TestPailgunHandleRequestLock(unittest.TestCase):
+    def test_granted_in_arrival_order(self):
+        lock = PailgunHandleRequestLock()
+        first, second, third = (lock.take_ticket() for _ in range(3))
+        self.assertTrue(lock.acquire(first))
+        self.assertFalse(lock.acquire(third, timeout=0.01))
+        self.assertEqual(2, lock.waiting_ahead_of(third))
+
+        lock.release()
+        # The lock is held for the second ticket even before it asks, so the third waits.
+        self.assertFalse(lock.acquire(third, timeout=0.01))
+        self.assertTrue(lock.acquire(second))
+        lock.release()
+        self.assertTrue(lock.acquire(third))
+
+    def test_abandoned_tickets_are_skipped(self):
+        lock = PailgunHandleRequestLock()
+        first, second, third = (lock.take_ticket() for _ in range(3))
+        self.assertTrue(lock.acquire(first))
+        lock.abandon(second)
+        self.assertEqual(1, lock.waiting_ahead_of(third))
+        lock.release()
+        self.assertTrue(lock.acquire(third))
+
+    def test_waiter_is_woken_on_release(self):
+        lock = PailgunHandleRequestLock()
+        first, second = lock.take_ticket(), lock.take_ticket()
+        self.assertTrue(lock.acquire(first))
+        acquired = []
+        waiter = threading.Thread(target=lambda: acquired.append(lock.acquire(second, timeout=10)))
+        waiter.start()
+        lock.release()
+        waiter.join(10)
+        self.assertEqual([True], acquired)
+
+
 class TestPailgunServer(unittest.TestCase):
     def setUp(self):
         self.mock_handler_inst = unittest.mock.Mock()
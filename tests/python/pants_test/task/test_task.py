@@ -403,6 +403,12 @@ class TaskTest(TaskTestBase):
         self.assertTrue(os.path.islink(vt.results_dir))
         self.assertTrue(os.path.isdir(vt.current_results_dir))
 
+    def test_artifact_cache_writes_are_cpu_bound(self):
+        task, vtA, _ = self._run_fixture(artifact_cache=True)
+        work = task._get_update_artifact_cache_work([(vtA, [vtA.current_results_dir])])
+        self.assertTrue(work.cpu_bound)
+        self.assertEqual(1, len(work.args_tuples))
+
     def test_cache_hit_short_circuits_incremental_copy(self):
         # Tasks should only copy over previous results if there is no cache hit, otherwise the copy is
         # wasted.
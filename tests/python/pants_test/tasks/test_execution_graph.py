@@ -68,7 +68,7 @@ class ExecutionGraphTest(unittest.TestCase):
     def job(self, name, fn, dependencies, size=0, on_success=None, on_failure=None):
         def recording_fn():
             self.jobs_run.append(name)
-            fn()
+            return fn()
 
         return Job(name, recording_fn, dependencies, size, on_success, on_failure)
 
@@ -342,6 +342,67 @@ class ExecutionGraphTest(unittest.TestCase):
         self.execute(exec_graph)
         self.assertEqual(self.jobs_run, ["A", "D", "B", "C", "E"])
 
+    def test_priorities_from_duration_estimates(self):
+        exec_graph = ExecutionGraph(
+            [
+                self.job("A", passing_fn, [], 1),
+                self.job("B", passing_fn, [], 8),
+                self.job("C", passing_fn, ["A"], 1),
+            ],
+            False,
+            duration_estimates={"A": 2.0, "C": 10.0},
+        )
+        # B has no measured duration, so is estimated at the 6s per unit of size measured for the
+        # other jobs, but A leads a longer chain.
+        self.assertEqual(exec_graph._job_priority, {"A": 12.0, "B": 48.0, "C": 10.0})
+
+        exec_graph = ExecutionGraph(
+            [
+                self.job("A", passing_fn, [], 8),
+                self.job("B", passing_fn, [], 1),
+                self.job("C", passing_fn, ["B"], 1),
+            ],
+            False,
+            duration_estimates={"A": 1.0, "B": 2.0, "C": 3.0},
+        )
+        self.assertEqual(exec_graph._job_priority, {"A": 1.0, "B": 5.0, "C": 3.0})
+        self.execute(exec_graph)
+        self.assertEqual(self.jobs_run, ["B", "A", "C"])
+        self.assertEqual({"A", "B", "C"}, set(exec_graph.successful_job_durations))
+        (stats,) = exec_graph.worker_stats.get_all().values()
+        self.assertEqual(3, stats["jobs"])
+
+    def test_reprioritizes_as_jobs_finish(self):
+        exec_graph = ExecutionGraph(
+            [
+                self.job("A", passing_fn, [], 100),
+                self.job("B", passing_fn, ["A"], 100),
+                self.job("C", passing_fn, ["A"], 1),
+            ],
+            False,
+            duration_estimates={"C": 1.0},
+        )
+        # Before any job without an estimate has finished, B is estimated from C alone.
+        self.assertEqual(exec_graph._job_priority["B"], 100.0)
+        self.execute(exec_graph)
+        # A was as large as B but ran almost instantly, so B is now expected to be quicker than C.
+        self.assertEqual(self.jobs_run, ["A", "C", "B"])
+
+    def test_jobs_that_did_no_work_are_not_measured(self):
+        exec_graph = ExecutionGraph(
+            [
+                self.job("A", lambda: False, [], 100),
+                self.job("B", passing_fn, ["A"], 100),
+                self.job("C", passing_fn, ["A"], 1),
+            ],
+            False,
+            duration_estimates={"C": 1.0},
+        )
+        self.execute(exec_graph)
+        self.assertEqual({"B", "C"}, set(exec_graph.successful_job_durations))
+        # A hit a cache, so its instant run did not make B look quicker than C.
+        self.assertEqual(self.jobs_run, ["A", "B", "C"])
+
     def test_jobs_not_canceled_multiple_times(self):
         failures = list()
 
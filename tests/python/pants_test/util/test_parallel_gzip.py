@@ -0,0 +1,47 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import gzip
+import io
+import os
+import unittest
+import zlib
+
+from pants.util.parallel_gzip import ParallelGzipWriter
+
+
+class ParallelGzipWriterTest(unittest.TestCase):
+    def gzip(self, data, threads, block_size=1024, write_size=100):
+        out = io.BytesIO()
+        writer = ParallelGzipWriter(out, compresslevel=6, threads=threads, block_size=block_size)
+        for i in range(0, len(data), write_size):
+            writer.write(data[i : i + write_size])
+        writer.close()
+        return out.getvalue()
+
+    def test_round_trip(self):
+        data = os.urandom(10000) + b"pants" * 10000
+        for threads in (1, 4):
+            with self.subTest(threads=threads):
+                self.assertEqual(data, gzip.decompress(self.gzip(data, threads)))
+
+    def test_single_member(self):
+        data = b"pants" * 10000
+        compressed = self.gzip(data, threads=4)
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        self.assertEqual(data, decompressor.decompress(compressed))
+        self.assertTrue(decompressor.eof)
+        self.assertEqual(b"", decompressor.unused_data)
+
+    def test_deterministic(self):
+        data = os.urandom(5000) * 4
+        self.assertEqual(self.gzip(data, threads=1), self.gzip(data, threads=4))
+
+    def test_empty(self):
+        self.assertEqual(b"", gzip.decompress(self.gzip(b"", threads=2)))
+
+    def test_write_after_close(self):
+        writer = ParallelGzipWriter(io.BytesIO())
+        writer.close()
+        with self.assertRaises(ValueError):
+            writer.write(b"pants")
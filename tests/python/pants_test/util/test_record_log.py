@@ -0,0 +1,98 @@
+# Copyright 2020 Pants project contributors (see CONTRIBUTORS.md).
+# Licensed under the Apache License, Version 2.0 (see LICENSE).
+
+import os
+import unittest
+from unittest import mock
+
+from pants.util.contextutil import temporary_dir
+from pants.util.record_log import RecordLog
+
+
+class RecordLogTest(unittest.TestCase):
+    def test_missing(self):
+        with temporary_dir() as root:
+            self.assertEqual([], RecordLog(os.path.join(root, "log")).read())
+
+    def test_append_and_rewrite(self):
+        with temporary_dir() as root:
+            path = os.path.join(root, "subdir", "log")
+            log = RecordLog(path)
+            log.append([("a", "1"), ("b", "2")])
+            log.append([("c",)])
+            self.assertEqual([("a", "1"), ("b", "2"), ("c",)], RecordLog(path).read())
+
+            log.rewrite([("d", "", "4")])
+            self.assertEqual([("d", "", "4")], RecordLog(path).read())
+
+            log.delete()
+            self.assertFalse(os.path.exists(path))
+            self.assertTrue(os.path.exists(path + ".lock"))
+
+    def test_unshared(self):
+        with temporary_dir() as root:
+            path = os.path.join(root, "log")
+            log = RecordLog(path, shared=False)
+            log.rewrite([("a", "1")])
+            log.append([("b", "2")])
+            self.assertEqual([("a", "1"), ("b", "2")], log.read())
+            self.assertEqual(["log"], os.listdir(root))
+
+    def test_torn_and_corrupt_records(self):
+        with temporary_dir() as root:
+            path = os.path.join(root, "log")
+            RecordLog(path).append([("a", "1")])
+            with open(path, "ab") as fd:
+                fd.write(b"00000000 b\t2\n")
+                fd.write(RecordLog._encode(("c", "3"))[:-2])
+
+            log = RecordLog(path)
+            self.assertEqual([("a", "1")], log.read())
+            log.append([("d", "4")])
+            self.assertEqual([("a", "1"), ("d", "4")], RecordLog(path).read())
+
+    def test_load_compacted(self):
+        with temporary_dir() as root:
+            path = os.path.join(root, "log")
+            log = RecordLog(path)
+            log.append([("a", "1"), ("b", "2"), ("a", "3"), ("b", ""), ("c",)])
+
+            def load(**kwargs):
+                return RecordLog(path).load_compacted(
+                    key_fn=lambda record: record[0] if len(record) == 2 else None,
+                    live_fn=lambda record: record[1] != "",
+                    **kwargs,
+                )
+
+            self.assertEqual({"a": ("a", "3")}, load(min_compaction_records=6))
+            self.assertEqual(5, len(RecordLog(path).read()))
+
+            self.assertEqual({"a": ("a", "3")}, load(min_compaction_records=5))
+            self.assertEqual([("a", "3")], RecordLog(path).read())
+
+            log.append([("b", "4")])
+            self.assertEqual({}, load(max_records=1))
+            self.assertFalse(os.path.exists(path))
+
+    def test_compaction_keeps_concurrent_appends(self):
+        with temporary_dir() as root:
+            path = os.path.join(root, "log")
+            RecordLog(path).append([("a", "1"), ("a", "2")])
+
+            read = RecordLog.read
+
+            def read_then_append(log):
+                records = read(log)
+                if not appended:
+                    # Another process appends after this one has decided to compact.
+                    appended.append(True)
+                    RecordLog(path).append([("b", "3")])
+                return records
+
+            appended = []
+            with mock.patch.object(RecordLog, "read", autospec=True, side_effect=read_then_append):
+                live = RecordLog(path).load_compacted(
+                    key_fn=lambda record: record[0], min_compaction_records=2
+                )
+            self.assertEqual({"a": ("a", "2"), "b": ("b", "3")}, live)
+            self.assertEqual([("a", "2"), ("b", "3")], RecordLog(path).read())